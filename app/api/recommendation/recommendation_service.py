@@ -26,8 +26,8 @@ class RecommendationService:
         """
         # 1. 뉴스 데이터 가져오기
         rag_service = RagService()
-        # 향상된 검색 품질을 위해 매개변수 추가
-        news_articles = rag_service.get_news_data(
+        # 향상된 검색 품질을 위해 매개변수 추가 (이벤트 루프를 막지 않도록 비동기 검색 사용)
+        news_articles = await rag_service.get_news_data_async(
             categories=themes,
             n_results=5,  # 가져올 뉴스 수
             min_relevance_score=0.6  # 최소 관련성 점수
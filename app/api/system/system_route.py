@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Query
+from fastapi.responses import JSONResponse
+
+from app.common.crawlers.daily_news_collector import DailyNewsCollector
+from app.common.rag import rag_service
+
+router = APIRouter(tags=["System"])
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    검색 요청 / 쿼리 임베딩 배치 / 캐시 / 뉴스 수집 작업 지표를 반환합니다.
+    """
+    content_cache = rag_service.content_embedding_cache
+    return {
+        "retrieval": rag_service.retrieval_metrics.snapshot(),
+        "embedding_batcher": rag_service.embedding_batcher.stats() if rag_service.embedding_batcher else None,
+        "query_embedding_cache": rag_service.query_embedding_cache.stats(),
+        "retrieval_result_cache": rag_service.retrieval_result_cache.stats(),
+        "content_embedding_cache": content_cache.stats() if content_cache else None,
+        "ingestion_jobs": DailyNewsCollector.get_instance().job_metrics()
+    }
+
+
+@router.get("/health/live")
+async def liveness():
+    """
+    프로세스가 요청을 처리할 수 있는지 확인합니다.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/health/ready")
+async def readiness():
+    """
+    저장된 기사로 추천을 제공할 수 있는지와 초기 수집 진행 상황을 반환합니다.
+    저장된 기사가 없고 초기 수집이 끝나지 않았으면 503 을 반환합니다
+    (다른 워커가 수집 중이라 초기 수집을 생략한 경우는 준비 완료로 봅니다).
+    """
+    collector = DailyNewsCollector.get_instance()
+    document_count = sum(collection.count() for collection in rag_service.vector_util.get_all_collections())
+    backfill = collector.backfill_progress()
+    ready = document_count > 0 or backfill["status"] in ("done", "failed", "skipped")
+
+    body = {"ready": ready, "documents": document_count, "backfill": backfill}
+    return JSONResponse(status_code=200 if ready else 503, content=body)
+
+
+@router.get("/stats")
+async def get_collection_stats(publisher_limit: int = Query(20, ge=1, le=1000)):
+    """
+    저장된 기사의 테마별 / 날짜별 / 매체별 문서 수를 반환합니다 (증분 통계, 벡터 DB 전체 조회 없음).
+    """
+    return rag_service.collection_stats.snapshot(publisher_limit=publisher_limit)
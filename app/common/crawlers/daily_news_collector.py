@@ -1,12 +1,19 @@
 import logging
 import asyncio
+import os
+import time
+from collections import deque
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from filelock import FileLock, Timeout
 
-from app.common.utils.deepsearch_client import DeepSearchClient
-from app.common.rag.rag_service import RagService  # 대문자로 시작하는 클래스명으로 수정
+from app.common.utils.deepsearch_client import AsyncDeepSearchClient
+from app.common.crawlers.ingestion_pipeline import IngestionPipeline
+from app.common.crawlers.news_themes import DEFAULT_THEMES
+from app.common.crawlers.ingestion_state import IngestionStateStore
+from app.common.rag.rag_service import RagService, collection_stats, create_embedding_pool  # 대문자로 시작하는 클래스명으로 수정
 
 # 로거 설정
 logger = logging.getLogger(__name__)
@@ -24,20 +31,17 @@ class DailyNewsCollector:
 
     """
 
-    # 관심 테마 목록 - 각 키워드는 DeepSearch API 의 검색어로 사용됨
-    # 이 키워드들은 포트폴리오 추천 시 사용된는 테마와 일치하도록 설정되어 있음
-    DEFAULT_THEMES = [
-        "에너지",
-        "철강",
-        "건설",
-        "여행",
-        "은행",
-        "증권",
-        "반도체",
-        "AI",
-        "5G",
-        "부동산"
-    ]
+    # 관심 테마 목록 (news_themes 참고)
+    DEFAULT_THEMES = DEFAULT_THEMES
+
+    # 기사 보관 기간 (일) - 이보다 오래된 구간은 수집하지 않음
+    RETENTION_DAYS = 30
+
+    # 마지막 수집 후 이 시간 안에 다시 실행되면 해당 테마 수집 생략 (재시작 직후 재수집 방지)
+    MIN_INTERVAL_MINUTES = int(os.getenv("INGESTION_MIN_INTERVAL_MINUTES", "60"))
+
+    # 보관할 수집 작업 실행 기록 수 (지표 조회용)
+    JOB_HISTORY_SIZE = int(os.getenv("INGESTION_JOB_HISTORY_SIZE", "30"))
 
     # 싱글톤 인스턴스 - 전체 애플리케이션에서 하나의 인스턴스만 사용
     _instance = None
@@ -59,8 +63,29 @@ class DailyNewsCollector:
         # RAG 서비스 초기화
         self.rag_service = RagService()
 
-        # 스케줄러 초기화
-        self.scheduler = BackgroundScheduler()
+        # DeepSearch 비동기 클라이언트 (테마 전체가 연결 풀과 동시 요청 제한을 공유)
+        self.deepsearch_client = AsyncDeepSearchClient()
+
+        # 테마별 수집 워터마크 / 페이지 커서
+        self.ingestion_state = IngestionStateStore(
+            os.getenv("INGESTION_STATE_PATH", "./data/ingestion_state.json")
+        )
+
+        # 초기 수집(백필) 백그라운드 작업과 진행 상황
+        self.backfill_task = None
+        self.backfill_status = {"status": "idle", "started_at": None, "finished_at": None, "error": None}
+        self._current_pipeline = None
+        self._last_summary = None
+
+        # 수집 작업 중복 실행 방지
+        # - 프로세스 안: asyncio 락 (일일 수집과 초기 수집이 겹치지 않도록)
+        # - 프로세스 사이: 파일 락 (uvicorn 워커 여러 개 중 한 곳에서만 수집)
+        self._job_lock = asyncio.Lock()
+        self._process_lock = FileLock(os.getenv("INGESTION_LOCK_PATH", "./data/ingestion.lock"))
+        self.job_runs = deque(maxlen=self.JOB_HISTORY_SIZE)
+
+        # 스케줄러 초기화 (앱 이벤트 루프에서 실행되므로 시작은 start_scheduler 에서)
+        self.scheduler = AsyncIOScheduler()
         self._setup_scheduler()
 
         logger.info("일일 뉴스 수집기 초기화 완료")
@@ -68,21 +93,117 @@ class DailyNewsCollector:
     def _setup_scheduler(self):
         """스케줄러 설정"""
         # 매일 새벽 3시에 뉴스 수집 실행
+        # 이전 실행이 끝나지 않았으면 새 실행은 생략하고, 놓친 실행은 한 번으로 합쳐 1시간 안에 실행
         self.scheduler.add_job(
-            self.collect_and_store_daily_news,
+            self.run_ingestion_job,
             CronTrigger(hour=3, minute=0),
-            id='daily_news_collection'
+            kwargs={"trigger": "daily"},
+            id='daily_news_collection',
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=3600
         )
-        self.scheduler.start()
-        logger.info("뉴스 수집 스케줄러 시작됨")
+
+    def start_scheduler(self):
+        """스케줄러 시작 (실행 중인 이벤트 루프 안에서 호출 - 앱 startup 이벤트)"""
+        if not self.scheduler.running:
+            self.scheduler.start()
+            logger.info("뉴스 수집 스케줄러 시작됨")
+
+    async def run_ingestion_job(self, trigger: str = "manual", themes: List[str] = None, days_back: int = 1) -> dict:
+        """중복 실행을 막고 수집 작업을 실행한 뒤 실행 기록 반환
+
+        이 프로세스나 다른 워커에서 수집 작업이 실행 중이면 생략하고 status 를 "skipped" 로 기록한다.
+
+        Args:
+            trigger: 실행 계기 ("daily", "backfill", "manual")
+            themes: 수집할 테마 목록 (기본값: None, 기본 테마 사용)
+            days_back: 수집 기록이 없는 테마를 몇 일 전 데이터까지 수집할지
+
+        Returns:
+            {"trigger", "status": ok/failed/skipped, "started_at", "duration_seconds",
+             "articles_stored", "articles_per_sec", "errors", "reason"}
+        """
+        run = {
+            "trigger": trigger,
+            "status": "skipped",
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "duration_seconds": 0.0,
+            "articles_stored": 0,
+            "articles_per_sec": 0.0,
+            "errors": 0,
+            "reason": None
+        }
+
+        if self._job_lock.locked():
+            run["reason"] = "이 프로세스에서 수집 작업 실행 중"
+        else:
+            async with self._job_lock:
+                try:
+                    self._process_lock.acquire(timeout=0)
+                except Timeout:
+                    run["reason"] = "다른 워커에서 수집 작업 실행 중"
+                else:
+                    try:
+                        # 다른 워커가 마지막으로 수집한 워터마크 / 커서부터 이어서 수집
+                        self.ingestion_state.reload()
+                        await self._run_locked(run, themes, days_back)
+                    finally:
+                        self._process_lock.release()
+
+        if run["status"] == "skipped":
+            logger.info(f"⏭️ 수집 작업 생략 ({trigger}): {run['reason']}")
+        else:
+            logger.info(
+                f"⏱️ 수집 작업 종료 ({trigger}) - 상태: {run['status']}, 소요: {run['duration_seconds']}초, "
+                f"저장: {run['articles_stored']}개 ({run['articles_per_sec']}개/초), 오류: {run['errors']}건"
+            )
+        self.job_runs.append(run)
+        return run
+
+    async def _run_locked(self, run: dict, themes, days_back: int):
+        """락을 잡은 상태에서 수집 실행 후 실행 기록 채우기"""
+        started = time.perf_counter()
+        self._last_summary = None
+        try:
+            await self.collect_and_store_daily_news(themes=themes, days_back=days_back)
+            summary = self._last_summary or {}
+            run["status"] = "failed" if summary.get("error") else "ok"
+            run["reason"] = summary.get("error")
+        except Exception as e:
+            # 실행 기록에 남기고 스케줄러 / 초기 수집 작업으로는 전파하지 않음
+            logger.exception(f"❌ 수집 작업 중 오류: {str(e)}")
+            run.update({"status": "failed", "reason": str(e)})
+            run["errors"] += 1
+        finally:
+            duration = time.perf_counter() - started
+            summary = self._last_summary or {}
+            run["duration_seconds"] = round(duration, 3)
+            run["articles_stored"] = summary.get("total_stored", 0)
+            run["articles_per_sec"] = round(run["articles_stored"] / duration, 2) if duration > 0 else 0.0
+            run["errors"] += summary.get("errors", 0)
+
+    def job_metrics(self) -> dict:
+        """수집 작업 실행 여부와 최근 실행 기록 (오래된 순)"""
+        next_run = None
+        job = self.scheduler.get_job('daily_news_collection')
+        if job is not None and getattr(job, "next_run_time", None):
+            next_run = job.next_run_time.isoformat(timespec="seconds")
+        return {
+            "running": self._job_lock.locked(),
+            "next_daily_run": next_run,
+            "runs": list(self.job_runs)
+        }
 
     async def collect_and_store_daily_news(self, themes: List[str] = None, days_back: int = 1) -> int:
         """
         지정된 테마에 대한 뉴스를 수집하고 RAG 시스템에 저장
 
+        이전에 수집한 테마는 저장된 워터마크 이후 구간만 수집한다 (중단된 수집은 다음 페이지부터 이어서 수집).
+
         Args:
             themes: 수집할 테마 목록 (기본값: None, 기본 테마 사용)
-            days_back: 몇 일 전 데이터까지 수집할지 (기본값: 1)
+            days_back: 수집 기록이 없는 테마를 몇 일 전 데이터까지 수집할지 (기본값: 1)
 
         Returns:
             총 저장된 기사 수
@@ -90,115 +211,42 @@ class DailyNewsCollector:
         if themes is None:
             themes = self.DEFAULT_THEMES
 
-        # 날짜 범위 설정
-        today = datetime.now().strftime("%Y-%m-%d")
-        past_date = (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
+        # 테마별 수집 구간 설정
+        windows = self._build_windows(themes, days_back)
+        for theme, (date_from, date_to, start_page) in windows.items():
+            logger.info(f"일일 뉴스 수집 시작 - 테마: {theme}, 날짜: {date_from} ~ {date_to}, 시작 페이지: {start_page}")
 
-        logger.info(f"일일 뉴스 수집 시작 - 날짜: {past_date} ~ {today}, 테마: {', '.join(themes)}")
-
-        total_stored = 0
-        theme_stats = {}   # 테마별 통계
-
-        # 각 테마별로 처리
-        for theme in themes:
-            logger.info(f"🔍테마 '{theme}' 뉴스 수집 중...")
-
-            # DeepSearch API 호출
-            articles = DeepSearchClient.fetch_articles(
-                keyword=theme,
-                date_from=past_date,
-                date_to=today,
-                page_limit=10  # 테마당 최대 10페이지
-            )
-
-            if not articles:
+        # 수집 → 검증 → 임베딩 → 저장 단계를 동시에 실행 (단계 사이 큐 크기 제한)
+        try:
+            summary = {"fetched": {}, "stored": {}, "total_stored": 0, "errors": 0}
+            if windows:
+                # 임베딩 프로세스 풀 사용 중이면 워커 전체에 나눠 줄 수 있도록 배치를 크게 잡음
+                pool = self.rag_service.embedding_pool
+                batch_size = max(50, pool.num_workers * pool.chunk_size) if pool is not None else 50
+                self._current_pipeline = IngestionPipeline(self.rag_service, self.deepsearch_client,
+                                                           batch_size=batch_size)
+                summary = await self._current_pipeline.run(
+                    windows,
+                    page_limit=10,  # 테마당 최대 10페이지
+                    state=self.ingestion_state
+                )
+        except Exception as e:
+            logger.error(f"RAG 시스템 저장 중 오류 발생: {str(e)}")
+            # 오류 디버깅을 위한 추가 정보
+            import traceback
+            logger.error(f"상세 오류: {traceback.format_exc()}")
+            summary = {"fetched": {}, "stored": {}, "total_stored": 0, "errors": 1, "error": str(e)}
+        finally:
+            self._current_pipeline = None
+        self._last_summary = summary
+
+        total_stored = summary["total_stored"]
+        theme_stats = summary["stored"]
+        for theme in windows:
+            if not summary["fetched"].get(theme):
                 logger.warning(f"테마 '{theme}'에 대한 최신 뉴스가 없습니다.")
-                theme_stats[theme] = 0
-                continue
-
-            logger.info(f"테마 '{theme}'에 대해 {len(articles)}개 기사 수집됨")
-
-            # 유효한 기사만 필터링
-            valid_articles = []
-            for i, article in enumerate(articles):
-                try:
-                    # None 값 체크 및 안전한 처리
-                    article_id = article.get('id')
-                    title = article.get('title_ko', '') or article.get('title', '') or ''
-                    summary = article.get('summary_ko', '') or article.get('summary', '') or ''
-                    publisher = article.get('publisher', '') or ''
-                    published_at = article.get('published_at', '')
-                    published_date = published_at.split('T')[0] if published_at else ''
-
-                    # 중요 필드 누락 체크
-                    if not article_id or not (title or summary):
-                        logger.warning(f"⚠️ 테마 '{theme}' - 기사 #{i + 1}: 중요 필드 누락으로 건너뜀 (ID: {article_id})")
-                        continue
-
-                    # 날짜 유효성 검증
-                    if published_date and (published_date < past_date or published_date > today):
-                        logger.warning(f"⚠️ 테마 '{theme}' - 기사 #{i + 1}: 날짜 범위 밖의 기사 ({published_date})")
-
-                    # 테마 정보 추가
-                    article['theme'] = theme
-
-                    # 검증된 기사 추가
-                    valid_articles.append(article)
-
-                except Exception as e:
-                    logger.warning(f"테마 '{theme}' - 기사 #{i + 1}: 데이터 처리 중 오류 발생: {str(e)}")
-                    continue
-
-            if not valid_articles:
-                logger.warning(f"테마 '{theme}': 유효한 기사가 없어 저장 건너뜀")
-                theme_stats[theme] = 0
-                continue
-
-            logger.info(f"테마 '{theme}': 유효한 기사 {len(valid_articles)}개 중 {len(articles)}개 필터링됨")
 
-            theme_stored = 0
-            # RAG 서비스의 save_news_data 메서드 사용하여 저장
-            try:
-                # 배치 크기 지정 (메모리 초과 방지)
-                batch_size = 50
-                for i in range(0, len(valid_articles), batch_size):
-                    batch = valid_articles[i:i + batch_size]
-                    logger.info(
-                        f"테마 '{theme}' - 배치 {i // batch_size + 1}/{(len(valid_articles) + batch_size - 1) // batch_size}: {len(batch)}개 기사 저장 시작")
-
-                    # 비동기 메서드 실행을 위한 이벤트 루프 생성
-                    # loop = asyncio.new_event_loop()
-                    # asyncio.set_event_loop(loop)
-                    #
-                    # # save_news_data 메서드 호출
-                    # loop.run_until_complete(self.rag_service.save_news_data(batch))
-                    # loop.close()
-                    # 저장 시작 시간
-                    start_time = datetime.now()
-
-                    await self.rag_service.save_news_data(batch)
-
-                    logger.info(f"✅ 테마 '{theme}' - 배치 {i // batch_size + 1}: {len(batch)}개 기사 저장 완료")
-                    total_stored += len(batch)
-
-                    # 저장 소요 시간 계산
-                    elapsed_time = (datetime.now() - start_time).total_seconds()
-
-                    logger.info(
-                        f"✅ 테마 '{theme}' - 배치 {i // batch_size + 1}: {len(batch)}개 기사 저장 완료 (소요 시간: {elapsed_time:.2f}초)")
-                    theme_stored += len(batch)
-                    total_stored += len(batch)
-
-                # 테마별 통계 저장
-                theme_stats[theme] = total_stored
-
-            except Exception as e:
-                logger.error(f"RAG 시스템 저장 중 오류 발생: {str(e)}")
-                # 오류 디버깅을 위한 추가 정보
-                import traceback
-                logger.error(f"상세 오류: {traceback.format_exc()}")
-
-            # 전체 통계 로깅
+        # 전체 통계 로깅
         logger.info(f"📊 일일 뉴스 수집 및 저장 완료 - 총 {total_stored}개 기사")
         logger.info("📈 테마별 저장 통계:")
         for theme, count in theme_stats.items():
@@ -206,70 +254,145 @@ class DailyNewsCollector:
 
         # 오래된 기사 자동 삭제 (30일 전 이전)
         try:
-            deleted_count = await self.rag_service.delete_old_documents(days=30)
+            deleted_count = await self.rag_service.delete_old_documents(days=self.RETENTION_DAYS)
             logger.info(f"🧹 오래된 기사 {deleted_count}개 삭제 완료")
         except Exception as e:
             logger.error(f"❌ 오래된 기사 삭제 중 오류 발생: {str(e)}")
+            summary["errors"] = summary.get("errors", 0) + 1
 
         return total_stored
 
+    def _build_windows(self, themes: List[str], days_back: int) -> Dict[str, tuple]:
+        """테마별 수집 구간 {테마: (date_from, date_to, 시작 페이지)} 계산
+
+        - 오늘 구간을 수집하다 중단됨: 같은 구간을 저장된 커서 다음 페이지부터
+        - 이전 구간을 수집하다 중단됨: 그 구간 시작일부터 오늘까지 처음부터 (페이지 구성이 바뀌었으므로)
+        - 수집 기록 있음: 워터마크(가장 최신 published_at) 날짜부터 오늘까지 - 최근에 수집했으면 생략
+          (수집된 기사가 없던 테마는 마지막 수집 종료일부터)
+        - 수집 기록 없음: days_back 일 전부터 오늘까지
+        """
+        now = datetime.now()
+        today = now.strftime("%Y-%m-%d")
+        oldest = (now - timedelta(days=self.RETENTION_DAYS)).strftime("%Y-%m-%d")
+        default_from = (now - timedelta(days=days_back)).strftime("%Y-%m-%d")
+
+        windows = {}
+        for theme in themes:
+            state = self.ingestion_state.get(theme)
+            cursor = state.get("cursor")
+
+            if cursor and cursor["date_to"] == today:
+                windows[theme] = (cursor["date_from"], today, cursor["page"] + 1)
+                continue
+
+            if cursor:
+                date_from = cursor["date_from"]
+            elif state.get("date_to"):
+                updated_at = datetime.fromisoformat(state["updated_at"])
+                if state["date_to"] == today and now - updated_at < timedelta(minutes=self.MIN_INTERVAL_MINUTES):
+                    logger.info(f"테마 '{theme}': 최근 수집 완료 ({state['updated_at']}) - 수집 생략")
+                    continue
+                date_from = (state.get("published_at") or state["date_to"])[:10]
+            else:
+                date_from = default_from
+
+            windows[theme] = (max(date_from, oldest), today, 1)
+
+        return windows
+
+    def start_initial_collection(self):
+        """초기 데이터 수집을 백그라운드 작업으로 시작 (이미 실행 중이면 기존 작업 반환)
+
+        수집 중에도 서버는 요청을 받으며, 추천은 이미 저장된 기사로 처리된다.
+        """
+        if self.backfill_task is None or self.backfill_task.done():
+            self.backfill_status = {"status": "scheduled", "started_at": None, "finished_at": None, "error": None}
+            self.backfill_task = asyncio.ensure_future(self.collect_initial_data())
+        return self.backfill_task
+
+    def backfill_progress(self) -> dict:
+        """초기 수집 진행 상황 (상태, 완료 테마 수, 저장 기사 수, 남은 시간 추정)"""
+        progress = dict(self.backfill_status)
+        if self._current_pipeline is not None:
+            progress.update(self._current_pipeline.progress())
+        elif self._last_summary is not None:
+            progress.update({
+                "themes_total": len(self._last_summary["stored"]),
+                "themes_done": len(self._last_summary.get("completed", [])),
+                "articles_fetched": sum(self._last_summary["fetched"].values()),
+                "articles_stored": self._last_summary["total_stored"],
+                "eta_seconds": 0 if progress["status"] == "done" else None
+            })
+        return progress
+
     async def collect_initial_data(self):
         """초기 데이터 수집 (앱 시작 시 실행)"""
         logger.info("초기 뉴스 데이터 수집 시작")
+        self.backfill_status = {"status": "running", "started_at": datetime.now().isoformat(timespec="seconds"),
+                                "finished_at": None, "error": None}
 
         try:
-            # 30일치 데이터 수집
-            await self.collect_and_store_daily_news(days_back=30)
+            # 수집 기록이 없는 테마는 30일치, 있는 테마는 마지막 수집 이후 데이터만 수집
+            # 다른 워커가 수집 중이면 생략 (그 워커의 수집 결과를 같은 벡터 DB 에서 사용)
+            # BACKFILL_EMBEDDING_WORKERS 가 설정되어 있으면 초기 수집 동안만 임베딩 프로세스 풀 사용
+            pool = create_embedding_pool()
+            self.rag_service.embedding_pool = pool
+            try:
+                run = await self.run_ingestion_job(trigger="backfill", days_back=self.RETENTION_DAYS)
+            finally:
+                self.rag_service.embedding_pool = None
+                if pool is not None:
+                    await asyncio.get_event_loop().run_in_executor(None, pool.close)
+            if run["status"] in ("skipped", "failed"):
+                self.backfill_status.update({"status": run["status"], "error": run["reason"]})
+                return
 
             # 데이터 수집 확인
             await self.check_collected_data()
 
             logger.info("🎉 초기 데이터 수집 및 확인 완료")
+            self.backfill_status["status"] = "done"
         except Exception as e:
             logger.error(f"❌ 초기 데이터 수집 중 오류: {str(e)}")
+            self.backfill_status.update({"status": "failed", "error": str(e)})
+        finally:
+            self.backfill_status["finished_at"] = datetime.now().isoformat(timespec="seconds")
 
     def shutdown(self):
         """스케줄러 종료"""
-        if hasattr(self, 'scheduler'):
-            self.scheduler.shutdown()
+        if hasattr(self, 'scheduler') and self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
             logger.info("뉴스 수집 스케줄러 종료됨")
 
+    async def aclose(self):
+        """스케줄러, 진행 중인 초기 수집, DeepSearch 연결 풀 종료"""
+        self.shutdown()
+        if self.backfill_task is not None and not self.backfill_task.done():
+            self.backfill_task.cancel()
+            try:
+                await self.backfill_task
+            except asyncio.CancelledError:
+                pass
+        await self.deepsearch_client.aclose()
+
     async def check_collected_data(self):
         """수집된 뉴스 데이터 상태 로깅"""
         logger.info("🔍 벡터 DB 데이터 수집 현황 확인 중...")
 
         try:
-            # 벡터 DB 연결 확인
-            collection = self.rag_service.collection
+            # 증분으로 유지되는 수집 통계 사용 (벡터 DB 전체 메타데이터를 읽지 않음)
+            stats = collection_stats.snapshot()
 
-            # 모든 문서의 메타데이터 가져오기
-            all_results = collection.get(include=["metadatas"])
-
-            if not all_results or "ids" not in all_results or not all_results["ids"]:
+            if not stats["total"]:
                 logger.warning("⚠️ 벡터 DB에 저장된 문서가 없습니다.")
                 return
 
-            total_docs = len(all_results["ids"])
+            total_docs = stats["total"]
             logger.info(f"📊 벡터 DB에 총 {total_docs}개 기사가 저장되어 있습니다.")
 
-            # 날짜별 통계 수집
-            date_counts = {}
-            theme_counts = {}
-
-            for metadata in all_results.get("metadatas", []):
-                if not metadata:
-                    continue
-
-                # 날짜 정보 추출 및 저장
-                published_at = metadata.get("published_at", "")
-                pub_date = published_at.split("T")[0] if published_at and "T" in published_at else published_at
-
-                if pub_date:
-                    date_counts[pub_date] = date_counts.get(pub_date, 0) + 1
-
-                # 테마 정보 추출 및 저장
-                theme = metadata.get("theme", "unknown")
-                theme_counts[theme] = theme_counts.get(theme, 0) + 1
+            # 날짜별 / 테마별 통계 (여러 테마에 속한 기사는 각 테마에 집계)
+            date_counts = {day: count for day, count in stats["by_day"].items() if day != "unknown"}
+            theme_counts = stats["by_theme"]
 
             # 날짜 범위 확인
             if date_counts:
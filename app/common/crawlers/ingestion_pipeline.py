@@ -0,0 +1,389 @@
+import asyncio
+import logging
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any
+
+from app.common.crawlers.ingestion_state import ThemeProgress
+from app.common.rag.rag_service import EMBEDDING_BATCH_SIZE, merge_themes, metadata_themes
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 단계 사이 큐 종료 표시
+_DONE = object()
+
+
+def validate_articles(theme: str, articles: List[Dict[str, Any]], date_from: str, date_to: str) -> List[Dict[str, Any]]:
+    """수집된 기사 중 ID 와 제목/요약이 있는 기사만 테마 정보를 붙여 반환"""
+    valid_articles = []
+    for i, article in enumerate(articles):
+        try:
+            # None 값 체크 및 안전한 처리
+            article_id = article.get('id')
+            title = article.get('title_ko', '') or article.get('title', '') or ''
+            summary = article.get('summary_ko', '') or article.get('summary', '') or ''
+            published_at = article.get('published_at', '')
+            published_date = published_at.split('T')[0] if published_at else ''
+
+            # 중요 필드 누락 체크
+            if not article_id or not (title or summary):
+                logger.warning(f"⚠️ 테마 '{theme}' - 기사 #{i + 1}: 중요 필드 누락으로 건너뜀 (ID: {article_id})")
+                continue
+
+            # 날짜 유효성 검증
+            if published_date and (published_date < date_from or published_date > date_to):
+                logger.warning(f"⚠️ 테마 '{theme}' - 기사 #{i + 1}: 날짜 범위 밖의 기사 ({published_date})")
+
+            # 테마 정보 추가
+            article['theme'] = theme
+            valid_articles.append(article)
+
+        except Exception as e:
+            logger.warning(f"테마 '{theme}' - 기사 #{i + 1}: 데이터 처리 중 오류 발생: {str(e)}")
+
+    return valid_articles
+
+
+# 단계별 처리량 통계
+class StageStats:
+    """파이프라인 단계의 처리 건수와 작업 시간 (큐 대기 시간 제외)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items_in = 0
+        self.items_out = 0
+        self.batches = 0
+        self.busy_seconds = 0.0
+
+    def record(self, items_in: int, items_out: int, seconds: float):
+        self.items_in += items_in
+        self.items_out += items_out
+        self.batches += 1
+        self.busy_seconds += seconds
+
+    def snapshot(self, elapsed: float) -> dict:
+        """단계 요약 (throughput: 전체 실행 시간 기준 초당 처리 건수, utilization: 작업 시간 비율)
+
+        fetch 단계는 테마별 요청이 동시에 실행되므로 utilization 이 1 을 넘을 수 있다.
+        """
+        return {
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "batches": self.batches,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "throughput_per_sec": round(self.items_out / elapsed, 2) if elapsed > 0 else 0.0,
+            "utilization": round(self.busy_seconds / elapsed, 3) if elapsed > 0 else 0.0
+        }
+
+
+# 뉴스 수집 파이프라인
+class IngestionPipeline:
+    """DeepSearch 페이지 수집 → 유효성 검사/중복 제거 → 배치 임베딩 → 벡터 DB 저장 단계 파이프라인
+
+    각 단계는 동시에 실행되고 단계 사이는 크기가 제한된 큐로 연결된다.
+    뒤 단계가 밀리면 앞 단계가 큐에서 대기하므로 (backpressure), 다음 페이지를 내려받는 동안
+    임베딩이 CPU 를 사용하고, 수집 기간과 관계없이 메모리에는 큐 크기만큼의 기사만 올라간다.
+
+    여러 테마에서 받은 같은 기사 (같은 ID 또는 같은 정규화 제목) 는 임베딩 전에 하나로 합치고 테마만 모은다.
+    - 처리 중인 기사와 같으면 처리 중인 메타데이터에 테마 추가 (저장 중이었으면 저장 후 갱신)
+    - 이미 저장된 기사와 같으면 저장된 문서의 테마 메타데이터 갱신
+    기사 변환(유사 중복 판별 포함)과 벡터 DB 조회/갱신은 모두 쓰기 전용 쓰레드에서 순서대로 실행되어
+    이벤트 루프를 막지 않는다.
+    """
+
+    def __init__(self, rag_service, client, batch_size: int = 50, queue_size: int = 4, prefetch: int = 2):
+        """
+        Args:
+            rag_service: 저장에 사용할 RagService
+            client: AsyncDeepSearchClient
+            batch_size: 임베딩/저장 배치 크기 (기사 수)
+            queue_size: 단계 사이 큐 크기 (페이지/배치 수)
+            prefetch: 테마별로 미리 요청할 페이지 수
+        """
+        self.rag_service = rag_service
+        self.client = client
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.prefetch = prefetch
+        self._writer = None
+        self._started_at = None
+        self._page_limit = 0
+        self._fetched = {}
+        self._stored = {}
+        self._progress = {}
+
+    async def run(self, windows: Dict[str, tuple], page_limit: int = 10, state=None) -> dict:
+        """테마별 수집 기간의 기사를 수집/저장하고 결과 요약 반환
+
+        Args:
+            windows: {테마: (date_from, date_to, 시작 페이지)}
+            page_limit: 테마당 최대 페이지 번호
+            state: IngestionStateStore - 주어지면 앞에서부터 연속으로 저장이 끝난 페이지까지 커서를 기록하고,
+                   기간 전체가 끝나면 워터마크를 갱신한다
+
+        Returns:
+            {"fetched": {테마: 수집 건수}, "stored": {테마: 저장 건수}, "completed": [기간을 끝까지 수집한 테마],
+             "total_stored", "errors": 실패 건수 (기사/페이지/배치), "elapsed_seconds", "stages"}
+        """
+        themes = list(windows)
+        self._page_limit = page_limit
+        self._windows = windows
+        self._state = state
+        self._stats = {name: StageStats(name) for name in ("fetch", "validate", "embed", "store")}
+        self._fetched = {theme: 0 for theme in themes}
+        self._stored = {theme: 0 for theme in themes}
+        self._progress = {theme: ThemeProgress(windows[theme][2]) for theme in themes}
+        self._in_flight = {}  # 중복 판별 키 -> 저장 전인 기사의 메타데이터
+        self._error_count = 0
+
+        fetch_queue = asyncio.Queue(maxsize=self.queue_size)
+        embed_queue = asyncio.Queue(maxsize=self.queue_size)
+        store_queue = asyncio.Queue(maxsize=self.queue_size)
+
+        # 벡터 DB 쓰기 전용 쓰레드 - 임베딩 쓰레드 풀과 겹치지 않게 분리, 실행이 끝나면 종료
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingestion-writer")
+        started_at = self._started_at = time.perf_counter()
+        tasks = [
+            asyncio.ensure_future(self._fetch_stage(themes, page_limit, fetch_queue)),
+            asyncio.ensure_future(self._validate_stage(fetch_queue, embed_queue)),
+            asyncio.ensure_future(self._embed_stage(embed_queue, store_queue)),
+            asyncio.ensure_future(self._store_stage(store_queue)),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except Exception:
+            # 한 단계가 실패하면 나머지 단계가 큐에서 영원히 대기하지 않도록 취소
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            self._writer.shutdown(wait=False)
+        elapsed = time.perf_counter() - started_at
+
+        # 요청 실패나 저장 실패 없이 끝난 테마만 워터마크 갱신
+        completed = [theme for theme in themes if self._progress[theme].is_complete()]
+        if state is not None:
+            for theme in completed:
+                state.complete(theme, windows[theme][1], self._progress[theme].newest_published_at or None)
+
+        summary = {
+            "fetched": self._fetched,
+            "stored": self._stored,
+            "completed": completed,
+            "total_stored": sum(self._stored.values()),
+            "errors": self._error_count,
+            "elapsed_seconds": round(elapsed, 3),
+            "stages": {name: stats.snapshot(elapsed) for name, stats in self._stats.items()}
+        }
+        logger.info(f"📊 수집 파이프라인 완료 - {summary['total_stored']}개 저장, {elapsed:.2f}초")
+        for name, stage in summary["stages"].items():
+            logger.info(f"  - {name}: {stage['items_out']}/{stage['items_in']}건, "
+                        f"{stage['throughput_per_sec']}건/초, 작업 비율 {stage['utilization']:.0%}")
+        return summary
+
+    async def _fetch_stage(self, themes, page_limit, out_queue):
+        """테마별 페이지를 동시에 받아 다음 단계로 전달 (전체 동시 요청 수는 클라이언트에서 제한)"""
+        stats = self._stats["fetch"]
+
+        async def fetch_theme(theme):
+            date_from, date_to, start_page = self._windows[theme]
+            page_started = time.perf_counter()
+            try:
+                async for page, items in self.client.iter_pages(theme, date_from, date_to, page_limit,
+                                                                prefetch=self.prefetch, start_page=start_page,
+                                                                raise_errors=True):
+                    stats.record(len(items), len(items), time.perf_counter() - page_started)
+                    self._fetched[theme] += len(items)
+                    await out_queue.put((theme, page, items))
+                    page_started = time.perf_counter()
+            except Exception:
+                # 이미 받은 페이지는 저장하고, 이 테마의 워터마크는 갱신하지 않음
+                self._progress[theme].failed = True
+                self._error_count += 1
+            finally:
+                self._progress[theme].fetch_done = True
+
+        try:
+            await asyncio.gather(*[fetch_theme(theme) for theme in themes])
+        finally:
+            await out_queue.put(_DONE)
+
+    async def _validate_stage(self, in_queue, out_queue):
+        """유효성 검사, 텍스트/메타데이터 구성, 기존 기사 제외 후 배치 크기만큼 모아 전달"""
+        stats = self._stats["validate"]
+        loop = asyncio.get_event_loop()
+        buffer = ([], [], [], [])  # ids, texts, metadatas, (테마, 페이지)
+
+        async def flush():
+            nonlocal buffer
+            if buffer[0]:
+                await out_queue.put(buffer)
+                buffer = ([], [], [], [])
+
+        while True:
+            item = await in_queue.get()
+            if item is _DONE:
+                break
+            theme, page, articles = item
+            date_from, date_to, _ = self._windows[theme]
+            progress = self._progress[theme]
+            started = time.perf_counter()
+            errors = []
+            try:
+                articles = validate_articles(theme, articles, date_from, date_to)
+                for article in articles:
+                    progress.observe(article.get("published_at") or "")
+                # 본문 정제 / MinHash 계산은 CPU 작업이므로 쓰기 쓰레드에서 (유사 중복 색인 조회와 등록 순서 유지)
+                ids, texts, metadatas = await loop.run_in_executor(
+                    self._writer, self.rag_service.prepare_articles, articles, errors
+                )
+
+                # 다른 페이지/테마에서 받아 처리 중인 기사는 테마만 합침
+                rows = []
+                for row in zip(ids, texts, metadatas):
+                    keys = self.rag_service.dedup_keys(row[0], row[2])
+                    target = next((self._in_flight[key] for key in keys if key in self._in_flight), None)
+                    if target is not None:
+                        merge_themes(target, metadata_themes(row[2]))
+                    else:
+                        rows.append(row)
+
+                # 벡터 DB 에 이미 저장된 기사 제외 (테마 갱신이 저장과 겹치지 않도록 쓰기 쓰레드에서)
+                if rows:
+                    rows = list(zip(*await loop.run_in_executor(
+                        self._writer, self.rag_service.filter_existing, *map(list, zip(*rows)), errors
+                    )))
+                for article_id, _, metadata in rows:
+                    self._in_flight.update((key, metadata) for key in self.rag_service.dedup_keys(article_id, metadata))
+            except Exception as e:
+                logger.error(f"테마 '{theme}' 기사 검증 중 오류 발생: {str(e)}")
+                self._error_count += 1
+                rows = []
+                progress.failed = True
+            self._log_errors(errors)
+            stats.record(len(articles), len(rows), time.perf_counter() - started)
+
+            # 저장할 기사가 없는 페이지는 바로 완료 처리
+            if progress.add_page(page, len(rows)):
+                self._advance_cursor(theme)
+
+            for row in rows:
+                for column, value in zip(buffer, (*row, (theme, page))):
+                    column.append(value)
+                if len(buffer[0]) >= self.batch_size:
+                    await flush()
+
+        await flush()
+        await out_queue.put(_DONE)
+
+    async def _embed_stage(self, in_queue, out_queue):
+        """배치 임베딩 (본문 임베딩 캐시 사용)"""
+        stats = self._stats["embed"]
+        while True:
+            item = await in_queue.get()
+            if item is _DONE:
+                break
+            ids, texts, metadatas, pages = item
+            started = time.perf_counter()
+            errors = []
+            try:
+                embeddings = await self.rag_service.embed_texts(ids, texts, EMBEDDING_BATCH_SIZE, errors)
+            except Exception as e:
+                logger.error(f"배치 임베딩 중 오류 발생: {str(e)}")
+                self._error_count += 1
+                embeddings = [None] * len(ids)
+            self._log_errors(errors)
+            stats.record(len(ids), sum(embedding is not None for embedding in embeddings), time.perf_counter() - started)
+            await out_queue.put((ids, texts, metadatas, embeddings, pages))
+
+        await out_queue.put(_DONE)
+
+    async def _store_stage(self, in_queue):
+        """벡터 DB 저장 (쓰기 전용 쓰레드에서 실행)"""
+        stats = self._stats["store"]
+        loop = asyncio.get_event_loop()
+        while True:
+            item = await in_queue.get()
+            if item is _DONE:
+                break
+            ids, texts, metadatas, embeddings, pages = item
+            started = time.perf_counter()
+            errors = []
+
+            # 저장 중에도 다른 테마의 같은 기사가 테마를 추가할 수 있으므로 복사본을 저장
+            snapshot = [dict(metadata) for metadata in metadatas]
+            try:
+                stored_ids = set(await loop.run_in_executor(
+                    self._writer, self.rag_service.store_embedded, ids, texts, snapshot, embeddings, errors
+                ))
+
+                # 저장하는 동안 테마가 추가된 기사는 저장된 문서의 테마 갱신
+                changed = [(i, t, m) for i, t, m, saved in zip(ids, texts, metadatas, snapshot)
+                           if i in stored_ids and m["themes"] != saved["themes"]]
+                if changed:
+                    await loop.run_in_executor(
+                        self._writer, self.rag_service.filter_existing, *map(list, zip(*changed)), errors
+                    )
+            except Exception as e:
+                logger.error(f"벡터 DB 저장 중 오류 발생: {str(e)}")
+                self._error_count += 1
+                stored_ids = set()
+            self._log_errors(errors)
+
+            # 저장이 끝난 기사는 이후 벡터 DB 조회로 중복 판별
+            for article_id, metadata in zip(ids, metadatas):
+                for key in self.rag_service.dedup_keys(article_id, metadata):
+                    self._in_flight.pop(key, None)
+
+            # 저장된 기사만 페이지 완료에 반영 (실패한 기사가 있는 페이지에서 커서가 멈춤)
+            for article_id, (theme, page) in zip(ids, pages):
+                if article_id not in stored_ids:
+                    self._progress[theme].fail_article()
+                    continue
+                self._stored[theme] += 1
+                if self._progress[theme].finish_article(page):
+                    self._advance_cursor(theme)
+            stats.record(sum(embedding is not None for embedding in embeddings), len(stored_ids),
+                         time.perf_counter() - started)
+
+    def progress(self) -> dict:
+        """실행 중 진행 상황 (완료 테마 수, 수집/저장 기사 수, 남은 시간 추정)
+
+        남은 시간은 처리가 끝난 페이지 비율로 추정하며, 수집이 끝나지 않은 테마는 page_limit 까지 있다고 보므로
+        실제보다 길게 추정될 수 있다.
+        """
+        if self._started_at is None:
+            return {}
+        elapsed = time.perf_counter() - self._started_at
+
+        pages_done = pages_expected = 0
+        for theme, progress in self._progress.items():
+            pages_done += len(progress.done)
+            if progress.fetch_done:
+                pages_expected += len(progress.pending)
+            else:
+                pages_expected += max(self._page_limit - self._windows[theme][2] + 1, len(progress.pending))
+        fraction = pages_done / pages_expected if pages_expected else 0.0
+
+        return {
+            "themes_total": len(self._progress),
+            "themes_done": sum(progress.fetch_done and progress.outstanding == 0 for progress in self._progress.values()),
+            "articles_fetched": sum(self._fetched.values()),
+            "articles_stored": sum(self._stored.values()),
+            "elapsed_seconds": round(elapsed, 1),
+            "eta_seconds": round(elapsed * (1 - fraction) / fraction, 1) if fraction > 0 else None
+        }
+
+    def _advance_cursor(self, theme):
+        """앞에서부터 연속으로 완료된 페이지까지 커서 기록"""
+        progress = self._progress[theme]
+        if progress.advance() and self._state is not None:
+            date_from, date_to, _ = self._windows[theme]
+            self._state.update_cursor(theme, date_from, date_to, progress.cursor)
+
+    def _log_errors(self, errors):
+        self._error_count += len(errors)
+        for article_id, reason in errors:
+            logger.error(f"기사 {article_id} 저장 실패: {reason}")
@@ -0,0 +1,135 @@
+import json
+import logging
+import os
+import threading
+
+from datetime import datetime
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+
+# 테마별 수집 진행 상태 저장소
+class IngestionStateStore:
+    """테마별 수집 워터마크와 페이지 커서를 JSON 파일에 저장
+
+    테마별로 다음 값을 보관한다.
+    - published_at: 수집이 끝난 기사 중 가장 최신 published_at (워터마크)
+    - date_to: 마지막으로 끝까지 수집한 기간의 종료일
+    - cursor: 진행 중인 기간 {"date_from", "date_to", "page"} - page 까지의 기사는 저장 완료
+    - updated_at: 마지막 갱신 시각
+
+    파일은 임시 파일에 쓴 뒤 교체하므로 중간에 종료되어도 이전 상태가 유지된다.
+    여러 워커가 같은 파일을 쓰므로 수집 락을 잡은 뒤 reload 로 최신 상태를 읽고 시작한다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._state = self._load()
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ 수집 상태 파일을 읽지 못해 처음부터 수집합니다 ({self.path}): {e}")
+            return {}
+
+    def reload(self):
+        """파일에서 상태를 다시 읽음 (다른 워커가 수집한 뒤 이어서 수집할 때)"""
+        with self._lock:
+            self._state = self._load()
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, theme: str) -> dict:
+        """테마의 수집 상태 반환 (없으면 빈 dict)"""
+        with self._lock:
+            return dict(self._state.get(theme, {}))
+
+    def update_cursor(self, theme: str, date_from: str, date_to: str, page: int):
+        """진행 중인 기간의 page 페이지까지 저장 완료 기록
+
+        페이지는 최신 기사부터 반환되므로 기간이 끝날 때까지 워터마크는 옮기지 않는다.
+        """
+        with self._lock:
+            state = self._state.setdefault(theme, {})
+            state["cursor"] = {"date_from": date_from, "date_to": date_to, "page": page}
+            state["updated_at"] = datetime.now().isoformat(timespec="seconds")
+            self._save()
+
+    def complete(self, theme: str, date_to: str, published_at: str = None):
+        """기간 전체 수집 완료 기록 (커서 제거, 워터마크 갱신)"""
+        with self._lock:
+            state = self._state.setdefault(theme, {})
+            state.pop("cursor", None)
+            state["date_to"] = date_to
+            if published_at and published_at > state.get("published_at", ""):
+                state["published_at"] = published_at
+            state["updated_at"] = datetime.now().isoformat(timespec="seconds")
+            self._save()
+
+
+# 테마별 페이지 진행 상황
+class ThemeProgress:
+    """테마의 페이지별 남은 기사 수와 연속 완료 페이지(커서) 추적
+
+    수집 파이프라인이 사용하며, 커서는 IngestionStateStore.update_cursor 로 저장된다.
+    """
+
+    def __init__(self, start_page: int):
+        self.cursor = start_page - 1
+        self.pending = {}       # 페이지 -> 저장 대기 기사 수
+        self.outstanding = 0    # 저장 단계까지 처리되지 않은 기사 수 (저장 실패 포함)
+        self.done = set()
+        self.failed = False
+        self.fetch_done = False
+        self.newest_published_at = ""
+
+    def observe(self, published_at: str):
+        if published_at > self.newest_published_at:
+            self.newest_published_at = published_at
+
+    def add_page(self, page: int, count: int) -> bool:
+        """페이지 등록 - 저장할 기사가 없으면 완료로 보고 True 반환"""
+        self.pending[page] = count
+        self.outstanding += count
+        if count == 0:
+            self.done.add(page)
+            return True
+        return False
+
+    def finish_article(self, page: int) -> bool:
+        """기사 하나 저장 완료 - 페이지가 끝나면 True 반환"""
+        self.outstanding -= 1
+        self.pending[page] -= 1
+        if self.pending[page] == 0:
+            self.done.add(page)
+            return True
+        return False
+
+    def advance(self) -> bool:
+        """연속으로 완료된 페이지까지 커서 이동 - 이동했으면 True"""
+        moved = False
+        while self.cursor + 1 in self.done:
+            self.cursor += 1
+            moved = True
+        return moved
+
+    def fail_article(self):
+        """기사 하나 저장 실패 - 해당 페이지는 완료되지 않음"""
+        self.outstanding -= 1
+        self.failed = True
+
+    def is_complete(self) -> bool:
+        return not self.failed and all(count == 0 for count in self.pending.values())
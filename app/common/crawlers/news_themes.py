@@ -0,0 +1,15 @@
+# 관심 테마 목록 - 각 키워드는 DeepSearch API 의 검색어로 사용됨
+# 이 키워드들은 포트폴리오 추천 시 사용된는 테마와 일치하도록 설정되어 있음
+# (수집기 / 벤치마크 대체 서버가 임베딩 모델이나 벡터 DB 를 불러오지 않고 참조할 수 있도록 별도 모듈로 분리)
+DEFAULT_THEMES = [
+    "에너지",
+    "철강",
+    "건설",
+    "여행",
+    "은행",
+    "증권",
+    "반도체",
+    "AI",
+    "5G",
+    "부동산"
+]
@@ -0,0 +1,250 @@
+import logging
+import threading
+
+import numpy as np
+
+from app.common.db.vector.where_filter import match_where
+
+logger = logging.getLogger(__name__)
+
+# 크기 제한 초과를 확인한 컬렉션 버전이 없음
+_NOT_CHECKED = object()
+
+
+# 메모리 전수 탐색 인덱스
+class ExactSearchIndex:
+    """소규모 컬렉션을 위한 메모리 행렬 기반 전수(exact) 검색
+
+    보관 기간이 30일이라 문서 수가 수천 개 수준이므로, 임베딩 행렬과 쿼리의 행렬 곱 한 번으로
+    HNSW 검색보다 빠르고 정확한 top-k 를 구할 수 있다.
+    거리는 컬렉션의 hnsw:space 와 같은 방식으로 계산하여 벡터 DB 검색 결과와 점수가 일치한다.
+    다른 프로세스(수집 워커)가 컬렉션을 바꾸면 공유 컬렉션 버전이 달라지므로 다시 적재한다.
+    (ip: 1 - 내적, cosine: 1 - 코사인 유사도 - 행렬을 미리 L2 정규화, l2: 유클리드 거리 제곱)
+    여러 쓰레드에서 동시에 사용할 수 있다.
+    """
+
+    def __init__(self, space: str = "ip", dtype=np.float32, max_documents: int = 20000):
+        self.space = space
+        self.dtype = np.dtype(dtype)
+        self.max_documents = max_documents
+        self._lock = threading.RLock()
+        self._oversized_version = _NOT_CHECKED  # 문서 수가 max_documents 를 넘는다고 확인한 컬렉션 버전
+        self._clear()
+
+    def _clear(self):
+        self.loaded = False
+        self.version = None
+        self._matrix = None
+        self._ids = []
+        self._documents = []
+        self._metadatas = []
+        self._partitions = np.array([], dtype=object)
+        self._positions = {}  # (파티션, 문서 ID) -> 행 번호 (테마별 분할 시 같은 ID 가 여러 파티션에 있음)
+        self._mask_cache = {}
+
+    def __len__(self):
+        return len(self._ids)
+
+    def ensure_loaded(self, collections, page_size: int = 1000, version=None) -> bool:
+        """최초 사용 시 또는 컬렉션 버전이 바뀌었을 때 컬렉션 전체를 메모리에 적재
+
+        전체 문서 수가 max_documents 를 넘으면 적재하지 않고 False 를 반환한다 (벡터 DB 검색 사용).
+        이 판단은 컬렉션 버전이 바뀔 때까지 유지되어 검색마다 문서 수를 다시 세지 않는다.
+
+        Args:
+            version: 공유 컬렉션 버전 (None 이면 버전 확인 없이 최초 1회만 적재)
+        """
+        if self.loaded and (version is None or version == self.version):
+            return True
+        if not self.loaded and version == self._oversized_version:
+            return False
+        with self._lock:
+            if self.loaded and (version is None or version == self.version):
+                return True
+            if not self.loaded and version == self._oversized_version:
+                return False
+            if self.loaded:
+                logger.info(f"[ExactSearch] 컬렉션 버전 변경 ({self.version} → {version}) - 메모리 인덱스 다시 적재")
+            if sum(collection.count() for collection in collections) > self.max_documents:
+                self._clear()
+                self._oversized_version = version
+                return False
+
+            self._clear()
+            for collection in collections:
+                offset = 0
+                while True:
+                    page = collection.get(limit=page_size, offset=offset,
+                                          include=["embeddings", "documents", "metadatas"])
+                    if not page["ids"]:
+                        break
+                    offset += len(page["ids"])
+                    self._add(collection.name, page["ids"], page["documents"], page["metadatas"], page["embeddings"])
+            self.loaded = True
+            self.version = version
+            logger.info(f"[ExactSearch] 메모리 인덱스 적재 완료: {len(self._ids)}개 문서 ({self.dtype})")
+            return True
+
+    def advance_version(self, previous, current):
+        """이 프로세스의 변경을 이미 반영한 경우 버전만 올림 (다시 적재하지 않음)"""
+        with self._lock:
+            if self.loaded and self.version == previous:
+                self.version = current
+
+    def add(self, partition: str, ids, documents, metadatas, embeddings):
+        """문서 추가 (적재 전이면 무시 - 적재 시 벡터 DB 에서 함께 읽음)"""
+        with self._lock:
+            if not self.loaded:
+                return
+            self._add(partition, ids, documents, metadatas, embeddings)
+            if len(self._ids) > self.max_documents:
+                # 크기 제한을 넘으면 메모리를 반환하고 벡터 DB 검색으로 전환
+                logger.info(f"[ExactSearch] 문서 수 {len(self._ids)}개가 제한({self.max_documents})을 넘어 메모리 인덱스 해제")
+                self._oversized_version = self.version
+                self._clear()
+
+    def update_metadata(self, partition: str, ids, metadatas):
+        """파티션(컬렉션) 안의 문서 메타데이터 교체"""
+        with self._lock:
+            if not self.loaded:
+                return
+            for doc_id, metadata in zip(ids, metadatas):
+                position = self._positions.get((partition, doc_id))
+                if position is not None:
+                    self._metadatas[position] = metadata
+            self._mask_cache = {}
+
+    def remove(self, ids, partition: str = None):
+        """문서 삭제 (partition 이 None 이면 모든 파티션에서)"""
+        with self._lock:
+            if self.loaded:
+                self._remove(partition, ids)
+
+    def query(self, query_embeddings, n_results: int, where=None, include=(), partitions=None):
+        """전수 검색 - collection.query 와 같은 형식의 결과 반환
+
+        Args:
+            query_embeddings: 쿼리 임베딩 목록
+            n_results: 쿼리별 결과 수
+            where: ChromaDB 형식의 메타데이터 조건
+            include: documents, metadatas, distances, embeddings 중 반환할 항목
+            partitions: 검색할 컬렉션 이름 목록 (None 이면 전체)
+        """
+        with self._lock:
+            matrix, ids, documents, metadatas = self._matrix, self._ids, self._documents, self._metadatas
+            mask = self._candidate_mask(where, partitions)
+
+        fields = {
+            "ids": lambda i: ids[i],
+            "distances": None,
+            "documents": lambda i: documents[i],
+            "metadatas": lambda i: metadatas[i],
+            "embeddings": lambda i: matrix[i].astype(np.float32),
+        }
+        fields = {field: getter for field, getter in fields.items() if field == "ids" or field in include}
+        results = {field: [] for field in fields}
+
+        queries = np.asarray(query_embeddings, dtype=np.float32).reshape(len(query_embeddings), -1)
+        if matrix is None or not len(ids):
+            return {field: [[] for _ in queries] for field in fields}
+
+        if self.space == "cosine":
+            norms = np.linalg.norm(queries, axis=1, keepdims=True)
+            queries = queries / np.where(norms == 0, 1, norms)
+
+        # 쿼리 전체에 대해 행렬 곱 한 번으로 거리 계산
+        scores = queries @ matrix.T.astype(np.float32, copy=False)
+        if self.space == "l2":
+            distances = (np.sum(queries ** 2, axis=1, keepdims=True) - 2 * scores
+                         + np.sum(matrix.astype(np.float32, copy=False) ** 2, axis=1))
+        else:
+            distances = 1 - scores
+        if mask is not None:
+            distances[:, ~mask] = np.inf
+
+        available = len(ids) if mask is None else int(mask.sum())
+        k = min(n_results, available)
+        for row in distances:
+            if k <= 0:
+                top = np.array([], dtype=int)
+            else:
+                top = np.argpartition(row, k - 1)[:k] if k < len(row) else np.arange(len(row))
+                top = top[np.argsort(row[top], kind="stable")]
+                if len({ids[i] for i in top}) < len(top):
+                    # 테마별 분할 시 같은 기사가 여러 파티션에 있으면 가장 가까운 것 하나만 (벡터 DB 검색 병합과 동일)
+                    top = self._unique_top(row, ids, k, available)
+            for field, getter in fields.items():
+                if field == "distances":
+                    results[field].append([float(row[i]) for i in top])
+                else:
+                    results[field].append([getter(i) for i in top])
+
+        return results
+
+    @staticmethod
+    def _unique_top(row, ids, k, available):
+        """거리 순으로 ID 가 겹치지 않는 상위 k 개 행 번호"""
+        top, seen = [], set()
+        for i in np.argsort(row, kind="stable")[:available]:
+            if ids[i] not in seen:
+                seen.add(ids[i])
+                top.append(i)
+                if len(top) >= k:
+                    break
+        return np.array(top, dtype=int)
+
+    def _candidate_mask(self, where, partitions):
+        """조건에 맞는 문서 마스크 (조건이 없으면 None) - 인덱스가 바뀔 때까지 캐시"""
+        if not where and partitions is None:
+            return None
+
+        key = (repr(where), tuple(sorted(partitions)) if partitions is not None else None)
+        mask = self._mask_cache.get(key)
+        if mask is None:
+            mask = np.ones(len(self._ids), dtype=bool)
+            if partitions is not None:
+                mask &= np.isin(self._partitions, list(partitions))
+            if where:
+                mask &= np.fromiter((match_where(meta or {}, where) for meta in self._metadatas),
+                                    dtype=bool, count=len(self._metadatas))
+            self._mask_cache[key] = mask
+        return mask
+
+    def _add(self, partition, ids, documents, metadatas, embeddings):
+        # 같은 파티션에 같은 ID 가 있으면 교체
+        self._remove(partition, ids)
+
+        rows = np.asarray(embeddings, dtype=np.float32).reshape(len(ids), -1)
+        if self.space == "cosine":
+            norms = np.linalg.norm(rows, axis=1, keepdims=True)
+            rows = rows / np.where(norms == 0, 1, norms)
+        rows = rows.astype(self.dtype)
+
+        self._matrix = rows if self._matrix is None else np.vstack([self._matrix, rows])
+        self._partitions = np.concatenate([self._partitions, np.array([partition] * len(ids), dtype=object)])
+        self._ids.extend(ids)
+        self._documents.extend(documents)
+        self._metadatas.extend(metadatas)
+        self._reindex()
+
+    def _remove(self, partition, ids):
+        if partition is not None:
+            remove_positions = [self._positions[key] for key in ((partition, doc_id) for doc_id in ids)
+                                if key in self._positions]
+        else:
+            ids = set(ids)
+            remove_positions = [position for (_, doc_id), position in self._positions.items() if doc_id in ids]
+        if not remove_positions:
+            return
+        keep = np.ones(len(self._ids), dtype=bool)
+        keep[remove_positions] = False
+        self._matrix = self._matrix[keep]
+        self._partitions = self._partitions[keep]
+        self._ids = [doc_id for doc_id, kept in zip(self._ids, keep) if kept]
+        self._documents = [doc for doc, kept in zip(self._documents, keep) if kept]
+        self._metadatas = [meta for meta, kept in zip(self._metadatas, keep) if kept]
+        self._reindex()
+
+    def _reindex(self):
+        self._positions = {key: i for i, key in enumerate(zip(self._partitions, self._ids))}
+        self._mask_cache = {}
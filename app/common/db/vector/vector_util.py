@@ -1,20 +1,63 @@
+import hashlib
 import logging
 import os
 from chromadb import PersistentClient
 
+from app.common.db.vector.exact_index import ExactSearchIndex
+from app.common.db.vector.where_filter import match_where
+
 logger = logging.getLogger(__name__)
 
 #벡터 DB 저장 경로
 persist_dir = os.getenv("VECTOR_PERSIST_PATH")
 
+# 테마별 컬렉션 분할 여부
+partition_by_theme = os.getenv("VECTOR_PARTITION_BY_THEME", "false").lower() == "true"
+
+# 메모리 전수 검색 사용 여부 (문서 수가 제한 이하일 때만 사용, 초과 시 벡터 DB 검색)
+exact_search = os.getenv("VECTOR_EXACT_SEARCH", "false").lower() == "true"
+exact_max_documents = int(os.getenv("VECTOR_EXACT_MAX_DOCUMENTS", "20000"))
+exact_dtype = os.getenv("VECTOR_EXACT_DTYPE", "float32")  # float32 | float16 (메모리 절반)
+
+
+# 컬렉션 생성 시에만 적용되는 HNSW 설정 (search_ef 는 기존 컬렉션을 열 때 collection.modify 로 반영)
+HNSW_BUILD_KEYS = ("hnsw:construction_ef", "hnsw:M")
+
+
+def hnsw_metadata(space=None, construction_ef=None, search_ef=None, m=None, use_env: bool = True) -> dict:
+    """HNSW 인덱스 설정을 컬렉션 메타데이터로 변환 (지정하지 않은 값은 환경 변수, 없으면 ChromaDB 기본값)
+
+    construction_ef, M 은 컬렉션 생성 시에만 적용되므로 기존 컬렉션에는 반영되지 않는다.
+    (search_ef 는 VectorUtil 이 기존 컬렉션을 열 때 컬렉션 설정의 ef_search 로 반영한다)
+    use_env=False 면 환경 변수를 읽지 않으므로 지정하지 않은 값은 ChromaDB 기본값이 된다 (벤치마크 기준 설정용).
+    """
+    env = os.getenv if use_env else (lambda key, default=None: default)
+    settings = {
+        "hnsw:space": space or env("VECTOR_HNSW_SPACE", "ip"),
+        "hnsw:construction_ef": construction_ef or env("VECTOR_HNSW_CONSTRUCTION_EF"),
+        "hnsw:search_ef": search_ef or env("VECTOR_HNSW_SEARCH_EF"),
+        "hnsw:M": m or env("VECTOR_HNSW_M"),
+    }
+    return {key: value if key == "hnsw:space" else int(value) for key, value in settings.items() if value}
+
+
 # 벡터 DB 접근을 위한 유틸 클래스
 class VectorUtil:
     _chroma_client = None
     _collection = None
 
-    def __init__(self, collection_name="articles", persist_directory=persist_dir):
+    def __init__(self, collection_name="articles", persist_directory=persist_dir,
+                 partition_by_theme=partition_by_theme, hnsw_config=None, exact_search=exact_search):
         self._collection_name = collection_name
         self._persist_directory = persist_directory
+        self.partition_by_theme = partition_by_theme
+        self.hnsw_config = hnsw_config or hnsw_metadata()
+        self.exact_index = ExactSearchIndex(
+            space=self.hnsw_config["hnsw:space"], dtype=exact_dtype, max_documents=exact_max_documents
+        ) if exact_search else None
+        self._theme_collections = {}
+        # 공유 컬렉션 버전을 반환하는 함수 (설정되면 버전이 바뀔 때 메모리 인덱스를 다시 적재)
+        self.version_source = None
 
     # ChromaDB 클라이언트 초기화
     def __get_vector_client(self):
@@ -31,13 +74,173 @@ class VectorUtil:
     def get_collection(self):
         if self._collection is None:
             try:
-                # 내적 거리 측정을 사용한 컬렉션 생성
+                # 내적 거리 측정을 사용한 컬렉션 생성 (HNSW 설정은 hnsw_metadata 참고)
                 self._collection = self.__get_vector_client().get_or_create_collection(
                     name = self._collection_name,
-                    metadata={"hnsw:space": "ip"}
+                    metadata=dict(self.hnsw_config)
                 )
+                self._check_hnsw_config(self._collection)
                 logger.info(f"ChromaDB collection '{self._collection_name}' 준비 완료.")
             except Exception as e:
                 logger.error("ChromaDB collection 초기화 실패", exc_info=True)
                 raise RuntimeError(f"ChromaDB collection 초기화 실패: {e}")
         return self._collection
+
+    # 테마별 컬렉션 받아 오기
+    def get_theme_collection(self, theme: str):
+        """테마 전용 컬렉션 반환 (없으면 생성)
+
+        컬렉션 이름에는 한글을 사용할 수 없으므로 테마명 해시로 이름을 만들고,
+        원래 테마명은 컬렉션 메타데이터에 저장한다.
+        """
+        if theme not in self._theme_collections:
+            name = f"{self._collection_name}-{hashlib.md5(theme.encode('utf-8')).hexdigest()[:12]}"
+            try:
+                self._theme_collections[theme] = self.__get_vector_client().get_or_create_collection(
+                    name=name,
+                    metadata={**self.hnsw_config, "theme": theme}
+                )
+                self._check_hnsw_config(self._theme_collections[theme])
+                logger.info(f"ChromaDB 테마 collection '{name}' ({theme}) 준비 완료.")
+            except Exception as e:
+                logger.error("ChromaDB 테마 collection 초기화 실패", exc_info=True)
+                raise RuntimeError(f"ChromaDB 테마 collection 초기화 실패: {e}")
+        return self._theme_collections[theme]
+
+    def _check_hnsw_config(self, collection):
+        """기존 컬렉션에 search_ef 반영, construction_ef / M 이 현재 설정과 다르면 경고 (생성 후에는 변경되지 않음)
+
+        컬렉션 메타데이터의 hnsw:search_ef 는 생성 시에만 읽히므로, 검색에 쓰이는 컬렉션 설정(ef_search)을 직접 바꾼다.
+        """
+        search_ef = self.hnsw_config.get("hnsw:search_ef")
+        hnsw = (collection.configuration or {}).get("hnsw") or {}
+        if search_ef is not None and hnsw and hnsw.get("ef_search") != search_ef:
+            try:
+                collection.modify(configuration={"hnsw": {"ef_search": search_ef}})
+                logger.info(f"ChromaDB collection '{collection.name}' 의 search_ef 변경: "
+                            f"{hnsw.get('ef_search')} → {search_ef}")
+            except Exception as e:
+                logger.warning(f"ChromaDB collection '{collection.name}' 의 search_ef 변경 실패: {str(e)}")
+
+        metadata = collection.metadata or {}
+        different = {key: (metadata.get(key), value) for key, value in self.hnsw_config.items()
+                     if key in HNSW_BUILD_KEYS and key in metadata and metadata[key] != value}
+        if different:
+            logger.warning(f"ChromaDB collection '{collection.name}' 의 HNSW 설정이 현재 설정과 다릅니다 "
+                           f"(기존, 설정): {different} - 새 설정을 적용하려면 컬렉션을 다시 생성해야 합니다.")
+
+    def create_staging_collection(self, collection):
+        """컬렉션을 다시 만들 때 사용할 빈 임시 컬렉션 생성 (같은 설정, 이전 임시 컬렉션은 삭제)
+
+        이름이 기본 컬렉션 접두사로 시작하지 않으므로 테마 컬렉션 목록에 섞이지 않는다.
+        """
+        client = self.__get_vector_client()
+        name = f"staging-{collection.name}"
+        if name in [existing.name for existing in client.list_collections()]:
+            client.delete_collection(name)
+        return client.create_collection(name=name, metadata=dict(collection.metadata or self.hnsw_config))
+
+    def replace_collection(self, collection, staging):
+        """기존 컬렉션을 삭제하고 임시 컬렉션을 같은 이름으로 바꿈 (컬렉션 캐시 초기화)"""
+        name = collection.name
+        client = self.__get_vector_client()
+        client.delete_collection(name)
+        staging.modify(name=name)
+        self._collection = None
+        self._theme_collections = {}
+        logger.info(f"ChromaDB collection '{name}' 교체 완료.")
+        return staging
+
+    def get_theme_collections(self) -> dict:
+        """저장된 모든 테마 컬렉션을 {테마: 컬렉션} 으로 반환"""
+        prefix = f"{self._collection_name}-"
+        for collection in self.__get_vector_client().list_collections():
+            theme = (collection.metadata or {}).get("theme")
+            if theme and collection.name.startswith(prefix) and theme not in self._theme_collections:
+                self._theme_collections[theme] = collection
+        return dict(self._theme_collections)
+
+    def get_partition(self, theme: str = None):
+        """기사를 저장할 컬렉션 반환 (분할 모드에서 테마가 있으면 테마 컬렉션, 아니면 기본 컬렉션)"""
+        if self.partition_by_theme and theme:
+            return self.get_theme_collection(theme)
+        return self.get_collection()
+
+    def get_search_collections(self, themes=None) -> list:
+        """검색할 컬렉션 목록 반환
+
+        분할 모드에서는 요청한 테마의 컬렉션만 검색한다.
+        요청한 테마에 해당하는 컬렉션이 하나도 없으면 기본 컬렉션과 모든 테마 컬렉션을 검색한다.
+        """
+        if not self.partition_by_theme:
+            return [self.get_collection()]
+
+        theme_collections = self.get_theme_collections()
+        selected = [theme_collections[theme] for theme in dict.fromkeys(themes or []) if theme in theme_collections]
+        return selected or self.get_all_collections()
+
+    def get_all_collections(self) -> list:
+        """기본 컬렉션과 모든 테마 컬렉션 반환 (보관 기간 정리, 통계 등 전체 작업용)"""
+        collections = [self.get_collection()]
+        if self.partition_by_theme:
+            collections.extend(self.get_theme_collections().values())
+        return collections
+
+    def query_collections(self, collections, query_embeddings, n_results, where=None, include=("distances",)):
+        """여러 컬렉션을 검색하고 쿼리별로 거리 순 상위 n_results 개를 병합
+
+        메모리 전수 검색이 켜져 있고 문서 수가 제한 이하이면 벡터 DB 대신 메모리 행렬에서 검색한다.
+        반환 형식은 collection.query 결과와 같다.
+        """
+        include = list(include)
+        version = self.version_source() if self.version_source is not None else None
+        if self.exact_index is not None and self.exact_index.ensure_loaded(self.get_all_collections(), version=version):
+            partitions = [collection.name for collection in collections] if self.partition_by_theme else None
+            return self.exact_index.query(query_embeddings, n_results, where, include, partitions)
+
+        if len(collections) == 1:
+            return collections[0].query(
+                query_embeddings=query_embeddings, n_results=n_results, where=where, include=include
+            )
+
+        fields = ["ids"] + [field for field in include if field != "distances"]
+        merged = {field: [[] for _ in query_embeddings] for field in fields + ["distances"]}
+        for i in range(len(query_embeddings)):
+            rows = []
+            for collection in collections:
+                results = collection.query(
+                    query_embeddings=[query_embeddings[i]], n_results=n_results, where=where, include=include
+                )
+                rows.extend(zip(results["distances"][0], *[results[field][0] for field in fields]))
+
+            seen_ids = set()
+            for row in sorted(rows, key=lambda x: x[0]):
+                if row[1] in seen_ids:
+                    continue
+                seen_ids.add(row[1])
+                merged["distances"][i].append(row[0])
+                for field, value in zip(fields, row[1:]):
+                    merged[field][i].append(value)
+                if len(seen_ids) >= n_results:
+                    break
+        return merged
+
+    def on_documents_added(self, collection, ids, documents, metadatas, embeddings):
+        """문서 저장 후 메모리 검색 인덱스 갱신"""
+        if self.exact_index is not None:
+            self.exact_index.add(collection.name, ids, documents, metadatas, embeddings)
+
+    def on_documents_updated(self, collection, ids, metadatas):
+        """문서 메타데이터 갱신 후 메모리 검색 인덱스 갱신"""
+        if self.exact_index is not None:
+            self.exact_index.update_metadata(collection.name, ids, metadatas)
+
+    def on_documents_deleted(self, collection, ids):
+        """문서 삭제 후 메모리 검색 인덱스 갱신"""
+        if self.exact_index is not None:
+            self.exact_index.remove(ids, collection.name)
+
+    def advance_version(self, previous, current):
+        """이 프로세스에서 반영한 변경으로 컬렉션 버전이 올랐음을 메모리 검색 인덱스에 표시"""
+        if self.exact_index is not None:
+            self.exact_index.advance_version(previous, current)
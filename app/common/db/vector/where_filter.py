@@ -0,0 +1,46 @@
+# 메타데이터 where 조건 평가 (ChromaDB where 문법의 부분 집합)
+def match_where(metadata: dict, where: dict) -> bool:
+    """메타데이터가 ChromaDB 형식의 where 조건을 만족하는지 확인
+
+    벡터 DB 밖에서 검색할 때(BM25 등) 같은 조건을 적용하기 위해 사용한다.
+    지원 연산자 : $and, $or, $eq, $ne, $gt, $gte, $lt, $lte, $in, $nin
+    """
+    if not where:
+        return True
+
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(match_where(metadata, sub) for sub in condition):
+                return False
+            continue
+        if key == "$or":
+            if not any(match_where(metadata, sub) for sub in condition):
+                return False
+            continue
+
+        value = metadata.get(key)
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+
+        for operator, operand in condition.items():
+            if not _OPERATORS[operator](value, operand):
+                return False
+    return True
+
+
+def _compare(compare):
+    def check(value, operand):
+        return value is not None and not isinstance(value, str) and compare(value, operand)
+    return check
+
+
+_OPERATORS = {
+    "$eq": lambda value, operand: value == operand,
+    "$ne": lambda value, operand: value != operand,
+    "$gt": _compare(lambda value, operand: value > operand),
+    "$gte": _compare(lambda value, operand: value >= operand),
+    "$lt": _compare(lambda value, operand: value < operand),
+    "$lte": _compare(lambda value, operand: value <= operand),
+    "$in": lambda value, operand: value in operand,
+    "$nin": lambda value, operand: value not in operand,
+}
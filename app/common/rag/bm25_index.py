@@ -0,0 +1,170 @@
+import heapq
+import logging
+import math
+import re
+import threading
+
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+# 한글 / 영문·숫자 토큰
+TOKEN_PATTERN = re.compile(r"[가-힣]+|[a-z0-9]+")
+
+
+def tokenize(text: str):
+    """BM25 용 토큰화
+
+    한국어는 조사/어미가 붙어 어절 단위로는 일치하지 않으므로
+    한글 어절은 어절 자체와 글자 bigram 을 함께 색인한다 ("반도체의" → 반도체의, 반도, 도체, 체의).
+    영문/숫자는 소문자 단어 단위로 색인한다 ("5G", "AI" → 5g, ai).
+    """
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(token)
+        if len(token) > 2 and "가" <= token[0] <= "힣":
+            tokens.extend(token[i:i + 2] for i in range(len(token) - 1))
+    return tokens
+
+
+# BM25 역색인
+class BM25Index:
+    """저장된 기사 텍스트에 대한 메모리 BM25 역색인
+
+    save_news_data / delete_old_documents 에서 증분으로 갱신되며,
+    벡터 검색 결과와 합치기 위해 문서 본문과 메타데이터도 함께 보관한다.
+    여러 쓰레드에서 동시에 사용할 수 있다.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._clear()
+
+    def _clear(self):
+        self._postings = {}    # term -> {doc_id: tf}
+        self._doc_terms = {}   # doc_id -> Counter(term -> tf)
+        self._doc_lengths = {} # doc_id -> 토큰 수
+        self._documents = {}   # doc_id -> (document, metadata)
+        self._total_length = 0
+        self.loaded = False
+        self.version = None
+
+    def __len__(self):
+        return len(self._doc_terms)
+
+    def ensure_loaded(self, collections, page_size: int = 1000, version=None):
+        """최초 사용 시 또는 컬렉션 버전이 바뀌었을 때 컬렉션 전체로 색인 생성 (그 사이에는 증분 갱신)
+
+        Args:
+            version: 공유 컬렉션 버전 (None 이면 버전 확인 없이 최초 1회만 생성)
+        """
+        if self.loaded and (version is None or version == self.version):
+            return
+        with self._lock:
+            if self.loaded and (version is None or version == self.version):
+                return
+            if self.loaded:
+                logger.info(f"[BM25] 컬렉션 버전 변경 ({self.version} → {version}) - 색인 다시 생성")
+            self._clear()
+            for collection in collections:
+                offset = 0
+                while True:
+                    page = collection.get(limit=page_size, offset=offset, include=["documents", "metadatas"])
+                    if not page["ids"]:
+                        break
+                    offset += len(page["ids"])
+                    self._add(page["ids"], page["documents"], page["metadatas"])
+            self.loaded = True
+            self.version = version
+            logger.info(f"[BM25] 색인 생성 완료: {len(self._doc_terms)}개 문서")
+
+    def advance_version(self, previous, current):
+        """이 프로세스의 변경을 이미 반영한 경우 버전만 올림 (다시 생성하지 않음)"""
+        with self._lock:
+            if self.loaded and self.version == previous:
+                self.version = current
+
+    def add(self, ids, documents, metadatas):
+        """문서 추가 (같은 ID 가 있으면 교체)"""
+        with self._lock:
+            self._add(ids, documents, metadatas)
+
+    def remove(self, ids):
+        """문서 삭제"""
+        with self._lock:
+            for doc_id in ids:
+                self._remove(doc_id)
+
+    def update_metadata(self, ids, metadatas):
+        """문서 메타데이터만 교체 (색인은 그대로)"""
+        with self._lock:
+            for doc_id, metadata in zip(ids, metadatas):
+                if doc_id in self._documents:
+                    self._documents[doc_id] = (self._documents[doc_id][0], metadata)
+
+    def get(self, doc_id):
+        """(문서, 메타데이터) 반환 (없으면 None)"""
+        with self._lock:
+            return self._documents.get(doc_id)
+
+    def search(self, query: str, n_results: int, doc_filter=None):
+        """BM25 점수 상위 문서 반환
+
+        Args:
+            query: 검색어
+            n_results: 반환할 문서 수
+            doc_filter: (metadata) -> bool, 조건에 맞는 문서만 반환
+
+        Returns:
+            [(doc_id, score, document, metadata)] 점수 내림차순
+            (다른 쓰레드의 삭제와 겹치지 않도록 잠금 안에서 문서 / 메타데이터를 함께 꺼냄)
+        """
+        with self._lock:
+            doc_count = len(self._doc_terms)
+            if not doc_count:
+                return []
+            avg_length = self._total_length / doc_count
+
+            scores = {}
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = tf + self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+
+            if doc_filter is not None:
+                scores = {doc_id: score for doc_id, score in scores.items()
+                          if doc_filter(self._documents[doc_id][1] or {})}
+
+            top = heapq.nlargest(n_results, scores.items(), key=lambda item: item[1])
+            return [(doc_id, score, *self._documents[doc_id]) for doc_id, score in top]
+
+    def _add(self, ids, documents, metadatas):
+        for doc_id, document, metadata in zip(ids, documents, metadatas):
+            self._remove(doc_id)
+            terms = Counter(tokenize(document or ""))
+            self._doc_terms[doc_id] = terms
+            self._doc_lengths[doc_id] = sum(terms.values())
+            self._documents[doc_id] = (document, metadata)
+            self._total_length += self._doc_lengths[doc_id]
+            for term, tf in terms.items():
+                self._postings.setdefault(term, {})[doc_id] = tf
+
+    def _remove(self, doc_id):
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self._documents.pop(doc_id, None)
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
@@ -0,0 +1,219 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from collections import Counter
+from contextlib import closing
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS theme_day_counts (
+    theme TEXT NOT NULL,
+    day TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (theme, day)
+);
+CREATE TABLE IF NOT EXISTS day_counts (
+    day TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS publisher_counts (
+    publisher TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stats_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+# 벡터 DB 수집 현황 통계
+class CollectionStats:
+    """테마별 / 날짜별 / 매체별 문서 수를 SQLite 에 증분으로 유지
+
+    문서 저장/삭제/테마 추가 시 메타데이터로 한 번의 트랜잭션에 개수를 갱신하므로,
+    수집 현황 확인에 벡터 DB 전체 메타데이터를 읽지 않아도 된다.
+    여러 테마에 속한 문서는 테마별 개수에는 각 테마에 한 번씩, 날짜/매체별 개수에는 한 번만 집계된다.
+    연결은 호출마다 새로 열어 여러 쓰레드/프로세스에서 함께 사용할 수 있다.
+
+    개수를 갱신할 때마다 같은 트랜잭션에서 컬렉션 버전(stats_meta.version)도 올리므로,
+    수집하지 않는 다른 워커는 version() 이 바뀐 것을 보고 메모리 색인/캐시를 다시 적재한다.
+    """
+
+    def __init__(self, path: str, themes_of=None, version_check_seconds: float = 1.0):
+        """
+        Args:
+            path: SQLite 파일 경로
+            themes_of: (metadata) -> 테마 목록 (None 이면 theme 필드만 사용)
+            version_check_seconds: version() 이 SQLite 를 다시 읽기 전까지 이전 값을 사용하는 시간
+        """
+        self.path = path
+        self.themes_of = themes_of or (lambda metadata: [metadata.get("theme")] if metadata.get("theme") else [])
+        self.version_check_seconds = version_check_seconds
+        self._version_lock = threading.Lock()
+        self._version = None
+        self._version_checked_at = 0.0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def apply(self, added=(), removed=()) -> int:
+        """추가/삭제된 문서의 메타데이터로 개수 갱신 및 컬렉션 버전 증가 (한 트랜잭션)
+
+        테마가 추가된 문서는 이전 메타데이터를 removed, 새 메타데이터를 added 로 넘긴다.
+        새 컬렉션 버전을 반환한다 (이전 버전은 반환값 - 1).
+        """
+        with closing(self._connect()) as conn, conn:
+            self._write_counts(conn, added, removed)
+            version = self._bump_version(conn)
+        self._set_version(version)
+        return version
+
+    def _write_counts(self, conn, added=(), removed=()):
+        theme_days, days, publishers = Counter(), Counter(), Counter()
+        for metadatas, sign in ((added, 1), (removed, -1)):
+            for metadata in metadatas:
+                metadata = metadata or {}
+                day = (metadata.get("published_at") or "")[:10] or "unknown"
+                days[day] += sign
+                publishers[metadata.get("publisher") or "unknown"] += sign
+                for theme in self.themes_of(metadata) or ["unknown"]:
+                    theme_days[(theme, day)] += sign
+
+        self._upsert(conn, "theme_day_counts", ("theme", "day"),
+                     [(*key, delta) for key, delta in theme_days.items() if delta])
+        self._upsert(conn, "day_counts", ("day",), [(key, delta) for key, delta in days.items() if delta])
+        self._upsert(conn, "publisher_counts", ("publisher",),
+                     [(key, delta) for key, delta in publishers.items() if delta])
+
+    def bump_version(self) -> int:
+        """개수 변화 없이 컬렉션 내용이 바뀐 경우 (재임베딩 등) 버전만 증가"""
+        with closing(self._connect()) as conn, conn:
+            version = self._bump_version(conn)
+        self._set_version(version)
+        return version
+
+    def version(self) -> int:
+        """컬렉션 버전 (최대 version_check_seconds 전에 읽은 값)"""
+        now = time.monotonic()
+        if self._version is not None and now - self._version_checked_at < self.version_check_seconds:
+            return self._version
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT value FROM stats_meta WHERE key = 'version'").fetchone()
+        version = int(row[0]) if row else 0
+        with self._version_lock:
+            # 읽는 사이 이 프로세스에서 올린 버전이 있으면 그 값을 유지
+            if self._version is None or version >= self._version:
+                self._version = version
+            self._version_checked_at = now
+            return self._version
+
+    @staticmethod
+    def _bump_version(conn) -> int:
+        conn.execute(
+            "INSERT INTO stats_meta (key, value) VALUES ('version', '1') "
+            "ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+        )
+        return int(conn.execute("SELECT value FROM stats_meta WHERE key = 'version'").fetchone()[0])
+
+    def _set_version(self, version: int):
+        with self._version_lock:
+            self._version = version
+            self._version_checked_at = time.monotonic()
+
+    @staticmethod
+    def _upsert(conn, table, key_columns, rows):
+        if not rows:
+            return
+        columns = ", ".join(key_columns)
+        placeholders = ", ".join("?" for _ in key_columns)
+        conn.executemany(
+            f"INSERT INTO {table} ({columns}, count) VALUES ({placeholders}, ?) "
+            f"ON CONFLICT ({columns}) DO UPDATE SET count = count + excluded.count",
+            rows
+        )
+        conn.execute(f"DELETE FROM {table} WHERE count <= 0")
+
+    def is_initialized(self) -> bool:
+        with closing(self._connect()) as conn:
+            return self._initialized(conn)
+
+    @staticmethod
+    def _initialized(conn) -> bool:
+        return conn.execute("SELECT 1 FROM stats_meta WHERE key = 'initialized'").fetchone() is not None
+
+    def rebuild(self, collections, page_size: int = 1000, only_if_missing: bool = False) -> bool:
+        """컬렉션 전체 메타데이터로 통계를 다시 계산하고, 다시 계산했으면 True 반환
+
+        기존 개수 삭제, 새 개수 기록, 초기화 표시, 버전 증가를 쓰기 락을 먼저 잡는 한 트랜잭션(BEGIN IMMEDIATE)에서 한다.
+        only_if_missing 이면 락을 잡은 뒤 초기화 표시를 다시 확인해, 동시에 시작한 다른 워커가
+        이미 계산했으면 아무것도 하지 않는다 (개수가 두 번 더해지지 않음).
+        """
+        metadatas = []
+        for collection in collections:
+            offset = 0
+            while True:
+                page = collection.get(limit=page_size, offset=offset, include=["metadatas"])
+                if not page["ids"]:
+                    break
+                offset += len(page["ids"])
+                metadatas.extend(page["metadatas"])
+
+        with closing(self._connect()) as conn:
+            conn.isolation_level = None  # 트랜잭션을 직접 시작
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if only_if_missing and self._initialized(conn):
+                    conn.execute("ROLLBACK")
+                    return False
+                for table in ("theme_day_counts", "day_counts", "publisher_counts"):
+                    conn.execute(f"DELETE FROM {table}")
+                self._write_counts(conn, added=metadatas)
+                conn.execute("INSERT OR REPLACE INTO stats_meta (key, value) VALUES ('initialized', '1')")
+                version = self._bump_version(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        self._set_version(version)
+        logger.info(f"[CollectionStats] 통계 재계산 완료: {len(metadatas)}개 문서")
+        return True
+
+    def ensure_initialized(self, collections):
+        """통계가 없으면 컬렉션 전체로 한 번 계산 (여러 워커가 동시에 시작해도 한 번만)"""
+        if not self.is_initialized():
+            self.rebuild(collections, only_if_missing=True)
+
+    def snapshot(self, publisher_limit: int = 20) -> dict:
+        """전체 / 테마별 / 날짜별 / 매체별(상위 publisher_limit 개) 문서 수"""
+        with closing(self._connect()) as conn:
+            by_day = dict(conn.execute("SELECT day, count FROM day_counts ORDER BY day").fetchall())
+            by_theme = dict(conn.execute(
+                "SELECT theme, SUM(count) FROM theme_day_counts GROUP BY theme ORDER BY SUM(count) DESC"
+            ).fetchall())
+            by_theme_day = {}
+            for theme, day, count in conn.execute(
+                "SELECT theme, day, count FROM theme_day_counts ORDER BY theme, day"
+            ).fetchall():
+                by_theme_day.setdefault(theme, {})[day] = count
+            by_publisher = dict(conn.execute(
+                "SELECT publisher, count FROM publisher_counts ORDER BY count DESC LIMIT ?", (publisher_limit,)
+            ).fetchall())
+
+        return {
+            "total": sum(by_day.values()),
+            "by_theme": by_theme,
+            "by_day": by_day,
+            "by_theme_day": by_theme_day,
+            "by_publisher": by_publisher
+        }
@@ -0,0 +1,80 @@
+import logging
+import os
+import re
+
+from sentence_transformers import SentenceTransformer
+
+logger = logging.getLogger(__name__)
+
+# 임베딩 모델 설정
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "BM-K/KoSimCSE-roberta")
+
+# 임베딩 백엔드 (torch: PyTorch fp32, onnx: ONNX Runtime fp32, onnx-int8: ONNX Runtime 동적 int8 양자화)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+
+# ONNX 변환 모델 저장 경로
+ONNX_EXPORT_DIR = os.getenv("EMBEDDING_ONNX_DIR", "./data/onnx")
+
+# 동적 양자화 설정 (arm64, avx2, avx512, avx512_vnni)
+ONNX_QUANTIZATION = os.getenv("EMBEDDING_ONNX_QUANTIZATION", "avx2")
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+
+def get_model_id(model_name: str = EMBEDDING_MODEL_NAME, backend: str = EMBEDDING_BACKEND) -> str:
+    """모델 + 백엔드 식별자 반환 (임베딩 캐시 키로 사용)
+
+    백엔드마다 임베딩 값이 조금씩 다르므로 캐시가 섞이지 않도록 구분한다.
+    """
+    if backend == "onnx-int8":
+        return f"{model_name}@{backend}-{ONNX_QUANTIZATION}"
+    return f"{model_name}@{backend}"
+
+
+def load_embedding_model(model_name: str = EMBEDDING_MODEL_NAME, backend: str = EMBEDDING_BACKEND) -> SentenceTransformer:
+    """설정된 백엔드로 임베딩 모델 로드
+
+    Args:
+        model_name: Hugging Face 모델 이름
+        backend: torch, onnx, onnx-int8 중 하나
+
+    Returns:
+        SentenceTransformer 모델 (encode 인터페이스는 백엔드와 무관하게 동일)
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"지원하지 않는 임베딩 백엔드: {backend} (지원: {', '.join(BACKENDS)})")
+
+    logger.info(f"임베딩 모델 로드: {model_name} (backend={backend})")
+
+    if backend == "torch":
+        return SentenceTransformer(model_name)
+
+    if backend == "onnx":
+        return SentenceTransformer(model_name, backend="onnx")
+
+    return _load_quantized_onnx_model(model_name)
+
+
+def _load_quantized_onnx_model(model_name: str) -> SentenceTransformer:
+    """동적 int8 양자화 ONNX 모델 로드 (없으면 변환 후 로컬에 저장)"""
+    export_dir = os.path.join(ONNX_EXPORT_DIR, re.sub(r"[^A-Za-z0-9._-]", "_", model_name))
+    file_name = f"onnx/model_qint8_{ONNX_QUANTIZATION}.onnx"
+
+    if not os.path.exists(os.path.join(export_dir, file_name)):
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+
+        logger.info(f"ONNX int8 모델 변환 시작: {model_name} → {export_dir}")
+
+        # 1. fp32 ONNX 로 변환 후 토크나이저/설정과 함께 저장
+        onnx_model = SentenceTransformer(model_name, backend="onnx")
+        onnx_model.save_pretrained(export_dir)
+
+        # 2. 동적 int8 양자화 모델 저장
+        export_dynamic_quantized_onnx_model(
+            onnx_model,
+            quantization_config=ONNX_QUANTIZATION,
+            model_name_or_path=export_dir
+        )
+        logger.info(f"ONNX int8 모델 변환 완료: {file_name}")
+
+    return SentenceTransformer(export_dir, backend="onnx", model_kwargs={"file_name": file_name})
@@ -0,0 +1,106 @@
+import logging
+import queue
+import threading
+import time
+
+from concurrent.futures import Future
+
+from app.common.rag.rag_metrics import Histogram, LatencyStats
+
+logger = logging.getLogger(__name__)
+
+# 배치 크기 히스토그램 구간 (요청 수 기준이 아닌 텍스트 수 기준)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+# 쿼리 임베딩 마이크로 배치 처리기
+class EmbeddingBatcher:
+    """동시에 들어온 임베딩 요청을 모아 한 번의 배치 forward 로 처리
+
+    요청마다 짧은 쿼리 하나를 따로 encode 하면 호출당 고정 비용을 매번 치르므로,
+    전용 워커 쓰레드가 첫 요청 이후 최대 max_wait_ms 동안 또는 max_batch_size 개가 모일 때까지
+    요청을 모아 한 번에 encode 하고 각 요청의 Future 에 결과를 나눠 준다.
+    대기 중인 다른 요청이 없으면 단건 요청의 추가 지연은 최대 max_wait_ms 이다.
+    """
+
+    def __init__(self, model, max_batch_size: int = 64, max_wait_ms: float = 2.0):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+        self.batch_size = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait = LatencyStats()
+        self.errors = 0
+
+    def submit(self, texts) -> Future:
+        """텍스트 목록 임베딩 요청 - 결과는 Future 로 반환"""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((list(texts), future, time.perf_counter()))
+        return future
+
+    def encode(self, texts):
+        """텍스트 목록 임베딩 (배치 처리가 끝날 때까지 대기)"""
+        return self.submit(texts).result()
+
+    def stats(self) -> dict:
+        """배치 크기 / 대기 시간 지표 반환"""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "pending": self._queue.qsize(),
+            "errors": self.errors,
+            "batch_size": self.batch_size.snapshot(),
+            "queue_wait": self.queue_wait.snapshot()
+        }
+
+    def _ensure_started(self):
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._worker.start()
+
+    def _collect(self):
+        """첫 요청 이후 대기 시간 / 배치 크기 제한까지 요청 수집"""
+        requests = [self._queue.get()]
+        size = len(requests[0][0])
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            requests.append(request)
+            size += len(request[0])
+        return requests
+
+    def _run(self):
+        while True:
+            requests = self._collect()
+            started_at = time.perf_counter()
+            texts = [text for request_texts, _, _ in requests for text in request_texts]
+            for _, _, submitted_at in requests:
+                self.queue_wait.record(started_at - submitted_at)
+            self.batch_size.record(len(texts))
+
+            try:
+                embeddings = self.model.encode(texts)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"배치 임베딩 실패 ({len(texts)}건): {str(e)}")
+                for _, future, _ in requests:
+                    future.set_exception(e)
+                continue
+
+            # 요청 순서대로 결과 분배
+            offset = 0
+            for request_texts, future, _ in requests:
+                future.set_result(list(embeddings[offset:offset + len(request_texts)]))
+                offset += len(request_texts)
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 워커 프로세스의 임베딩 모델 (프로세스마다 하나씩 로드)
+_worker_model = None
+
+
+def _init_worker(model_name: str, backend: str, num_threads: int):
+    """워커 프로세스 초기화 - 연산 쓰레드 수를 고정한 뒤 모델 로드
+
+    워커마다 코어 수만큼 쓰레드를 쓰면 서로 코어를 빼앗으므로 워커당 num_threads 개로 제한한다.
+    환경 변수는 torch / 토크나이저를 import 하기 전에 설정해야 적용된다.
+    """
+    for name in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[name] = str(num_threads)
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+
+    try:
+        import torch
+        torch.set_num_threads(num_threads)
+    except ImportError:
+        pass
+
+    from app.common.rag.embedding_backend import load_embedding_model
+
+    global _worker_model
+    _worker_model = load_embedding_model(model_name, backend)
+
+
+def _encode_chunk(texts, batch_size: int):
+    """워커 프로세스에서 텍스트 묶음 임베딩"""
+    return np.asarray(_worker_model.encode(texts, batch_size=batch_size), dtype=np.float32)
+
+
+# 대량 임베딩용 멀티 프로세스 풀
+class EmbeddingProcessPool:
+    """텍스트를 chunk_size 개씩 나눠 여러 워커 프로세스에서 동시에 임베딩
+
+    서비스 executor 는 모델 하나를 여러 쓰레드가 공유하므로 GIL 과 연산 쓰레드 경합으로 처리량이 제한된다.
+    초기 수집 / 모델 변경 후 재임베딩처럼 한 번에 많은 기사를 임베딩할 때는
+    워커 프로세스마다 모델을 따로 로드하고 워커당 연산 쓰레드 수를 고정해 코어 수에 비례해 처리한다.
+    워커는 첫 요청 때 시작되고(spawn), 모델 로드 시간만큼 첫 결과가 늦다.
+    워커 수만큼 모델이 메모리에 올라가므로 대량 작업 동안만 만들고 close 한다.
+    """
+
+    def __init__(self, num_workers: int = None, threads_per_worker: int = None, chunk_size: int = 64,
+                 batch_size: int = 32, model_name: str = None, backend: str = None):
+        """
+        Args:
+            num_workers: 워커 프로세스 수 (기본: CPU 코어 수)
+            threads_per_worker: 워커당 연산 쓰레드 수 (기본: 코어 수 / 워커 수)
+            chunk_size: 워커 하나에 한 번에 넘기는 텍스트 수
+            batch_size: 워커 안에서 encode 배치 크기
+            model_name, backend: 임베딩 모델 (기본: 서비스 설정과 동일)
+        """
+        from app.common.rag.embedding_backend import EMBEDDING_BACKEND, EMBEDDING_MODEL_NAME
+
+        cpu_count = os.cpu_count() or 1
+        self.num_workers = num_workers or cpu_count
+        self.threads_per_worker = threads_per_worker or max(1, cpu_count // self.num_workers)
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            # fork 는 부모의 torch / ChromaDB 쓰레드 상태를 복사하므로 사용하지 않음
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_name or EMBEDDING_MODEL_NAME, backend or EMBEDDING_BACKEND, self.threads_per_worker)
+        )
+        self._texts = 0
+        self._chunks = 0
+        self._started_at = None
+        self._busy_seconds = 0.0
+        logger.info(f"임베딩 프로세스 풀 생성: 워커 {self.num_workers}개 x 쓰레드 {self.threads_per_worker}개, "
+                    f"chunk_size={chunk_size}")
+
+    def _submit(self, texts):
+        if self._started_at is None:
+            self._started_at = time.perf_counter()
+        return self._executor.submit(_encode_chunk, list(texts), self.batch_size)
+
+    def _record(self, count: int):
+        self._texts += count
+        self._chunks += 1
+        self._busy_seconds = time.perf_counter() - self._started_at
+
+    def stream(self, items, max_in_flight: int = None):
+        """(키, 텍스트 목록) 을 임베딩해 끝난 순서대로 (키, 임베딩 행렬) 반환
+
+        items 는 필요할 때만 읽으므로(제너레이터 가능) 진행 중인 묶음은 max_in_flight 개로 제한되고,
+        부모는 결과를 받는 대로 저장할 수 있다.
+        """
+        max_in_flight = max_in_flight or self.num_workers * 2
+        items = iter(items)
+        pending = {}
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_in_flight:
+                try:
+                    key, texts = next(items)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[self._submit(texts)] = (key, len(texts))
+
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                key, count = pending.pop(future)
+                embeddings = future.result()
+                self._record(count)
+                yield key, embeddings
+
+    def encode(self, texts) -> np.ndarray:
+        """텍스트 목록 임베딩 (입력 순서 유지)"""
+        texts = list(texts)
+        chunks = [(start, texts[start:start + self.chunk_size]) for start in range(0, len(texts), self.chunk_size)]
+        results = dict(self.stream(chunks))
+        if not results:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.concatenate([results[start] for start, _ in chunks])
+
+    async def encode_async(self, texts) -> list:
+        """텍스트 목록 임베딩 (이벤트 루프를 막지 않음, 입력 순서 유지)"""
+        texts = list(texts)
+        chunks = [texts[start:start + self.chunk_size] for start in range(0, len(texts), self.chunk_size)]
+        futures = deque(asyncio.wrap_future(self._submit(chunk)) for chunk in chunks)
+        embeddings = []
+        for chunk in chunks:
+            embeddings.extend(await futures.popleft())
+            self._record(len(chunk))
+        return embeddings
+
+    def stats(self) -> dict:
+        """처리한 텍스트 수 / 처리량"""
+        return {
+            "num_workers": self.num_workers,
+            "threads_per_worker": self.threads_per_worker,
+            "chunks": self._chunks,
+            "texts": self._texts,
+            "elapsed_seconds": round(self._busy_seconds, 3),
+            "texts_per_sec": round(self._texts / self._busy_seconds, 1) if self._busy_seconds else 0.0
+        }
+
+    def close(self):
+        """워커 프로세스 종료"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        logger.info(f"임베딩 프로세스 풀 종료: {self.stats()}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,11 @@
+"""기존 벡터 DB 문서에 published_ts 메타데이터를 추가하는 1회성 마이그레이션
+
+실행 : python -m app.common.rag.migrate_published_ts
+"""
+import logging
+
+from app.common.rag.rag_service import RagService
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    RagService().backfill_published_ts()
@@ -0,0 +1,48 @@
+import numpy as np
+
+
+def mmr_select(candidate_embeddings, relevance_scores, k: int, lambda_mult: float = 0.7):
+    """Maximal Marginal Relevance 로 관련성이 높으면서 서로 다른 후보 선택
+
+    후보 간 유사도는 정규화된 임베딩 행렬의 곱 한 번으로 계산하고,
+    선택 단계에서는 "이미 선택된 문서와의 최대 유사도" 벡터만 갱신한다.
+
+    Args:
+        candidate_embeddings: (N, D) 후보 임베딩
+        relevance_scores: (N,) 후보의 관련성 점수 (클수록 관련성 높음)
+        k: 선택할 후보 수
+        lambda_mult: 관련성 가중치 (1.0 이면 관련성 순, 0.0 이면 다양성만 고려)
+
+    Returns:
+        선택된 후보 인덱스 목록 (선택 순서)
+    """
+    embeddings = np.asarray(candidate_embeddings, dtype=np.float32)
+    relevance = np.asarray(relevance_scores, dtype=np.float32)
+    n_candidates = len(relevance)
+    k = min(k, n_candidates)
+    if k <= 0:
+        return []
+
+    # 코사인 유사도 행렬 (N x N)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    normalized = embeddings / np.where(norms == 0, 1, norms)
+    similarity = normalized @ normalized.T
+
+    # 관련성 점수를 0~1 로 맞춰 유사도와 같은 척도로 비교
+    spread = relevance.max() - relevance.min()
+    relevance = (relevance - relevance.min()) / spread if spread > 0 else np.ones_like(relevance)
+
+    selected = [int(np.argmax(relevance))]
+    max_similarity = similarity[selected[0]].copy()
+    available = np.ones(n_candidates, dtype=bool)
+    available[selected[0]] = False
+
+    while len(selected) < k:
+        scores = lambda_mult * relevance - (1 - lambda_mult) * max_similarity
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_similarity, similarity[best], out=max_similarity)
+
+    return selected
@@ -0,0 +1,188 @@
+import logging
+import os
+import re
+import sqlite3
+import threading
+import zlib
+
+from contextlib import closing, nullcontext
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# MinHash 해시 함수 파라미터 (고정 시드 - 저장된 시그니처와 계속 비교할 수 있어야 함)
+_PRIME = 4294967311  # 2^32 보다 큰 소수
+_SEED = 20250501
+_SPACE_PATTERN = re.compile(r"\s+")
+
+# 밴드 버킷은 (범위, 밴드, 버킷, 문서 ID) 한 행씩 저장 - 버킷이 커져도 등록/삭제 비용은 밴드 수만큼
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    doc_id TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    PRIMARY KEY (doc_id, scope)
+);
+CREATE TABLE IF NOT EXISTS bands (
+    scope TEXT NOT NULL,
+    band INTEGER NOT NULL,
+    bucket BLOB NOT NULL,
+    doc_id TEXT NOT NULL,
+    PRIMARY KEY (scope, band, bucket, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS bands_doc_id ON bands (doc_id);
+"""
+
+
+def shingles(text: str, size: int = 5):
+    """공백을 제거한 글자 단위 n-gram 집합 (한국어는 띄어쓰기가 매체마다 달라 글자 단위로 비교)"""
+    normalized = _SPACE_PATTERN.sub("", (text or "").lower())
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+# 유사 중복 기사 색인
+class NearDuplicateIndex:
+    """MinHash 시그니처 + LSH 밴드 기반 유사 중복 기사 색인 (디스크 저장)
+
+    같은 통신사 기사를 여러 매체가 전재하면 ID 는 다르지만 본문이 거의 같으므로,
+    정제된 본문의 MinHash 시그니처를 bands 개 밴드로 나눠 버킷에 넣고 같은 버킷에 들어간 후보만
+    시그니처 일치율(추정 자카드 유사도)로 비교한다.
+    색인은 directory 안의 SQLite 파일에 저장되어 재시작 후에도 유지되고, 여러 프로세스가 함께 사용할 수 있다.
+    scope 별로 따로 색인한다 (테마별 컬렉션 분할 시 테마 단위).
+
+    저장 전인 기사는 reserve 로 이 프로세스 메모리에만 등록해 두고 (처리 중인 다른 전재 기사도 찾을 수 있게),
+    벡터 DB 에 저장된 뒤 commit 으로 디스크 색인에 등록한다. 저장되지 않은 기사는 release 로 지운다.
+    """
+
+    def __init__(self, directory: str, num_perm: int = 128, bands: int = 16, threshold: float = 0.8,
+                 shingle_size: int = 5):
+        if num_perm % bands:
+            raise ValueError(f"num_perm({num_perm}) 은 bands({bands}) 의 배수여야 합니다.")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+
+        rng = np.random.RandomState(_SEED)
+        self._a = rng.randint(1, 2 ** 31, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, 2 ** 31, size=num_perm).astype(np.uint64)
+
+        self._pending_lock = threading.Lock()
+        self._pending = {}          # 문서 ID -> (scope, 시그니처) - 저장 전인 문서
+        self._pending_buckets = {}  # (scope, 밴드, 버킷) -> {문서 ID}
+
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "index.sqlite3")
+        with closing(self.connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def connect(self):
+        """SQLite 연결 - 배치 동안 find 에 함께 넘겨 재사용할 수 있음 (with closing(index.connect()) as conn)"""
+        return sqlite3.connect(self.path, timeout=30)
+
+    def signature(self, text: str):
+        """본문의 MinHash 시그니처 (num_perm,) uint32 - 본문이 비어 있으면 None"""
+        items = shingles(text, self.shingle_size)
+        if not items:
+            return None
+        hashes = np.fromiter((zlib.crc32(item.encode("utf-8")) for item in items), dtype=np.uint64, count=len(items))
+        return ((np.outer(self._a, hashes) + self._b[:, None]) % _PRIME).min(axis=1).astype(np.uint32)
+
+    def find(self, scope: str, signature, conn=None):
+        """시그니처와 유사도가 threshold 이상인 문서 중 가장 비슷한 문서 ID 반환 (없으면 None)
+
+        conn: connect() 로 연 연결 - 기사마다 새 연결을 열지 않도록 배치 동안 재사용 (없으면 새로 열고 닫음)
+        """
+        if signature is None:
+            return None
+        bands = self._bands(signature)
+        with closing(self.connect()) if conn is None else nullcontext(conn) as conn:
+            candidates = conn.execute(
+                "SELECT s.doc_id, s.signature FROM signatures s WHERE s.scope = ? AND s.doc_id IN ("
+                "SELECT b.doc_id FROM bands b WHERE b.scope = ? AND (b.band, b.bucket) IN "
+                f"(VALUES {', '.join(['(?, ?)'] * len(bands))}))",
+                (scope, scope, *(value for band in bands for value in band))
+            ).fetchall()
+        with self._pending_lock:
+            pending_ids = set().union(*(self._pending_buckets.get((scope, *band), ()) for band in bands))
+            candidates.extend((doc_id, self._pending[doc_id][1].tobytes()) for doc_id in pending_ids)
+
+        if not candidates:
+            return None
+        stored = np.frombuffer(b"".join(row[1] for row in candidates), dtype=np.uint32).reshape(len(candidates), -1)
+        similarities = (stored == signature).mean(axis=1)
+        best = int(np.argmax(similarities))
+        return candidates[best][0] if similarities[best] >= self.threshold else None
+
+    def add(self, scope: str, doc_id: str, signature):
+        """문서 시그니처 등록 (이미 등록된 문서면 무시)"""
+        self.add_many([(scope, doc_id, signature)])
+
+    def add_many(self, entries):
+        """(scope, 문서 ID, 시그니처) 목록을 한 트랜잭션으로 등록 (이미 등록된 문서는 무시)"""
+        with closing(self.connect()) as conn, conn:
+            for scope, doc_id, signature in entries:
+                if signature is None:
+                    continue
+                signature = np.asarray(signature, dtype=np.uint32)
+                inserted = conn.execute(
+                    "INSERT OR IGNORE INTO signatures (doc_id, scope, signature) VALUES (?, ?, ?)",
+                    (doc_id, scope, signature.tobytes())
+                ).rowcount
+                if inserted:
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO bands (scope, band, bucket, doc_id) VALUES (?, ?, ?, ?)",
+                        [(scope, band, bucket, doc_id) for band, bucket in self._bands(signature)]
+                    )
+
+    def reserve(self, scope: str, doc_id: str, signature):
+        """저장 전인 문서 시그니처를 이 프로세스 메모리에 등록 (find 대상, 디스크에는 commit 시 등록)"""
+        if signature is None:
+            return
+        signature = np.asarray(signature, dtype=np.uint32)
+        with self._pending_lock:
+            if doc_id in self._pending:
+                return
+            self._pending[doc_id] = (scope, signature)
+            for band in self._bands(signature):
+                self._pending_buckets.setdefault((scope, *band), set()).add(doc_id)
+
+    def commit(self, ids):
+        """저장된 문서의 예약된 시그니처를 디스크 색인에 등록"""
+        self.add_many(self._pop_pending(ids))
+
+    def release(self, ids):
+        """저장되지 않은 문서의 예약된 시그니처 삭제"""
+        self._pop_pending(ids)
+
+    def _pop_pending(self, ids):
+        entries = []
+        with self._pending_lock:
+            for doc_id in ids:
+                pending = self._pending.pop(doc_id, None)
+                if pending is None:
+                    continue
+                scope, signature = pending
+                for band in self._bands(signature):
+                    key = (scope, *band)
+                    self._pending_buckets[key].discard(doc_id)
+                    if not self._pending_buckets[key]:
+                        del self._pending_buckets[key]
+                entries.append((scope, doc_id, signature))
+        return entries
+
+    def remove(self, ids):
+        """문서 시그니처 삭제 (보관 기간 정리 시)"""
+        ids = [(doc_id,) for doc_id in ids]
+        with closing(self.connect()) as conn, conn:
+            conn.executemany("DELETE FROM bands WHERE doc_id = ?", ids)
+            conn.executemany("DELETE FROM signatures WHERE doc_id = ?", ids)
+
+    def _bands(self, signature):
+        """[(밴드 번호, 버킷 바이트)]"""
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
@@ -0,0 +1,190 @@
+import hashlib
+import threading
+import time
+
+from collections import OrderedDict
+
+import numpy as np
+from diskcache import Cache
+
+
+# 쿼리 임베딩 캐시
+class QueryEmbeddingCache:
+    """(모델 ID, 쿼리 텍스트) 를 키로 하는 LRU 쿼리 임베딩 캐시
+
+    테마 수가 적어 추천 요청의 쿼리가 대부분 반복되므로,
+    한 번 계산한 쿼리 임베딩을 재사용해 모델 추론을 생략한다.
+    여러 쓰레드에서 동시에 사용할 수 있다.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model_id: str, query: str):
+        """캐시된 임베딩 반환 (없으면 None)"""
+        key = (model_id, query)
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def put(self, model_id: str, query: str, embedding):
+        """임베딩 저장 (최대 크기 초과 시 가장 오래 사용되지 않은 항목 제거)"""
+        if self._max_size <= 0:
+            return
+        key = (model_id, query)
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """캐시 비우기"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """캐시 적중 통계 반환"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self._max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0
+            }
+
+
+# 검색 결과 캐시
+class RetrievalResultCache:
+    """컬렉션 버전에 묶인 검색 결과 캐시
+
+    version_source 가 있으면 (여러 워커가 공유하는 컬렉션 버전) sync_version 으로 버전을 맞추고,
+    없으면 컬렉션에 쓰기(저장/삭제)가 일어날 때마다 bump_version 으로 버전을 올린다.
+    버전이 바뀌면 이전 버전에서 만든 결과는 더 이상 반환되지 않는다.
+    검색 도중 버전이 바뀐 경우에도 오래된 결과가 저장되지 않도록,
+    검색 시작 시점의 버전을 받아 현재 버전과 같을 때만 저장한다.
+    날짜 기준 필터(days_ago)가 시간에 따라 달라지므로 TTL 도 함께 적용한다.
+    """
+
+    def __init__(self, max_size: int = 512, ttl_seconds: float = 300, version_source=None):
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.version_source = version_source
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def bump_version(self):
+        """컬렉션 변경 시 호출 - 기존 결과 무효화"""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def sync_version(self) -> int:
+        """공유 컬렉션 버전이 바뀌었으면 기존 결과를 무효화하고 현재 버전 반환 (검색 시작 시 호출)"""
+        if self.version_source is None:
+            return self.version
+        version = self.version_source()
+        with self._lock:
+            if version != self.version:
+                self.version = version
+                self._entries.clear()
+            return self.version
+
+    def get(self, key):
+        """캐시된 결과의 복사본 반환 (없거나 만료되면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self._ttl_seconds:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return [dict(item) for item in entry[1]]
+
+    def put(self, key, results, version: int):
+        """검색 시작 시점의 버전이 현재 버전과 같을 때만 결과 저장"""
+        if self._max_size <= 0:
+            return
+        with self._lock:
+            if version != self.version:
+                return
+            self._entries[key] = (time.monotonic(), [dict(item) for item in results])
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """캐시 적중 통계 반환"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "version": self.version,
+                "size": len(self._entries),
+                "max_size": self._max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0
+            }
+
+
+# 기사 본문 임베딩 캐시
+class ContentEmbeddingCache:
+    """(모델 ID, 정제된 본문) 해시를 키로 하는 디스크 임베딩 캐시
+
+    서버 시작 시마다 같은 한 달치 기사를 다시 수집하고, 같은 기사가 다른 ID 나 다른 테마로 들어오기도 하므로
+    한 번 임베딩한 본문은 디스크에 저장해 두고 다시 모델에 넣지 않는다.
+    재시작 후에도 유지되며, 여러 프로세스가 같은 경로를 공유할 수 있다.
+    """
+
+    def __init__(self, directory: str, size_limit: int = 2 ** 30):
+        self._cache = Cache(directory, size_limit=size_limit)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(model_id: str, text: str) -> str:
+        return hashlib.sha256(f"{model_id}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, model_id: str, texts):
+        """본문 목록의 캐시된 임베딩 반환 (없는 항목은 None)"""
+        embeddings = []
+        for text in texts:
+            value = self._cache.get(self._key(model_id, text))
+            embeddings.append(None if value is None else np.frombuffer(value, dtype=np.float32))
+        found = sum(embedding is not None for embedding in embeddings)
+        self.hits += found
+        self.misses += len(texts) - found
+        return embeddings
+
+    def put_many(self, model_id: str, texts, embeddings):
+        """본문 목록의 임베딩 저장 (한 트랜잭션)"""
+        with self._cache.transact():
+            for text, embedding in zip(texts, embeddings):
+                self._cache.set(self._key(model_id, text), np.asarray(embedding, dtype=np.float32).tobytes())
+
+    def stats(self) -> dict:
+        """캐시 적중 통계 반환"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._cache),
+            "volume_bytes": self._cache.volume(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
@@ -0,0 +1,124 @@
+import bisect
+import itertools
+import threading
+
+from collections import deque
+
+
+# 지연 시간 통계
+class LatencyStats:
+    """최근 N개 측정값 기반 지연 시간 통계 (초 단위 기록, ms 단위 보고)
+
+    여러 쓰레드에서 동시에 기록할 수 있다.
+    """
+
+    def __init__(self, window: int = 1000):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        """측정값 기록"""
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+
+    def snapshot(self) -> dict:
+        """통계 요약 반환"""
+        with self._lock:
+            samples = sorted(self._samples)
+            count, total, max_value = self.count, self.total, self.max
+
+        def percentile(p):
+            if not samples:
+                return 0.0
+            return samples[min(len(samples) - 1, int(p * len(samples)))] * 1000
+
+        return {
+            "count": count,
+            "avg_ms": total / count * 1000 if count else 0.0,
+            "p50_ms": percentile(0.50),
+            "p99_ms": percentile(0.99),
+            "max_ms": max_value * 1000
+        }
+
+
+# 비동기 검색 지표
+class RetrievalMetrics:
+    """비동기 검색 요청의 대기 시간(queue time)과 실행 시간 지표
+
+    queue time 은 요청 시점부터 검색 쓰레드에서 실행이 시작될 때까지의 시간으로,
+    동시성 제한 대기와 executor 대기를 모두 포함한다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.waiting = 0
+        self.errors = 0
+        self.queue_time = LatencyStats()
+        self.run_time = LatencyStats()
+
+    def add_waiting(self, delta: int):
+        with self._lock:
+            self.waiting += delta
+
+    def add_in_flight(self, delta: int):
+        with self._lock:
+            self.in_flight += delta
+
+    def add_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def snapshot(self) -> dict:
+        """지표 요약 반환"""
+        with self._lock:
+            in_flight, waiting, errors = self.in_flight, self.waiting, self.errors
+        return {
+            "in_flight": in_flight,
+            "waiting": waiting,
+            "errors": errors,
+            "queue_time": self.queue_time.snapshot(),
+            "run_time": self.run_time.snapshot()
+        }
+
+
+# 값 분포 히스토그램
+class Histogram:
+    """고정 구간(bucket) 누적 히스토그램 (Prometheus 와 같은 le 형식)
+
+    여러 쓰레드에서 동시에 기록할 수 있다.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, value: float):
+        """측정값 기록"""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total += value
+
+    def snapshot(self) -> dict:
+        """구간별 누적 개수와 평균 반환"""
+        with self._lock:
+            counts, count, total = list(self._counts), self.count, self.total
+        cumulative = list(itertools.accumulate(counts))
+        buckets = {f"le_{bound:g}": cumulative[i] for i, bound in enumerate(self.buckets)}
+        buckets["le_inf"] = cumulative[-1]
+        return {
+            "count": count,
+            "avg": total / count if count else 0.0,
+            "buckets": buckets
+        }
@@ -1,15 +1,34 @@
+import hashlib
+import math
+import os
 import re
+import unicodedata
 
-from datetime import datetime, timedelta
+from contextlib import closing, nullcontext
+from datetime import datetime, timedelta, timezone
+from functools import partial
 
-from sentence_transformers import SentenceTransformer
 from concurrent.futures import ThreadPoolExecutor
 import asyncio
 import logging
+import time
 
-from app.common.db.vector.vector_util import VectorUtil
+import numpy as np
 
-embedding_model = SentenceTransformer("BM-K/KoSimCSE-roberta")
+from app.common.db.vector.vector_util import VectorUtil, match_where
+from app.common.rag.bm25_index import BM25Index
+from app.common.rag.collection_stats import CollectionStats
+from app.common.rag.embedding_batcher import EmbeddingBatcher
+from app.common.rag.embedding_pool import EmbeddingProcessPool
+from app.common.rag.embedding_backend import load_embedding_model, get_model_id
+from app.common.rag.mmr import mmr_select
+from app.common.rag.near_duplicate import NearDuplicateIndex
+from app.common.rag.rag_cache import QueryEmbeddingCache, RetrievalResultCache, ContentEmbeddingCache
+from app.common.rag.rag_metrics import RetrievalMetrics
+
+# 임베딩 모델 (EMBEDDING_BACKEND 환경 변수로 torch/onnx/onnx-int8 선택)
+embedding_model = load_embedding_model()
+EMBEDDING_MODEL_ID = get_model_id()
 vector_util = VectorUtil()
 collection = vector_util.get_collection()
 
@@ -21,6 +40,151 @@ logger = logging.getLogger(__name__)
 # 쓰레드 풀
 executor = ThreadPoolExecutor(max_workers=4)
 
+# 검색 전용 쓰레드 풀 - 임베딩 저장 작업과 분리하여 검색 지연을 막음
+RETRIEVAL_MAX_WORKERS = int(os.getenv("RETRIEVAL_MAX_WORKERS", "4"))
+retrieval_executor = ThreadPoolExecutor(max_workers=RETRIEVAL_MAX_WORKERS, thread_name_prefix="rag-retrieval")
+
+# 동시에 실행/대기할 수 있는 비동기 검색 요청 수 제한
+RETRIEVAL_MAX_CONCURRENCY = int(os.getenv("RETRIEVAL_MAX_CONCURRENCY", str(RETRIEVAL_MAX_WORKERS * 2)))
+retrieval_semaphore = asyncio.Semaphore(RETRIEVAL_MAX_CONCURRENCY)
+retrieval_metrics = RetrievalMetrics()
+
+# 검색 후보 배수 (결과 수 대비) - where 조건을 사용하면 조건에 맞는 문서만 후보가 되므로 더 적게 가져옴
+CANDIDATE_MULTIPLIER = float(os.getenv("CANDIDATE_MULTIPLIER", "2"))
+PREFILTER_CANDIDATE_MULTIPLIER = float(os.getenv("PREFILTER_CANDIDATE_MULTIPLIER", "1.2"))
+
+# 검색 방식 (vector: 벡터 검색, bm25: 키워드 검색, hybrid: RRF 결합)
+RETRIEVAL_MODES = ("vector", "bm25", "hybrid")
+
+# hybrid 검색 시 벡터 후보 배수 - 키워드 검색이 보완하므로 적게 가져옴
+HYBRID_CANDIDATE_MULTIPLIER = float(os.getenv("HYBRID_CANDIDATE_MULTIPLIER", "1"))
+
+# Reciprocal Rank Fusion 상수
+RRF_K = 60
+
+# MMR 다양성 재정렬 설정
+MMR_LAMBDA = float(os.getenv("MMR_LAMBDA", "0.7"))
+MMR_CANDIDATE_MULTIPLIER = float(os.getenv("MMR_CANDIDATE_MULTIPLIER", "4"))
+
+# BM25 키워드 색인 (최초 키워드 검색 시 생성, 이후 저장/삭제 시 증분 갱신)
+bm25_index = BM25Index()
+
+# 보관 기간 정리 시 한 번에 삭제할 문서 수
+RETENTION_CHUNK_SIZE = int(os.getenv("RETENTION_CHUNK_SIZE", "500"))
+
+# 저장 시 임베딩 배치 크기
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+
+# 쿼리 임베딩 캐시 (추천 요청의 쿼리는 대부분 반복됨)
+query_embedding_cache = QueryEmbeddingCache(max_size=int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "256")))
+
+# 쿼리 임베딩 마이크로 배치 (동시 검색 요청의 쿼리를 모아 한 번에 임베딩, EMBEDDING_BATCHING=false 면 요청별 임베딩)
+embedding_batcher = EmbeddingBatcher(
+    embedding_model,
+    max_batch_size=int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "64")),
+    max_wait_ms=float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", "2"))
+) if os.getenv("EMBEDDING_BATCHING", "true").lower() == "true" else None
+
+# 기사 본문 임베딩 디스크 캐시 (EMBEDDING_CACHE_PATH 를 빈 값으로 두면 사용하지 않음)
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "./data/embedding_cache")
+content_embedding_cache = ContentEmbeddingCache(
+    EMBEDDING_CACHE_PATH,
+    size_limit=int(os.getenv("EMBEDDING_CACHE_SIZE_LIMIT", str(2 ** 30)))
+) if EMBEDDING_CACHE_PATH else None
+
+# 유사 중복(전재) 기사 색인 (NEAR_DUPLICATE_INDEX_PATH 를 빈 값으로 두면 사용하지 않음)
+NEAR_DUPLICATE_INDEX_PATH = os.getenv("NEAR_DUPLICATE_INDEX_PATH", "./data/near_duplicate_index")
+near_duplicate_index = NearDuplicateIndex(
+    NEAR_DUPLICATE_INDEX_PATH,
+    threshold=float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))
+) if NEAR_DUPLICATE_INDEX_PATH else None
+
+# 대량 임베딩(초기 수집 / 재임베딩) 프로세스 풀 설정 (BACKFILL_EMBEDDING_WORKERS=0 이면 초기 수집은 executor 사용)
+BACKFILL_EMBEDDING_WORKERS = int(os.getenv("BACKFILL_EMBEDDING_WORKERS", "0"))
+BACKFILL_EMBEDDING_THREADS = int(os.getenv("BACKFILL_EMBEDDING_THREADS", "0"))
+BACKFILL_EMBEDDING_CHUNK_SIZE = int(os.getenv("BACKFILL_EMBEDDING_CHUNK_SIZE", "64"))
+
+
+def create_embedding_pool(num_workers: int = BACKFILL_EMBEDDING_WORKERS):
+    """대량 임베딩용 프로세스 풀 생성 (워커 수가 0 이하면 None)"""
+    if num_workers <= 0:
+        return None
+    return EmbeddingProcessPool(
+        num_workers=num_workers,
+        threads_per_worker=BACKFILL_EMBEDDING_THREADS or None,
+        chunk_size=BACKFILL_EMBEDDING_CHUNK_SIZE,
+        batch_size=EMBEDDING_BATCH_SIZE
+    )
+
+# 검색 결과 캐시 (야간 수집 사이에는 컬렉션이 사실상 읽기 전용, 버전은 아래 collection_stats 의 공유 버전)
+retrieval_result_cache = RetrievalResultCache(
+    max_size=int(os.getenv("RETRIEVAL_CACHE_SIZE", "512")),
+    ttl_seconds=float(os.getenv("RETRIEVAL_CACHE_TTL_SECONDS", "300"))
+)
+
+def to_published_ts(published_at: str):
+    """published_at 문자열(ISO 8601)을 epoch 초로 변환 (시간대 정보가 없으면 UTC 로 간주)"""
+    if not published_at:
+        return None
+    try:
+        parsed = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+# 다중 테마 메타데이터 - 테마별 불리언 키 ("theme:반도체": True) 로 where 조건 검색
+THEME_FLAG_PREFIX = "theme:"
+
+def theme_fields(themes) -> dict:
+    """테마 목록을 메타데이터 필드로 변환 (theme: 대표 테마, themes: 쉼표 구분 목록, theme:<테마>: True)"""
+    themes = [theme for theme in dict.fromkeys(themes) if theme]
+    fields = {"theme": themes[0] if themes else "", "themes": comma.join(themes)}
+    fields.update({f"{THEME_FLAG_PREFIX}{theme}": True for theme in themes})
+    return fields
+
+def metadata_themes(metadata) -> list:
+    """메타데이터의 테마 목록 (themes 필드가 없는 기존 문서는 theme 필드 사용)"""
+    themes = (metadata or {}).get("themes") or (metadata or {}).get("theme") or ""
+    return [theme for theme in themes.split(comma) if theme]
+
+def merge_themes(metadata: dict, themes) -> bool:
+    """메타데이터에 테마를 추가 (대표 테마는 유지) - 바뀌었으면 True"""
+    current = metadata_themes(metadata)
+    added = [theme for theme in themes if theme and theme not in current]
+    if not added and "themes" in metadata:
+        return False
+    metadata.update(theme_fields(current + added))
+    return True
+
+# 제목 정규화 시 제거할 말머리 ([속보], (종합) 등) 와 기호
+TITLE_TAG_PATTERN = re.compile(r"\[[^\]]*\]|\([^)]*\)|【[^】]*】")
+TITLE_SYMBOL_PATTERN = re.compile(r"[^0-9a-z가-힣]+")
+
+def title_key(title: str) -> str:
+    """같은 기사를 찾기 위한 정규화된 제목 해시 (제목이 비어 있으면 빈 문자열)"""
+    normalized = unicodedata.normalize("NFKC", title or "").lower()
+    normalized = TITLE_SYMBOL_PATTERN.sub("", TITLE_TAG_PATTERN.sub("", normalized))
+    if not normalized:
+        return ""
+    return hashlib.md5(normalized.encode("utf-8")).hexdigest()
+
+# 테마별 / 날짜별 / 매체별 문서 수 통계 (저장/삭제 시 증분 갱신)
+# 통계와 함께 갱신되는 컬렉션 버전을 워커 사이 변경 표시로 사용 (SHARED_VERSION_CHECK_SECONDS 마다 확인)
+collection_stats = CollectionStats(
+    os.getenv("COLLECTION_STATS_PATH", "./data/collection_stats.sqlite3"),
+    themes_of=metadata_themes,
+    version_check_seconds=float(os.getenv("SHARED_VERSION_CHECK_SECONDS", "1"))
+)
+
+# 다른 워커가 저장/삭제하면 메모리 전수 검색 인덱스를 다시 적재하고 검색 결과 캐시를 비움
+vector_util.version_source = collection_stats.version
+retrieval_result_cache.version_source = collection_stats.version
+
+# 통계 파일이 처음 생성된 경우 저장된 문서로 한 번 계산 (요청마다 생성되는 RagService 가 아닌 모듈 로드 시 1회)
+collection_stats.ensure_initialized(vector_util.get_all_collections())
+
 def clean_text(text: str) -> str:
     """GPT 프롬프트용 텍스트 정제"""
     text = re.sub(r"<[^>]+>", "", text)  # HTML 태그 제거
@@ -36,6 +200,9 @@ class RagService:
         global collection
         self.collection = collection
 
+        # 설정되어 있으면 기사 임베딩을 executor 대신 프로세스 풀에서 생성 (초기 수집 동안만)
+        self.embedding_pool = None
+
     # # 뉴스 데이터를 반환
     # def get_news_data(self, categories, n_results=5, min_relevance_score=0.3):
     #     """관련성 점수 기반으로 뉴스 필터링"""
@@ -103,7 +270,8 @@ class RagService:
     #     return sampled
 
     def get_news_data(self, categories, n_results=5, min_relevance_score=0.3,
-                      add_diversity=False, days_ago=None, filter_by_theme=False):
+                      add_diversity=False, days_ago=None, filter_by_theme=False, prefilter=False,
+                      retrieval_mode="vector", use_mmr=False, mmr_lambda=None):
         """관련성 점수 기반으로 뉴스 필터링
 
         Args:
@@ -113,35 +281,32 @@ class RagService:
             add_diversity: 다양한 쿼리 사용 여부 (기본값: False - 기존 동작 유지)
             days_ago: 최신 기사 필터링 일수 (None이면 필터링 없음)
             filter_by_theme: 테마 기반 추가 필터링 (기본값: False - 기존 동작 유지)
+            prefilter: days_ago/filter_by_theme 조건을 벡터 검색의 where 조건으로 적용
+                (기본값: False - 검색 후 점수 감점 방식 유지). 켜면 조건에 맞지 않는 기사는 제외되며,
+                테마는 저장 시 태그된 테마와 정확히 일치해야 한다.
+            retrieval_mode: 검색 방식 (기본값: vector - 기존 동작 유지)
+                vector: 벡터 검색, bm25: 키워드 검색, hybrid: 두 순위를 RRF 로 결합.
+                bm25/hybrid 에서는 relevance_score 가 RRF 결합 점수(0~1)이며,
+                최소 유사도 기준은 벡터 검색 결과에만 적용된다.
+            use_mmr: 상위 결과를 MMR 로 재정렬하여 비슷한 기사 중복 방지 (기본값: False - 기존 동작 유지)
+            mmr_lambda: MMR 관련성 가중치 (None이면 MMR_LAMBDA 사용, 1.0 이면 관련성 순)
         """
+        if retrieval_mode not in RETRIEVAL_MODES:
+            raise ValueError(f"지원하지 않는 검색 방식: {retrieval_mode} (지원: {', '.join(RETRIEVAL_MODES)})")
 
-        # 결과 저장용
-        all_results = []
-        seen_ids = set()  # 중복 방지
-
-        # 쿼리 목록 초기화
-        query_variations = []
-
-        # 1. 기존 도메인 강화 쿼리 생성 (기존 로직 유지)
-        enriched_queries = []
-        for category in categories:
-            if "반도체" in category:
-                enriched_queries.append(f"반도체 산업 관점에서 {category}")
-            elif "기술" in category or "AI" in category:
-                enriched_queries.append(f"기술 산업 관점에서 {category}")
-            else:
-                enriched_queries.append(category)
-
-        # 기본 쿼리 (기존 방식)
-        base_query = f"{', '.join(enriched_queries)} 관련 산업 동향 및 뉴스 기사"
-        query_variations.append(base_query)
+        # 검색 결과 캐시 확인 (컬렉션 변경 시 버전이 올라가 자동 무효화)
+        mmr_lambda = MMR_LAMBDA if mmr_lambda is None else mmr_lambda
+        cache_key = (tuple(categories), n_results, min_relevance_score, add_diversity, days_ago, filter_by_theme,
+                     prefilter, retrieval_mode, use_mmr, mmr_lambda)
+        cache_version = retrieval_result_cache.sync_version()
+        cached = retrieval_result_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"[RAG] 검색 결과 캐시 사용: '{categories}' ({len(cached)}건)")
+            return cached
 
-        # 다양성 추가 옵션이 켜져 있으면 추가 쿼리 생성
-        if add_diversity:
-            simple_query = f"{' '.join(categories)} 최신 동향"
-            query_variations.append(simple_query)
+        # 쿼리 목록 생성 (기본 쿼리 + 다양성 쿼리)
+        query_variations = self._build_queries(categories, add_diversity)
 
-        # 각 쿼리에 대해 검색 수행
         for i, query in enumerate(query_variations):
             # 로깅 (첫 번째는 기존 로그 메시지 유지)
             if i == 0:
@@ -149,21 +314,83 @@ class RagService:
             else:
                 logger.info(f"[RAG] 추가 쿼리 #{i}: '{query}'")
 
-            # 쿼리 임베딩
-            query_embedding = embedding_model.encode(query)
+        # 날짜 기준은 한 번만 계산
+        cutoff_date = (datetime.now() - timedelta(days=days_ago)).strftime('%Y-%m-%d') if days_ago else None
+
+        # 조건을 벡터 검색에 포함하면 조건에 맞는 문서만 순위를 매기므로 후보 수를 줄일 수 있음
+        where = self._build_where(categories, cutoff_date, filter_by_theme) if prefilter else None
 
-            # 검색 실행
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=n_results * 2,  # 더 많은 후보 검색
-                include=["documents", "metadatas", "distances"]
+        # 1. 벡터 검색 후보 (키워드 검색과 결합할 때는 후보 수를 줄임)
+        vector_candidates = []
+        if retrieval_mode != "bm25":
+            if retrieval_mode == "hybrid":
+                multiplier = HYBRID_CANDIDATE_MULTIPLIER
+            else:
+                multiplier = PREFILTER_CANDIDATE_MULTIPLIER if where else CANDIDATE_MULTIPLIER
+            if use_mmr:
+                # 다양성 재정렬에는 더 넓은 후보군이 필요
+                multiplier = max(multiplier, MMR_CANDIDATE_MULTIPLIER)
+            vector_candidates = self._vector_candidates(
+                categories, query_variations, math.ceil(n_results * multiplier), min_relevance_score,
+                where, cutoff_date, filter_by_theme, prefilter, include_embeddings=use_mmr
             )
 
-            # 결과 처리
-            for doc, meta, distance in zip(
-                    results["documents"][0],
-                    results["metadatas"][0],
-                    results["distances"][0]):
+        # 2. 최종 결과 정렬 및 필터링
+        if retrieval_mode == "vector":
+            ranked = vector_candidates
+        else:
+            # 키워드 검색 후보와 순위 결합
+            lexical_multiplier = max(CANDIDATE_MULTIPLIER, MMR_CANDIDATE_MULTIPLIER) if use_mmr else CANDIDATE_MULTIPLIER
+            lexical_candidates = self._bm25_candidates(categories, math.ceil(n_results * lexical_multiplier), where)
+            rankings = [vector_candidates, lexical_candidates] if retrieval_mode == "hybrid" else [lexical_candidates]
+            ranked = self._fuse_rankings(rankings)
+
+        # 3. 선택적 다양성 재정렬
+        if use_mmr:
+            ranked = self._mmr_rerank(ranked, n_results, mmr_lambda)
+
+        news_articles = [item for _, item, _ in ranked[:n_results]]
+
+        # 로깅 (기존 방식 유지)
+        if not news_articles:
+            logger.warning(f"[RAG] '{categories}' 관련 뉴스가 유사도 기준({min_relevance_score}) 미달로 제외되었습니다.")
+        else:
+            for i, news in enumerate(news_articles):
+                logger.info(f"[RAG] 선택된 뉴스 {i + 1}: 유사도={news['relevance_score']:.3f} | 제목={news['title'][:40]}")
+
+        retrieval_result_cache.put(cache_key, news_articles, cache_version)
+        return news_articles
+
+    def _vector_candidates(self, categories, query_variations, n_candidates, min_relevance_score,
+                           where, cutoff_date, filter_by_theme, prefilter, include_embeddings=False):
+        """벡터 검색 후보 목록 [(doc_id, 결과, 임베딩)] 를 관련성 점수 내림차순으로 반환
+
+        include_embeddings 가 False 이면 임베딩은 None 이다.
+        """
+        all_results = []
+        seen_ids = set()  # 중복 방지
+
+        # 모든 쿼리를 한 번에 임베딩 (캐시 우선)
+        query_embeddings = self._encode_queries(query_variations)
+
+        # 모든 쿼리를 한 번의 검색으로 실행 (테마 분할 시 요청 테마의 컬렉션만 검색)
+        results = vector_util.query_collections(
+            vector_util.get_search_collections(categories),
+            query_embeddings,
+            n_candidates,  # 더 많은 후보 검색
+            where,
+            ["documents", "metadatas", "distances"] + (["embeddings"] if include_embeddings else [])
+        )
+
+        # 쿼리별 결과 병합 (앞선 쿼리의 결과가 우선)
+        for i in range(len(query_variations)):
+            embeddings = results["embeddings"][i] if include_embeddings else [None] * len(results["ids"][i])
+            for doc_id, doc, meta, distance, embedding in zip(
+                    results["ids"][i],
+                    results["documents"][i],
+                    results["metadatas"][i],
+                    results["distances"][i],
+                    embeddings):
 
                 # 기본 유사도 점수 계산 (기존 방식)
                 similarity_score = 1 - min(distance, 1.0)
@@ -172,28 +399,27 @@ class RagService:
                 if similarity_score < min_relevance_score:
                     continue
 
-                # 고유 ID 생성 (문서 중복 방지용)
-                doc_id = meta.get("id", "") or hash(doc + meta.get("title", ""))
+                # 문서 중복 방지
                 if doc_id in seen_ids:
                     continue
                 seen_ids.add(doc_id)
 
-                # 선택적 테마 필터링
-                if filter_by_theme and meta.get("theme"):
+                # 선택적 테마 필터링 (where 조건으로 이미 적용된 경우 생략, 여러 테마에 속한 기사는 모든 테마 확인)
+                doc_themes = metadata_themes(meta)
+                if filter_by_theme and not prefilter and doc_themes:
                     theme_match = False
                     for category in categories:
-                        if category.lower() in meta.get("theme", "").lower():
+                        if any(category.lower() in theme.lower() for theme in doc_themes):
                             theme_match = True
                             break
                     if not theme_match and i == 0:  # 첫번째(기본) 쿼리에서는 테마 확인
                         # 테마 매치 없으면 스코어 약간 감소
                         similarity_score *= 0.95
 
-                # 선택적 날짜 필터링
-                if days_ago and meta.get("published_at"):
+                # 선택적 날짜 필터링 (where 조건으로 이미 적용된 경우 생략)
+                if cutoff_date and not prefilter and meta.get("published_at"):
                     try:
                         pub_date = meta.get("published_at", "").split("T")[0]
-                        cutoff_date = (datetime.now() - timedelta(days=days_ago)).strftime('%Y-%m-%d')
                         # 오래된 기사는 스코어 약간 감소
                         if pub_date < cutoff_date:
                             similarity_score *= 0.95
@@ -201,151 +427,693 @@ class RagService:
                         pass  # 날짜 파싱 오류 무시
 
                 # 결과 추가
-                all_results.append({
-                    "title": meta.get("title", ""),
-                    "source": meta.get("publisher", ""),
-                    "published_date": meta.get("published_at", ""),
-                    "summary": doc,
-                    "relevance_score": similarity_score
-                })
-
-        # 기존 방식과 동일하게 결과 반환
-        if not all_results and not query_variations:
-            # 기존 코드의 기본 검색 (호환성 유지)
-            return self._original_search_method(categories, n_results, min_relevance_score)
-
-        # 최종 결과 정렬 및 필터링
-        news_articles = sorted(all_results, key=lambda x: x["relevance_score"], reverse=True)[:n_results]
+                all_results.append((doc_id, self._to_news_item(doc, meta, similarity_score), embedding))
 
-        # 로깅 (기존 방식 유지)
-        if not news_articles:
-            logger.warning(f"[RAG] '{categories}' 관련 뉴스가 유사도 기준({min_relevance_score}) 미달로 제외되었습니다.")
-        else:
-            for i, news in enumerate(news_articles):
-                logger.info(f"[RAG] 선택된 뉴스 {i + 1}: 유사도={news['relevance_score']:.3f} | 제목={news['title'][:40]}")
+        return sorted(all_results, key=lambda x: x[1]["relevance_score"], reverse=True)
 
-        return news_articles
+    def _bm25_candidates(self, categories, n_candidates, where=None):
+        """BM25 키워드 검색 후보 목록 [(doc_id, 결과, None)] 를 점수 내림차순으로 반환
+
+        짧은 테마명("5G", "AI")은 임베딩 품질이 낮으므로 도메인 강화 문장 대신 테마명 자체로 검색한다.
+        """
+        bm25_index.ensure_loaded(vector_util.get_all_collections(), version=collection_stats.version())
+
+        doc_filter = partial(match_where, where=where) if where else None
+        hits = bm25_index.search(" ".join(categories), n_candidates, doc_filter=doc_filter)
+
+        return [(doc_id, self._to_news_item(doc, meta or {}, score), None) for doc_id, score, doc, meta in hits]
+
+    @staticmethod
+    def _fuse_rankings(rankings):
+        """Reciprocal Rank Fusion 으로 여러 순위 목록 결합
+
+        relevance_score 는 모든 목록에서 1위인 문서가 1.0 이 되도록 정규화한 RRF 점수이다.
+        """
+        fused_scores = {}
+        entries = {}
+        for ranking in rankings:
+            for rank, (doc_id, item, embedding) in enumerate(ranking):
+                fused_scores[doc_id] = fused_scores.get(doc_id, 0.0) + 1 / (RRF_K + rank + 1)
+                if doc_id not in entries or entries[doc_id][1] is None:
+                    entries[doc_id] = (item, embedding)
+
+        max_score = len(rankings) / (RRF_K + 1)
+        fused = []
+        for doc_id in sorted(fused_scores, key=fused_scores.get, reverse=True):
+            item, embedding = entries[doc_id]
+            fused.append((doc_id, {**item, "relevance_score": fused_scores[doc_id] / max_score}, embedding))
+        return fused
+
+    def _mmr_rerank(self, ranked, n_results, mmr_lambda):
+        """MMR 로 후보를 재정렬하여 상위 n_results 개 반환
+
+        벡터 검색에서 받은 임베딩을 사용하고, 키워드 검색 후보처럼 임베딩이 없는 경우에만 벡터 DB 에서 조회한다.
+        """
+        if len(ranked) <= 1:
+            return ranked
+
+        missing_ids = [doc_id for doc_id, _, embedding in ranked if embedding is None]
+        fetched = {}
+        for collection in vector_util.get_all_collections() if missing_ids else []:
+            results = collection.get(ids=[doc_id for doc_id in missing_ids if doc_id not in fetched],
+                                     include=["embeddings"])
+            fetched.update(zip(results["ids"], results["embeddings"]))
+            if len(fetched) == len(missing_ids):
+                break
+
+        candidates = [(doc_id, item, embedding if embedding is not None else fetched.get(doc_id))
+                      for doc_id, item, embedding in ranked]
+        candidates = [candidate for candidate in candidates if candidate[2] is not None]
+        if not candidates:
+            return ranked
+
+        selected = mmr_select(
+            np.stack([np.asarray(embedding, dtype=np.float32) for _, _, embedding in candidates]),
+            np.array([item["relevance_score"] for _, item, _ in candidates], dtype=np.float32),
+            n_results,
+            mmr_lambda
+        )
+        return [candidates[i] for i in selected]
+
+    @staticmethod
+    def _to_news_item(doc, meta, relevance_score):
+        """검색 결과를 GPT 프롬프트용 기사 형식으로 변환"""
+        return {
+            "title": meta.get("title", ""),
+            "source": meta.get("publisher", ""),
+            "published_date": meta.get("published_at", ""),
+            "summary": doc,
+            "relevance_score": relevance_score
+        }
+
+    def get_all_collections(self):
+        """모든 저장 컬렉션 반환 (테마 분할 시 테마 컬렉션 포함)"""
+        return vector_util.get_all_collections()
+
+    async def get_news_data_async(self, categories, **kwargs):
+        """get_news_data 의 비동기 버전
+
+        임베딩과 벡터 검색을 검색 전용 쓰레드 풀에서 실행하여 이벤트 루프를 막지 않는다.
+        동시 요청 수는 RETRIEVAL_MAX_CONCURRENCY 로 제한되며, 대기 시간은 retrieval_metrics 에 기록된다.
+
+        Args:
+            categories: 검색할 카테고리 목록
+            **kwargs: get_news_data 와 동일한 검색 옵션
+        """
+        loop = asyncio.get_event_loop()
+        requested_at = time.perf_counter()
+
+        def run():
+            started_at = time.perf_counter()
+            retrieval_metrics.queue_time.record(started_at - requested_at)
+            retrieval_metrics.add_in_flight(1)
+            try:
+                return self.get_news_data(categories, **kwargs)
+            except Exception:
+                retrieval_metrics.add_error()
+                raise
+            finally:
+                retrieval_metrics.add_in_flight(-1)
+                retrieval_metrics.run_time.record(time.perf_counter() - started_at)
+
+        retrieval_metrics.add_waiting(1)
+        try:
+            await retrieval_semaphore.acquire()
+        finally:
+            retrieval_metrics.add_waiting(-1)
+
+        try:
+            return await loop.run_in_executor(retrieval_executor, run)
+        finally:
+            retrieval_semaphore.release()
+
+    @staticmethod
+    def _build_queries(categories, add_diversity=False):
+        """카테고리로부터 검색 쿼리 목록 생성 (첫 번째가 기본 쿼리)"""
+        # 1. 기존 도메인 강화 쿼리 생성 (기존 로직 유지)
+        enriched_queries = []
+        for category in categories:
+            if "반도체" in category:
+                enriched_queries.append(f"반도체 산업 관점에서 {category}")
+            elif "기술" in category or "AI" in category:
+                enriched_queries.append(f"기술 산업 관점에서 {category}")
+            else:
+                enriched_queries.append(category)
+
+        # 기본 쿼리 (기존 방식)
+        query_variations = [f"{', '.join(enriched_queries)} 관련 산업 동향 및 뉴스 기사"]
+
+        # 다양성 추가 옵션이 켜져 있으면 추가 쿼리 생성
+        if add_diversity:
+            query_variations.append(f"{' '.join(categories)} 최신 동향")
+
+        return query_variations
+
+    @staticmethod
+    def _build_where(categories, cutoff_date=None, filter_by_theme=False):
+        """날짜/테마 조건을 벡터 DB 메타데이터 where 조건으로 변환 (조건이 없으면 None)"""
+        conditions = []
+        if cutoff_date:
+            conditions.append({"published_ts": {"$gte": to_published_ts(cutoff_date)}})
+        if filter_by_theme and categories:
+            # 다중 테마 키가 없는 기존 문서는 대표 테마로 비교
+            conditions.append({"$or": [{"theme": {"$in": list(categories)}}]
+                                      + [{f"{THEME_FLAG_PREFIX}{category}": True} for category in categories]})
+
+        if not conditions:
+            return None
+        if len(conditions) == 1:
+            return conditions[0]
+        return {"$and": conditions}
+
+    def _encode_queries(self, queries):
+        """쿼리 임베딩 목록 생성 - 캐시에 없는 쿼리만 한 번에 배치 임베딩
+
+        embedding_batcher 를 사용하면 다른 검색 요청의 쿼리와 함께 한 번의 forward 로 임베딩된다.
+        """
+        query_embeddings = [query_embedding_cache.get(EMBEDDING_MODEL_ID, query) for query in queries]
+
+        missing = [i for i, embedding in enumerate(query_embeddings) if embedding is None]
+        if missing:
+            missing_queries = [queries[i] for i in missing]
+            if embedding_batcher is not None:
+                encoded = embedding_batcher.encode(missing_queries)
+            else:
+                encoded = embedding_model.encode(missing_queries)
+            for i, query_embedding in zip(missing, encoded):
+                query_embedding.setflags(write=False)  # 캐시 공유 객체 보호
+                query_embedding_cache.put(EMBEDDING_MODEL_ID, queries[i], query_embedding)
+                query_embeddings[i] = query_embedding
+
+        return query_embeddings
 
     # 뉴스 데이터를 저장
-    async def save_news_data(self, news_articles):
-        """뉴스 데이터를 벡터 DB에 저장"""
+    async def save_news_data(self, news_articles, batch_size: int = None):
+        """뉴스 데이터를 벡터 DB에 배치 단위로 저장
+
+        배치 전체 ID에 대해 한 번의 중복 조회, 남은 텍스트에 대해 한 번의 배치 임베딩,
+        한 번의 collection.add 로 저장한다. 실패한 기사는 기사 단위로 사유를 기록한다.
+
+        Args:
+            news_articles: 저장할 뉴스 기사 목록
+            batch_size: 임베딩 배치 크기 (None이면 EMBEDDING_BATCH_SIZE 사용)
+
+        Returns:
+            저장에 성공한 기사 수
+        """
         if not news_articles:
             logger.warning("저장할 뉴스 기사가 없습니다.")
             return
 
+        batch_size = batch_size or EMBEDDING_BATCH_SIZE
+        errors = []  # (기사 ID, 실패 사유)
         loop = asyncio.get_event_loop()
+
+        # 1. 텍스트/메타데이터 구성 및 유효성 검사 (본문 정제 / MinHash 는 CPU 작업이므로 executor 에서)
+        ids, texts, metadatas = await loop.run_in_executor(executor, self.prepare_articles, news_articles, errors)
+
+        # 2. 배치 전체 ID에 대해 한 번만 중복 조회
+        ids, texts, metadatas = await loop.run_in_executor(
+            executor, self.filter_existing, ids, texts, metadatas, errors
+        )
+
         success_count = 0
-        error_count = 0
+        if ids:
+            # 3. 남은 텍스트를 한 번에 임베딩
+            embeddings = await self.embed_texts(ids, texts, batch_size, errors)
+
+            # 4. 저장 대상 컬렉션별로 한 번에 저장
+            stored_ids = await loop.run_in_executor(
+                executor, self.store_embedded, ids, texts, metadatas, embeddings, errors
+            )
+            success_count = len(stored_ids)
+
+        for article_id, reason in errors:
+            logger.error(f"기사 {article_id} 저장 실패: {reason}")
 
-        for article in news_articles:
+        logger.info(f"뉴스 데이터 저장 완료: 성공 {success_count}건, 실패 {len(errors)}건")
+        return success_count
+
+    # 단계별 저장 API - save_news_data 와 수집 파이프라인(IngestionPipeline)이 함께 사용
+    # (prepare → filter_existing → embed_texts → store_embedded, 동기 단계는 이벤트 루프 밖에서 호출)
+    def prepare_articles(self, news_articles, errors):
+        """기사 목록을 (ID, 정제된 텍스트, 메타데이터) 목록으로 변환
+
+        같은 ID 또는 같은 정규화 제목의 기사는 하나로 합치고 테마를 다중 테마 필드에 모은다.
+        (테마별 컬렉션 분할 시에는 같은 테마 안에서만 합친다)
+        본문이 거의 같은 전재 기사는 유사 중복 색인에서 찾은 대표 기사의 ID 로 바꿔,
+        이후 단계에서 대표 기사와 같은 기사로 처리되게 한다.
+        """
+        ids, texts, metadatas = [], [], []
+        seen = {}  # (분할 범위, ID 또는 제목 키) -> 행 번호
+
+        # 유사 중복 색인 조회는 배치 동안 한 연결을 재사용
+        with closing(near_duplicate_index.connect()) if near_duplicate_index is not None else nullcontext() \
+                as near_duplicate_conn:
+            for article in news_articles:
+                try:
+                    # 필수 필드 확인
+                    article_id = str(article.get("id", "") or "")
+                    if not article_id:
+                        errors.append(("unknown", "기사 ID 없음"))
+                        continue
+
+                    # 텍스트 필드 안전하게 가져오기
+                    summary_ko = article.get("summary_ko", "") or ""
+                    summary = article.get("summary", "") or ""
+                    reason = article.get("reason", "") or ""
+
+                    summary_text = summary_ko if summary_ko else summary
+                    full_text = f"{summary_text}\n{reason}".strip()
+                    full_text = clean_text(full_text)  # ✅ 정제 함수 적용
+
+                    if not full_text:
+                        errors.append((article_id, "텍스트가 비어 있음"))
+                        continue
+
+                    # 메타데이터 구성 (None 값 처리)
+                    metadata = {
+                        "title": article.get("title_ko", "") or article.get("title", "") or "",
+                        "published_at": article.get("published_at", ""),
+                        "importance": article.get("importance", "medium"),
+                        "publisher": article.get("publisher", ""),
+                    }
+
+                    # 메타데이터의 None 값 처리
+                    for key, value in metadata.items():
+                        if value is None:
+                            metadata[key] = ""
+
+                    # 다중 테마 및 중복 판별용 제목 키
+                    metadata.update(theme_fields(article.get("themes") or [article.get("theme") or ""]))
+                    metadata["title_key"] = title_key(metadata["title"])
+
+                    # 벡터 DB 에서 날짜 조건 검색이 가능하도록 숫자 타임스탬프 저장
+                    published_ts = to_published_ts(metadata["published_at"])
+                    if published_ts is not None:
+                        metadata["published_ts"] = published_ts
+
+                    # 유사 중복 기사는 대표 기사 ID 로 변경
+                    # (처음 보는 기사는 대표 기사로 예약하고, 저장된 뒤 _on_documents_added 에서 색인에 등록)
+                    if near_duplicate_index is not None:
+                        scope = self._dedup_scope(metadata)
+                        signature = near_duplicate_index.signature(full_text)
+                        representative_id = near_duplicate_index.find(scope, signature, near_duplicate_conn)
+                        if representative_id is not None and representative_id != article_id:
+                            logger.info(f"유사 중복 기사 : ID = {article_id} → {representative_id}")
+                            article_id = representative_id
+                        else:
+                            near_duplicate_index.reserve(scope, article_id, signature)
+
+                    # 같은 배치 안의 중복 기사는 테마만 합침
+                    keys = self.dedup_keys(article_id, metadata)
+                    duplicate = next((seen[key] for key in keys if key in seen), None)
+                    if duplicate is not None:
+                        logger.info(f"중복 기사 생략 : ID = {article_id}")
+                        merge_themes(metadatas[duplicate], metadata_themes(metadata))
+                        continue
+
+                    seen.update((key, len(ids)) for key in keys)
+                    ids.append(article_id)
+                    texts.append(full_text)
+                    metadatas.append(metadata)
+
+                except Exception as e:
+                    errors.append((article.get("id", "unknown"), f"데이터 처리 중 오류: {str(e)}"))
+
+        return ids, texts, metadatas
+
+    @staticmethod
+    def _dedup_scope(metadata):
+        """중복 판별 범위 - 테마별 컬렉션 분할 시에는 같은 테마 안에서만 중복으로 봄"""
+        return metadata.get("theme", "") if vector_util.partition_by_theme else ""
+
+    @classmethod
+    def dedup_keys(cls, article_id, metadata):
+        """중복 판별 키 목록 (ID, 정규화 제목)"""
+        scope = cls._dedup_scope(metadata)
+        keys = [(scope, "id", article_id)]
+        if metadata.get("title_key"):
+            keys.append((scope, "title", metadata["title_key"]))
+        return keys
+
+    def filter_existing(self, ids, texts, metadatas, errors):
+        """이미 저장된 기사를 저장 대상 컬렉션별 한 번의 ID 조회와 한 번의 제목 조회로 걸러냄
+
+        이미 저장된 기사에 새 테마가 붙으면 저장된 문서의 테마 메타데이터만 갱신한다.
+        """
+        if not ids:
+            return ids, texts, metadatas
+
+        skipped_ids = set()
+        for collection, indices in self._group_by_partition(metadatas):
+            group_ids = [ids[i] for i in indices]
+            title_keys = list({metadatas[i]["title_key"] for i in indices if metadatas[i].get("title_key")})
             try:
-                # 필수 필드 확인
-                article_id = str(article.get("id", ""))
-                if not article_id:
-                    logger.warning("기사 ID가 없어 건너뜀")
-                    error_count += 1
-                    continue
+                existing = collection.get(ids=group_ids, include=["metadatas"])
+                stored = dict(zip(existing["ids"], existing["metadatas"]))
+                by_title = {}
+                if title_keys:
+                    same_title = collection.get(where={"title_key": {"$in": title_keys}}, include=["metadatas"])
+                    stored.update(zip(same_title["ids"], same_title["metadatas"]))
+                    by_title = {meta["title_key"]: doc_id for doc_id, meta in zip(same_title["ids"], same_title["metadatas"])}
 
-                # 중복 기사 제거 로직 추가
-                existing_ids = self.collection.get(ids=[article_id])["ids"]
+                # 저장된 기사와 같은 기사는 생략하고 테마만 합침
+                updated = {}
+                for i in indices:
+                    target_id = ids[i] if ids[i] in stored else by_title.get(metadatas[i].get("title_key"))
+                    if target_id is None:
+                        continue
+                    skipped_ids.add(ids[i])
+                    target = updated.get(target_id) or dict(stored[target_id] or {})
+                    if merge_themes(target, metadata_themes(metadatas[i])):
+                        updated[target_id] = target
 
-                if existing_ids:
-                    logger.info(f"중복 기사 생략 : ID = {article_id}")
-                    continue
+                if updated:
+                    collection.update(ids=list(updated), metadatas=list(updated.values()))
+                    self._on_documents_updated(collection, list(updated), list(updated.values()),
+                                               [stored[doc_id] for doc_id in updated])
+                    logger.info(f"저장된 기사 {len(updated)}건에 테마 추가")
+            except Exception as e:
+                # 조회 실패 시 해당 컬렉션의 기사를 실패로 기록
+                errors.extend((article_id, f"중복 조회 실패: {str(e)}") for article_id in group_ids)
+                skipped_ids.update(group_ids)
 
-                # 텍스트 필드 안전하게 가져오기
-                summary_ko = article.get("summary_ko", "") or ""
-                summary = article.get("summary", "") or ""
-                reason = article.get("reason", "") or ""
+        # 저장하지 않는 기사는 유사 중복 대표 기사 예약 해제
+        if near_duplicate_index is not None:
+            near_duplicate_index.release(skipped_ids)
 
-                summary_text = summary_ko if summary_ko else summary
-                full_text = f"{summary_text}\n{reason}".strip()
-                full_text = clean_text(full_text)  # ✅ 정제 함수 적용
+        existing_count = len(skipped_ids) - len({article_id for article_id, _ in errors} & skipped_ids)
+        if existing_count:
+            logger.info(f"중복 기사 {existing_count}건 생략")
 
-                if not full_text:
-                    logger.warning(f"기사 {article_id}의 텍스트가 비어 있어 건너뜀")
-                    error_count += 1
-                    continue
+        rows = [(i, t, m) for i, t, m in zip(ids, texts, metadatas) if i not in skipped_ids]
+        if not rows:
+            return [], [], []
+        return tuple(map(list, zip(*rows)))
 
-                # 임베딩 생성
-                embedding = await loop.run_in_executor(executor, embedding_model.encode, full_text)
+    async def embed_texts(self, ids, texts, batch_size, errors):
+        """텍스트 목록의 임베딩 생성
 
-                # 메타데이터 구성 (None 값 처리)
-                metadata = {
-                    "title": article.get("title_ko", "") or article.get("title", "") or "",
-                    "published_at": article.get("published_at", ""),
-                    "importance": article.get("importance", "medium"),
-                    "publisher": article.get("publisher", ""),
-                    "theme": article.get("theme", "")
-                }
+        본문 임베딩 캐시에 있는 텍스트는 재사용하고, 나머지만 executor 에서 한 번에 임베딩한다.
+        실패한 기사의 임베딩은 None 으로 반환된다.
+        """
+        loop = asyncio.get_event_loop()
+
+        embeddings = [None] * len(texts)
+        if content_embedding_cache is not None:
+            embeddings = await loop.run_in_executor(
+                executor, content_embedding_cache.get_many, EMBEDDING_MODEL_ID, texts
+            )
+
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            # 같은 텍스트는 한 번만 임베딩
+            unique = {}
+            for i in missing:
+                unique.setdefault(texts[i], i)
+            logger.info(f"임베딩 생성: {len(unique)}건 (캐시 사용 {len(texts) - len(missing)}건)")
+            encoded = dict(zip(unique, await self._encode_texts(
+                [ids[i] for i in unique.values()], list(unique), batch_size, errors
+            )))
+            for i in missing:
+                embeddings[i] = encoded[texts[i]]
+
+            # 새로 만든 임베딩을 캐시에 저장
+            if content_embedding_cache is not None:
+                new_rows = [(text, embedding) for text, embedding in encoded.items() if embedding is not None]
+                if new_rows:
+                    await loop.run_in_executor(
+                        executor, content_embedding_cache.put_many, EMBEDDING_MODEL_ID,
+                        [row[0] for row in new_rows], [row[1] for row in new_rows]
+                    )
+
+        return embeddings
+
+    async def _encode_texts(self, ids, texts, batch_size, errors):
+        """텍스트 목록을 executor (또는 임베딩 프로세스 풀) 에서 한 번에 임베딩
+
+        배치 임베딩이 실패하면 문제 기사를 찾기 위해 기사 단위로 다시 시도한다.
+        실패한 기사의 임베딩은 None 으로 반환된다.
+        """
+        loop = asyncio.get_event_loop()
+        try:
+            if self.embedding_pool is not None:
+                return await self.embedding_pool.encode_async(texts)
+            embeddings = await loop.run_in_executor(
+                executor, partial(embedding_model.encode, texts, batch_size=batch_size)
+            )
+            return list(embeddings)
+        except Exception as e:
+            logger.warning(f"배치 임베딩 실패, 기사 단위로 재시도: {str(e)}")
+
+        embeddings = []
+        for article_id, text in zip(ids, texts):
+            try:
+                embeddings.append(await loop.run_in_executor(executor, embedding_model.encode, text))
+            except Exception as e:
+                errors.append((article_id, f"임베딩 생성 실패: {str(e)}"))
+                embeddings.append(None)
+        return embeddings
+
+    def store_embedded(self, ids, texts, metadatas, embeddings, errors):
+        """임베딩된 기사를 저장 대상 컬렉션별 한 번의 collection.add 로 저장하고 저장된 ID 목록 반환
+
+        임베딩이 None 인 (임베딩 실패) 기사는 제외한다.
+        """
+        rows = [(i, t, m, e) for i, t, m, e in zip(ids, texts, metadatas, embeddings) if e is not None]
+
+        stored = []
+        for collection, indices in self._group_by_partition([row[2] for row in rows]):
+            group = [rows[i] for i in indices]
+            stored_ids = set(self._write_batch(collection, *map(list, zip(*group)), errors=errors))
+            stored.extend(article_id for article_id, _, _, _ in group if article_id in stored_ids)
+
+            # 저장된 문서만 색인/캐시에 반영
+            self._on_documents_added(collection, *map(list, zip(*[row for row in group if row[0] in stored_ids])))
 
-                # 메타데이터의 None 값 처리
-                for key, value in metadata.items():
-                    if value is None:
-                        metadata[key] = ""
+        # 임베딩 / 저장에 실패한 기사는 유사 중복 대표 기사 예약 해제
+        if near_duplicate_index is not None:
+            near_duplicate_index.release(set(ids) - set(stored))
+        return stored
 
-                # logger.info(f"🧪 기사 저장 시도: ID={article_id}, 제목={metadata['title'][:30]}, 임베딩 길이={len(embedding)}")
+    def _write_batch(self, collection, ids, texts, metadatas, embeddings, errors):
+        """배치를 한 번의 collection.add 로 저장하고 저장된 ID 목록 반환
 
-                # 벡터 DB에 저장
-                self.collection.add(
-                    documents=[full_text],
+        배치 저장이 실패하면 문제 기사를 찾기 위해 기사 단위로 다시 저장한다.
+        """
+        try:
+            collection.add(
+                documents=texts,
+                embeddings=[embedding.tolist() for embedding in embeddings],
+                ids=ids,
+                metadatas=metadatas
+            )
+            return ids
+        except Exception as e:
+            logger.warning(f"배치 저장 실패, 기사 단위로 재시도: {str(e)}")
+
+        stored_ids = []
+        for article_id, text, metadata, embedding in zip(ids, texts, metadatas, embeddings):
+            try:
+                collection.add(
+                    documents=[text],
                     embeddings=[embedding.tolist()],
                     ids=[article_id],
                     metadatas=[metadata]
                 )
+                stored_ids.append(article_id)
+            except Exception as e:
+                errors.append((article_id, f"벡터 DB 저장 실패: {str(e)}"))
+        return stored_ids
 
-                success_count += 1
+    @staticmethod
+    def _group_by_partition(metadatas):
+        """메타데이터의 테마 기준으로 저장 대상 컬렉션별 인덱스 목록 반환 [(컬렉션, [인덱스])]"""
+        groups = {}
+        for i, metadata in enumerate(metadatas):
+            collection = vector_util.get_partition(metadata.get("theme"))
+            groups.setdefault(collection.name, (collection, []))[1].append(i)
+        return list(groups.values())
 
-                # logger.info(f"✅ 저장 완료: {article_id}")
+    def _on_documents_added(self, collection, ids=(), texts=(), metadatas=(), embeddings=()):
+        """문서 저장 후 유사 중복 / 검색 색인 갱신 및 검색 결과 캐시 무효화"""
+        if not ids:
+            return
+        if near_duplicate_index is not None:
+            near_duplicate_index.commit(ids)
+        if bm25_index.loaded:
+            bm25_index.add(ids, texts, metadatas)
+        vector_util.on_documents_added(collection, ids, texts, metadatas, embeddings)
+        self._on_collection_changed(collection_stats.apply(added=metadatas))
 
-            except Exception as e:
-                logger.error(f"기사 {article.get('id', 'unknown')} 저장 중 오류: {str(e)}")
-                error_count += 1
+    def _on_documents_updated(self, collection, ids, metadatas, previous_metadatas=()):
+        """문서 메타데이터 갱신 후 검색 색인/통계 갱신 및 검색 결과 캐시 무효화"""
+        if bm25_index.loaded:
+            bm25_index.update_metadata(ids, metadatas)
+        vector_util.on_documents_updated(collection, ids, metadatas)
+        self._on_collection_changed(collection_stats.apply(added=metadatas, removed=previous_metadatas))
 
-        logger.info(f"뉴스 데이터 저장 완료: 성공 {success_count}건, 실패 {error_count}건")
-        return success_count
+    def _on_documents_deleted(self, collection, ids, metadatas=()):
+        """문서 삭제 후 검색 색인/통계 갱신 및 검색 결과 캐시 무효화"""
+        if not ids:
+            return
+        if bm25_index.loaded:
+            bm25_index.remove(ids)
+        if near_duplicate_index is not None:
+            near_duplicate_index.remove(ids)
+        vector_util.on_documents_deleted(collection, ids)
+        self._on_collection_changed(collection_stats.apply(removed=metadatas))
+
+    @staticmethod
+    def _on_collection_changed(version: int):
+        """이 프로세스의 색인은 변경을 이미 반영했으므로 새 컬렉션 버전으로 표시 (다시 적재하지 않음), 검색 결과 캐시는 비움"""
+        vector_util.advance_version(version - 1, version)
+        bm25_index.advance_version(version - 1, version)
+        retrieval_result_cache.sync_version()
 
     # 오래된 기사 데이터 삭제
     async def delete_old_documents(self, days: int = 30):
         """지정된 날짜 이전의 문서를 삭제 (기본 30일 이전)
 
-        :param days:
-        :return:
+        published_ts 메타데이터에 대한 where 조건으로 벡터 DB 에서 직접 대상을 찾고,
+        RETENTION_CHUNK_SIZE 개씩 나누어 삭제한다.
+        published_ts 가 없는 이전 문서는 backfill_published_ts 로 먼저 마이그레이션해야 한다.
+
+        :param days: 보관 일수
+        :return: 삭제된 문서 수
         """
         # 현재 날짜에서 days일 이전 계산
         cutoff_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        cutoff_ts = to_published_ts(cutoff_date)
         logger.info(f"🧹 {cutoff_date} 이전의 기사 제거 시도 중...")
 
-        try:
-            # 1. 모든 문서의 메타데이터를 가져옴
-            all_results = self.collection.get(include=["metadatas"])
+        deleted_count = 0
+        for collection in vector_util.get_all_collections():
+            try:
+                while True:
+                    # 1. 삭제 대상을 정해진 개수만큼만 조회 (통계 갱신용 메타데이터 포함)
+                    old_docs = collection.get(
+                        where={"published_ts": {"$lt": cutoff_ts}},
+                        limit=RETENTION_CHUNK_SIZE,
+                        include=["metadatas"]
+                    )
+                    old_ids = old_docs["ids"]
 
-            # 2. 파이썬에서 날짜 비교 수행
-            old_ids = []
-            for i, metadata in enumerate(all_results.get("metadatas", [])):
-                if not metadata:
-                    continue
+                    if not old_ids:
+                        break
 
-                published_at = metadata.get("published_at", "")
-                if not published_at:
-                    continue
+                    # 2. 오래된 문서 삭제
+                    collection.delete(ids=old_ids)
+                    self._on_documents_deleted(collection, old_ids, old_docs["metadatas"])
+                    deleted_count += len(old_ids)
+                    logger.info(f"🗑 {collection.name}: {len(old_ids)}개 문서 삭제 (누적 {deleted_count}개)")
 
-                # 날짜 형식 비교 (YYYY-MM-DD 형식 가정)
-                if published_at < cutoff_date:
-                    old_ids.append(all_results["ids"][i])
+            except Exception as e:
+                logger.error(f"{collection.name} 오래된 문서 삭제 중 오류: {str(e)}")
 
-            if not old_ids:
-                logger.info("🟢 삭제 대상 문서 없음")
-                return 0
+        if not deleted_count:
+            logger.info("🟢 삭제 대상 문서 없음")
+            return 0
 
-            logger.info(f"🗑 {len(old_ids)}개 문서 삭제 시작...")
+        logger.info(f"✅ {deleted_count}개 문서 삭제 완료")
+        return deleted_count
 
-            # 3. 오래된 문서 삭제
-            self.collection.delete(ids=old_ids)
+    def backfill_published_ts(self, page_size: int = RETENTION_CHUNK_SIZE):
+        """published_ts 가 없는 기존 문서에 숫자 타임스탬프 추가 (1회성 마이그레이션)
 
-            logger.info(f"✅ {len(old_ids)}개 문서 삭제 완료")
-            return len(old_ids)
+        :param page_size: 한 번에 조회/수정할 문서 수
+        :return: 수정된 문서 수
+        """
+        logger.info("🔧 published_ts 마이그레이션 시작...")
 
-        except Exception as e:
-            logger.error(f"오래된 문서 삭제 중 오류: {str(e)}")
-            return 0
\ No newline at end of file
+        updated_count = 0
+        for collection in vector_util.get_all_collections():
+            offset = 0
+            while True:
+                page = collection.get(limit=page_size, offset=offset, include=["metadatas"])
+                if not page["ids"]:
+                    break
+                offset += len(page["ids"])
+
+                ids, metadatas, previous_metadatas = [], [], []
+                for doc_id, metadata in zip(page["ids"], page["metadatas"]):
+                    if not metadata or "published_ts" in metadata:
+                        continue
+                    published_ts = to_published_ts(metadata.get("published_at", ""))
+                    if published_ts is None:
+                        continue
+                    ids.append(doc_id)
+                    metadatas.append({**metadata, "published_ts": published_ts})
+                    previous_metadatas.append(metadata)
+
+                if ids:
+                    collection.update(ids=ids, metadatas=metadatas)
+                    # 메모리 색인의 메타데이터(보관 기간 where 필터 대상)와 통계 / 검색 결과 캐시도 함께 갱신
+                    self._on_documents_updated(collection, ids, metadatas, previous_metadatas)
+                    updated_count += len(ids)
+
+        logger.info(f"✅ published_ts 마이그레이션 완료: {updated_count}개 문서 수정")
+        return updated_count
+
+    def reembed_documents(self, pool: EmbeddingProcessPool, page_size: int = RETENTION_CHUNK_SIZE):
+        """저장된 모든 문서를 현재 임베딩 모델로 다시 임베딩 (모델 변경 후 1회)
+
+        컬렉션마다 임시 컬렉션을 만들어 문서를 page_size 개씩 읽어 프로세스 풀로 보내고,
+        임베딩이 끝나는 대로 page_size 개씩 모아 임시 컬렉션에 저장한 뒤 기존 컬렉션과 교체한다.
+        임베딩 차원이 바뀌어도 되고, 중간에 실패하면 기존 컬렉션은 그대로 남는다.
+        서버를 멈춘 상태에서 실행해야 한다.
+
+        :param pool: 임베딩 프로세스 풀
+        :param page_size: 한 번에 조회/저장할 문서 수
+        :return: 다시 임베딩한 문서 수
+        """
+        global collection
+        logger.info("🔧 문서 재임베딩 시작...")
+        started = time.perf_counter()
+
+        total = 0
+        for source in vector_util.get_all_collections():
+            staging = vector_util.create_staging_collection(source)
+
+            def chunks():
+                offset = 0
+                while True:
+                    page = source.get(limit=page_size, offset=offset, include=["documents", "metadatas"])
+                    if not page["ids"]:
+                        return
+                    offset += len(page["ids"])
+                    for start in range(0, len(page["ids"]), pool.chunk_size):
+                        end = start + pool.chunk_size
+                        rows = (page["ids"][start:end], page["documents"][start:end], page["metadatas"][start:end])
+                        yield rows, rows[1]
+
+            buffer = ([], [], [], [])
+            for (ids, documents, metadatas), embeddings in pool.stream(chunks()):
+                for column, values in zip(buffer, (ids, documents, metadatas, list(embeddings))):
+                    column.extend(values)
+                if len(buffer[0]) >= page_size:
+                    self._write_reembedded(staging, *buffer)
+                    buffer = ([], [], [], [])
+            if buffer[0]:
+                self._write_reembedded(staging, *buffer)
+
+            expected, written = source.count(), staging.count()
+            if written != expected:
+                raise RuntimeError(f"{source.name} 재임베딩 문서 수 불일치 (기존 {expected}, 재임베딩 {written}) "
+                                   f"- 기존 컬렉션을 유지합니다.")
+            vector_util.replace_collection(source, staging)
+            total += written
+            logger.info(f"  - {source.name}: {written}개 문서 재임베딩 ({pool.stats()['texts_per_sec']}개/초)")
+
+        collection = self.collection = vector_util.get_collection()
+        collection_stats.bump_version()  # 실행 중인 다른 프로세스의 메모리 인덱스 / 캐시 무효화
+        logger.info(f"✅ 문서 재임베딩 완료: {total}개 문서, {time.perf_counter() - started:.1f}초")
+        return total
+
+    @staticmethod
+    def _write_reembedded(staging, ids, documents, metadatas, embeddings):
+        """재임베딩한 문서를 한 번의 collection.add 로 저장하고 본문 임베딩 캐시 갱신"""
+        staging.add(ids=ids, documents=documents, metadatas=metadatas, embeddings=embeddings)
+        if content_embedding_cache is not None:
+            content_embedding_cache.put_many(EMBEDDING_MODEL_ID, documents, embeddings)
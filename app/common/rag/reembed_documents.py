@@ -0,0 +1,17 @@
+"""저장된 모든 문서를 현재 임베딩 모델(EMBEDDING_MODEL_NAME / EMBEDDING_BACKEND)로 다시 임베딩
+
+모델을 바꾼 뒤 서버를 멈춘 상태에서 1회 실행한다.
+워커 프로세스 수는 BACKFILL_EMBEDDING_WORKERS (기본: CPU 코어 수), 워커당 쓰레드 수는 BACKFILL_EMBEDDING_THREADS.
+
+실행 : BACKFILL_EMBEDDING_WORKERS=4 python -m app.common.rag.reembed_documents
+"""
+import logging
+import os
+
+if __name__ == "__main__":
+    # 워커 프로세스(spawn)가 이 모듈을 다시 import 하므로 서비스 모듈은 여기서만 import
+    from app.common.rag.rag_service import RagService, create_embedding_pool
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    with create_embedding_pool(int(os.getenv("BACKFILL_EMBEDDING_WORKERS") or os.cpu_count() or 1)) as pool:
+        RagService().reembed_documents(pool)
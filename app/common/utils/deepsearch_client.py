@@ -1,9 +1,14 @@
 import requests
+import httpx
 import os
 import logging
+import asyncio
+
+from collections import deque
 
 from typing import List, Dict, Any
 from dotenv import load_dotenv
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential
 
 # 환경 변수 로드
 load_dotenv()
@@ -12,8 +17,12 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# 재시도 대상 상태 코드 (요청 한도 초과 / 서버 오류)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
 class DeepSearchClient:
-    BASE_URL = "https://api-v2.deepsearch.com/v1/global-articles"
+    BASE_URL = os.getenv("DEEPSEARCH_BASE_URL", "https://api-v2.deepsearch.com/v1/global-articles")
     API_KEY = os.getenv("DEEPSEARCH_API_KEY")
 
     @staticmethod
@@ -54,3 +63,150 @@ class DeepSearchClient:
             logger.error(f"❌ DeepSearch API 호출 실패: {e}")
 
         return all_articles
+
+
+def _is_retryable(error: BaseException) -> bool:
+    """429 / 5xx 응답과 연결 오류는 재시도"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, httpx.TransportError)
+
+
+class AsyncDeepSearchClient:
+    """DeepSearch API 비동기 클라이언트
+
+    하나의 httpx.AsyncClient 연결 풀을 공유하고, 세마포어로 테마 전체의 동시 요청 수를 제한한다.
+    429 / 5xx 응답은 지수 백오프로 재시도한다.
+    첫 페이지 응답에 total_pages 가 있으면 다음 페이지들을 동시에 요청하고, 없으면 순서대로 요청한다.
+    """
+
+    PAGE_SIZE = 50
+
+    def __init__(self, max_concurrency: int = None, timeout: float = 10.0, max_retries: int = None):
+        self.max_concurrency = max_concurrency or int(os.getenv("DEEPSEARCH_MAX_CONCURRENCY", "8"))
+        self.max_retries = max_retries or int(os.getenv("DEEPSEARCH_MAX_RETRIES", "4"))
+        self.timeout = timeout
+        self._client = None
+        self._semaphore = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # 이벤트 루프 안에서 처음 사용할 때 생성
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_concurrency,
+                                    max_keepalive_connections=self.max_concurrency)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def aclose(self):
+        """연결 풀 종료"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _fetch_page(self, keyword: str, date_from: str, date_to: str, page: int) -> Dict[str, Any]:
+        """한 페이지 요청 (재시도 포함)"""
+        client = self._get_client()
+        params = {
+            "date_from": date_from,
+            "date_to": date_to,
+            "keyword": keyword,
+            "page": page,
+            "page_size": self.PAGE_SIZE,
+            "api_key": DeepSearchClient.API_KEY
+        }
+
+        async for attempt in AsyncRetrying(
+            retry=retry_if_exception(_is_retryable),
+            wait=wait_exponential(multiplier=0.5, max=10),
+            stop=stop_after_attempt(self.max_retries),
+            reraise=True
+        ):
+            with attempt:
+                async with self._semaphore:
+                    logger.info(f"🔍 [DeepSearch] {keyword} | Page {page} 요청 중...")
+                    res = await client.get(DeepSearchClient.BASE_URL, params=params)
+                if res.status_code in RETRYABLE_STATUS_CODES:
+                    logger.warning(f"⚠️ [DeepSearch] {keyword} | Page {page} 재시도 - 상태코드: {res.status_code}")
+                res.raise_for_status()
+                return res.json()
+
+    async def fetch_articles(self, keyword: str, date_from: str, date_to: str, page_limit: int = 50) -> List[Dict[str, Any]]:
+        """키워드의 기사 목록 수집 (실패한 페이지 이후는 건너뜀)"""
+        all_articles = []
+        async for _, items in self.iter_pages(keyword, date_from, date_to, page_limit, prefetch=page_limit):
+            all_articles.extend(items)
+        logger.info(f"✅ [DeepSearch] {keyword}: {len(all_articles)}건 수집됨")
+        return all_articles
+
+    async def iter_pages(self, keyword: str, date_from: str, date_to: str, page_limit: int = 50,
+                         prefetch: int = 2, start_page: int = 1, raise_errors: bool = False):
+        """키워드의 기사를 (페이지 번호, 기사 목록) 단위로 순서대로 반환하는 비동기 제너레이터
+
+        첫 응답에 total_pages 가 있으면 다음 페이지를 최대 prefetch 개까지 미리 요청한다.
+        소비자가 다음 페이지를 가져가지 않으면 추가 요청도 하지 않으므로 메모리 사용량이 일정하다.
+        페이지 요청이 실패하면 로그를 남기고 종료한다 (raise_errors 면 예외 발생).
+        """
+        def failed(page, error):
+            logger.error(f"❌ DeepSearch API 호출 실패 ({keyword} | Page {page}): {error}")
+            if raise_errors:
+                raise error
+
+        if start_page > page_limit:
+            return
+        try:
+            data = await self._fetch_page(keyword, date_from, date_to, start_page)
+        except Exception as e:
+            failed(start_page, e)
+            return
+
+        items = data.get("data") or data.get("articles") or []
+        logger.info(f"✅ [DeepSearch] {keyword} | Page {start_page}: {len(items)}건 수집됨")
+        yield start_page, items
+
+        # 서버가 페이지 크기를 요청보다 작게 줄 수 있으므로, 짧은 페이지를 마지막으로 보는 것은 전체 페이지 수를 모를 때만
+        total_pages = data.get("total_pages")
+        if not total_pages and len(items) < self.PAGE_SIZE:
+            return
+        if not total_pages:
+            # 전체 페이지 수를 모르면 마지막 페이지까지 순서대로 요청
+            for page in range(start_page + 1, page_limit + 1):
+                try:
+                    data = await self._fetch_page(keyword, date_from, date_to, page)
+                except Exception as e:
+                    failed(page, e)
+                    return
+                items = data.get("data") or data.get("articles") or []
+                logger.info(f"✅ [DeepSearch] {keyword} | Page {page}: {len(items)}건 수집됨")
+                yield page, items
+                if len(items) < self.PAGE_SIZE:
+                    logger.info("⏹ 마지막 페이지 도달")
+                    return
+            return
+
+        # 전체 페이지 수를 알면 prefetch 개까지 동시에 요청
+        last_page = min(int(total_pages), page_limit)
+        pending = deque()
+        next_page = start_page + 1
+        try:
+            while next_page <= last_page or pending:
+                while next_page <= last_page and len(pending) < prefetch:
+                    pending.append((next_page, asyncio.ensure_future(
+                        self._fetch_page(keyword, date_from, date_to, next_page)
+                    )))
+                    next_page += 1
+
+                page, task = pending.popleft()
+                try:
+                    data = await task
+                except Exception as e:
+                    failed(page, e)
+                    return
+                items = data.get("data") or data.get("articles") or []
+                logger.info(f"✅ [DeepSearch] {keyword} | Page {page}: {len(items)}건 수집됨")
+                yield page, items
+        finally:
+            for _, task in pending:
+                task.cancel()
@@ -6,6 +6,7 @@ from app.api.recommendation import recommendation_route
 from app.api.stock import stock_router
 from app.api.portfolio import portfolio_route
 from app.api.member import member_route
+from app.api.system import system_route
 from app.common.crawlers.daily_news_collector import DailyNewsCollector
 
 # 전역 로깅 설정
@@ -28,6 +29,10 @@ app = FastAPI(
         {
             "name" : "recommendations",
             "description" : "GPT API 응답을 통해 포트폴리오 추천"
+        },
+        {
+            "name" : "System",
+            "description" : "검색 / 임베딩 지표 및 서버 상태"
         }
     ]
 )
@@ -38,20 +43,23 @@ async def startup_event():
     # 로거 설정
     # logger.info("🚀 애플리케이션 시작 중...")
 
-    # 뉴스 수집기 초기화
+    # 뉴스 수집기 초기화 - 일일 수집 스케줄러는 앱 이벤트 루프에서 실행, 초기 수집은 백그라운드에서 실행하고 바로 요청을 받음
+    # (진행 상황: GET /api/system/health/ready)
     collector = DailyNewsCollector.get_instance()
-    await collector.collect_initial_data()
+    collector.start_scheduler()
+    collector.start_initial_collection()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """애플리케이션 종료 시 실행될 이벤트"""
-    # 스케줄러 종료
+    # 스케줄러 및 DeepSearch 연결 풀 종료
     collector = DailyNewsCollector.get_instance()
-    collector.shutdown()
+    await collector.aclose()
 
 # 라우터 등록
 app.include_router(member_route.router, prefix="/api", tags=["Members"])
 app.include_router(stock_router.router, prefix="/stocks", tags=["Stocks"])
 app.include_router(portfolio_route.router, prefix="/portfolio", tags=["Portfolio"])
 app.include_router(recommendation_route.router, prefix="/api/recommendations", tags=["recommendations"])
+app.include_router(system_route.router, prefix="/api/system", tags=["System"])
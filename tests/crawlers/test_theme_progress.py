@@ -0,0 +1,89 @@
+# tests/crawlers/test_theme_progress.py
+# 목표 : 수집 파이프라인의 테마별 페이지 커서가 연속으로 저장 완료된 페이지까지만 이동하는지 확인
+#        (커서 뒤의 페이지는 재시작 시 다시 수집되므로, 중간 페이지가 끝나지 않았으면 커서를 넘기면 안 됨)
+# 실행 예 : python -m pytest -q tests/crawlers/test_theme_progress.py
+
+from app.common.crawlers.ingestion_state import IngestionStateStore, ThemeProgress
+
+
+def test_cursor_starts_before_start_page():
+    assert ThemeProgress(1).cursor == 0
+    assert ThemeProgress(4).cursor == 3
+
+
+def test_cursor_advances_only_over_contiguous_done_pages():
+    progress = ThemeProgress(1)
+    progress.add_page(1, 2)
+    progress.add_page(2, 1)
+    progress.add_page(3, 1)
+
+    # 3페이지가 먼저 끝나도 1, 2페이지가 남아 있으면 커서는 그대로
+    assert progress.finish_article(3)
+    assert not progress.advance()
+    assert progress.cursor == 0
+
+    assert not progress.finish_article(1)
+    assert progress.finish_article(2)
+    assert not progress.advance()
+
+    assert progress.finish_article(1)
+    assert progress.advance()
+    assert progress.cursor == 3
+    assert progress.outstanding == 0
+    assert progress.is_complete()
+
+
+def test_pages_without_new_articles_complete_immediately():
+    progress = ThemeProgress(2)
+
+    assert progress.add_page(2, 0)
+    assert not progress.add_page(3, 1)
+    assert progress.add_page(4, 0)
+    assert progress.advance()
+    assert progress.cursor == 2
+
+    progress.finish_article(3)
+    assert progress.advance()
+    assert progress.cursor == 4
+    assert progress.done == {2, 3, 4}
+
+
+def test_failed_article_blocks_cursor_and_completion():
+    progress = ThemeProgress(1)
+    progress.add_page(1, 2)
+    progress.add_page(2, 1)
+
+    progress.finish_article(1)
+    progress.fail_article()
+    progress.finish_article(2)
+
+    assert not progress.advance()
+    assert progress.cursor == 0
+    assert progress.outstanding == 0
+    assert progress.failed
+    assert not progress.is_complete()
+
+
+def test_observe_keeps_newest_published_at():
+    progress = ThemeProgress(1)
+
+    for published_at in ("2025-05-02T09:00:00", "2025-05-03T10:00:00", "", "2025-05-01T00:00:00"):
+        progress.observe(published_at)
+
+    assert progress.newest_published_at == "2025-05-03T10:00:00"
+
+
+def test_cursor_is_resumed_from_state_store(tmp_path):
+    path = str(tmp_path / "state" / "ingestion_state.json")
+    progress = ThemeProgress(1)
+    progress.add_page(1, 1)
+    progress.add_page(2, 1)
+    progress.finish_article(1)
+    progress.advance()
+    IngestionStateStore(path).update_cursor("반도체", "2025-05-01", "2025-05-03", progress.cursor)
+
+    cursor = IngestionStateStore(path).get("반도체")["cursor"]
+
+    assert cursor == {"date_from": "2025-05-01", "date_to": "2025-05-03", "page": 1}
+    # 재시작하면 저장 완료된 다음 페이지부터
+    assert ThemeProgress(cursor["page"] + 1).cursor == 1
@@ -0,0 +1,88 @@
+# tests/embedding_quality/benchmark_embedding_backend.py
+# 목표 : 양자화 ONNX 임베딩 백엔드의 속도 향상과 검색 품질 손실을 측정
+# ✅ fp32(torch) 대비 encode 처리량 및 top-k 결과 일치율 비교
+#
+# 실행 예 : EMBEDDING_BACKEND=onnx-int8 python -m tests.embedding_quality.benchmark_embedding_backend
+
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 경로 설정 - 저장된 기사를 사용하기 위해 로컬 벡터 DB 사용
+project_root = Path(__file__).parent.parent.parent
+os.environ.setdefault("VECTOR_PERSIST_PATH", str(project_root / "chroma_storage"))
+
+from app.common.db.vector.vector_util import VectorUtil
+from app.common.rag.embedding_backend import load_embedding_model, EMBEDDING_BACKEND
+
+# 비교 설정
+CANDIDATE_BACKEND = EMBEDDING_BACKEND if EMBEDDING_BACKEND != "torch" else "onnx-int8"
+MAX_DOCUMENTS = int(os.getenv("BENCHMARK_MAX_DOCUMENTS", "1000"))
+TOP_K = 5
+BATCH_SIZE = 32
+
+# 서비스와 동일한 형태의 테마 쿼리
+themes = ["에너지", "철강", "건설", "여행", "은행", "증권", "반도체", "AI", "5G", "부동산"]
+queries = [f"{theme} 관련 산업 동향 및 뉴스 기사" for theme in themes]
+
+
+def encode_timed(model, texts):
+    """임베딩 생성 및 처리량(문서/초) 측정"""
+    model.encode(texts[:BATCH_SIZE], batch_size=BATCH_SIZE)  # 워밍업
+    start = time.perf_counter()
+    embeddings = model.encode(texts, batch_size=BATCH_SIZE)
+    elapsed = time.perf_counter() - start
+    return np.asarray(embeddings, dtype=np.float32), len(texts) / elapsed
+
+
+def top_k_ids(query_embeddings, doc_embeddings, k):
+    """내적 기준 top-k 문서 인덱스 (벡터 DB 의 ip 공간과 동일)"""
+    scores = query_embeddings @ doc_embeddings.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def main():
+    print(f"📘 임베딩 백엔드 벤치마크: torch(fp32) vs {CANDIDATE_BACKEND}\n")
+
+    # ✅ 저장된 기사 로드
+    collection = VectorUtil().get_collection()
+    documents = collection.get(limit=MAX_DOCUMENTS, include=["documents"])["documents"]
+    if not documents:
+        print("⚠️ 벡터 DB에 저장된 문서가 없습니다.")
+        return
+    print(f"문서 수: {len(documents)}")
+
+    # ✅ 모델 로드
+    baseline = load_embedding_model(backend="torch")
+    candidate = load_embedding_model(backend=CANDIDATE_BACKEND)
+
+    # ✅ 문서 임베딩 처리량 측정
+    base_docs, base_throughput = encode_timed(baseline, documents)
+    cand_docs, cand_throughput = encode_timed(candidate, documents)
+
+    print(f"\n=== encode 처리량 (batch_size={BATCH_SIZE}) ===")
+    print(f"- torch(fp32)       : {base_throughput:8.1f} 문서/초")
+    print(f"- {CANDIDATE_BACKEND:<18}: {cand_throughput:8.1f} 문서/초 (x{cand_throughput / base_throughput:.2f})")
+
+    # ✅ 쿼리별 top-k 일치율 비교
+    base_top = top_k_ids(np.asarray(baseline.encode(queries)), base_docs, TOP_K)
+    cand_top = top_k_ids(np.asarray(candidate.encode(queries)), cand_docs, TOP_K)
+
+    print(f"\n=== top-{TOP_K} 일치율 (fp32 결과 기준) ===")
+    overlaps = []
+    for theme, base_ids, cand_ids in zip(themes, base_top, cand_top):
+        overlap = len(set(base_ids) & set(cand_ids)) / TOP_K
+        overlaps.append(overlap)
+        print(f"- {theme}: {overlap:.2f}")
+    print(f"\n평균 top-{TOP_K} 일치율: {np.mean(overlaps):.3f}")
+
+    # ✅ 문서 임베딩 자체의 유사도
+    cosine = np.sum(base_docs * cand_docs, axis=1) / (
+        np.linalg.norm(base_docs, axis=1) * np.linalg.norm(cand_docs, axis=1))
+    print(f"문서 임베딩 코사인 유사도: 평균 {cosine.mean():.4f}, 최소 {cosine.min():.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# tests/embedding_quality/benchmark_embedding_pool.py
+# 목표 : 대량 임베딩(초기 수집 / 재임베딩) 처리량이 워커 프로세스 수에 비례하는지 측정
+# ✅ 서비스 executor(쓰레드 4개, 모델 1개) 대비 워커 수별 EmbeddingProcessPool 처리량 비교
+#
+# 실행 예 : BENCHMARK_MAX_DOCUMENTS=2000 python -m tests.embedding_quality.benchmark_embedding_pool
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+# 경로 설정 - 저장된 기사를 사용하기 위해 로컬 벡터 DB 사용
+project_root = Path(__file__).parent.parent.parent
+os.environ.setdefault("VECTOR_PERSIST_PATH", str(project_root / "chroma_storage"))
+
+# 비교 설정
+MAX_DOCUMENTS = int(os.getenv("BENCHMARK_MAX_DOCUMENTS", "1000"))
+CHUNK_SIZE = 64
+BATCH_SIZE = 32
+
+
+def load_documents():
+    """저장된 기사 본문 (없으면 합성 문장)"""
+    from app.common.db.vector.vector_util import VectorUtil
+
+    documents = VectorUtil().get_collection().get(limit=MAX_DOCUMENTS, include=["documents"])["documents"]
+    if not documents:
+        print("⚠️ 벡터 DB에 저장된 문서가 없어 합성 문장을 사용합니다.")
+        documents = [f"반도체 업황 개선으로 {i}번째 기업의 실적 전망이 상향 조정되었다" for i in range(MAX_DOCUMENTS)]
+    return documents
+
+
+def executor_throughput(documents):
+    """서비스 방식: 쓰레드 4개가 모델 하나를 공유해 CHUNK_SIZE 개씩 임베딩"""
+    from app.common.rag.embedding_backend import load_embedding_model
+
+    model = load_embedding_model()
+    model.encode(documents[:BATCH_SIZE], batch_size=BATCH_SIZE)  # 워밍업
+    chunks = [documents[i:i + CHUNK_SIZE] for i in range(0, len(documents), CHUNK_SIZE)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        start = time.perf_counter()
+        embeddings = np.concatenate(list(executor.map(lambda chunk: model.encode(chunk, batch_size=BATCH_SIZE), chunks)))
+        elapsed = time.perf_counter() - start
+    return embeddings, len(documents) / elapsed
+
+
+def pool_throughput(documents, num_workers):
+    """워커 num_workers 개 프로세스 풀 처리량 (모델 로드 시간 제외)"""
+    from app.common.rag.embedding_pool import EmbeddingProcessPool
+
+    with EmbeddingProcessPool(num_workers=num_workers, chunk_size=CHUNK_SIZE, batch_size=BATCH_SIZE) as pool:
+        pool.encode(documents[:CHUNK_SIZE * num_workers])  # 워커 시작 + 모델 로드
+        start = time.perf_counter()
+        embeddings = pool.encode(documents)
+        elapsed = time.perf_counter() - start
+    return embeddings, len(documents) / elapsed
+
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    print(f"📘 임베딩 프로세스 풀 벤치마크 (CPU 코어 {cpu_count}개)\n")
+
+    documents = load_documents()
+    print(f"문서 수: {len(documents)}")
+
+    baseline, base_throughput = executor_throughput(documents)
+    print(f"\n=== 처리량 (chunk_size={CHUNK_SIZE}, batch_size={BATCH_SIZE}) ===")
+    print(f"- executor (쓰레드 4개) : {base_throughput:8.1f} 문서/초")
+
+    num_workers = 1
+    while num_workers <= cpu_count:
+        embeddings, throughput = pool_throughput(documents, num_workers)
+        max_diff = float(np.max(np.abs(embeddings - baseline)))
+        print(f"- 프로세스 {num_workers:>2}개        : {throughput:8.1f} 문서/초 "
+              f"(x{throughput / base_throughput:.2f}, 최대 오차 {max_diff:.1e})")
+        num_workers *= 2
+
+
+if __name__ == "__main__":
+    main()
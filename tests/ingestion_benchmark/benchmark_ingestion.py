@@ -0,0 +1,179 @@
+# tests/ingestion_benchmark/benchmark_ingestion.py
+# 목표 : 실제 API 없이 뉴스 수집 전체 경로(수집 → 검증/중복 제거 → 임베딩 → 벡터 DB 저장)의 처리량 측정
+# ✅ 로컬 DeepSearch 대체 서버(deepsearch_stub)에 DailyNewsCollector 를 연결해 초당 저장 기사 수와
+#    임베딩(encode 호출) / ChromaDB 저장(collection.add 호출) 에 걸린 시간을 보고 (수집 성능 변경 전후 비교용)
+#
+# 실행 예 : STUB_LATENCY_MS=50 BENCHMARK_THEMES=10 python -m tests.ingestion_benchmark.benchmark_ingestion
+#           BENCHMARK_OUTPUT=result.json 으로 결과를 JSON 으로 저장 (STUB_* 설정은 deepsearch_stub 참고)
+
+import asyncio
+import functools
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from tests.ingestion_benchmark.deepsearch_stub import stub_from_env
+
+# 벤치마크 설정
+THEME_COUNT = int(os.getenv("BENCHMARK_THEMES", "10"))
+DAYS_BACK = int(os.getenv("BENCHMARK_DAYS_BACK", "7"))
+OUTPUT_PATH = os.getenv("BENCHMARK_OUTPUT")
+
+
+def configure_environment(work_dir: str, stub_url: str):
+    """서비스 모듈 import 전에 벡터 DB / 상태 파일을 임시 경로로, DeepSearch 주소를 대체 서버로 설정"""
+    os.environ["DEEPSEARCH_BASE_URL"] = stub_url
+    os.environ.setdefault("DEEPSEARCH_API_KEY", "benchmark")
+    os.environ["VECTOR_PERSIST_PATH"] = os.path.join(work_dir, "chroma")
+    os.environ["INGESTION_STATE_PATH"] = os.path.join(work_dir, "ingestion_state.json")
+    os.environ["INGESTION_LOCK_PATH"] = os.path.join(work_dir, "ingestion.lock")
+    os.environ["COLLECTION_STATS_PATH"] = os.path.join(work_dir, "collection_stats.sqlite3")
+    os.environ["NEAR_DUPLICATE_INDEX_PATH"] = os.path.join(work_dir, "near_duplicate_index")
+    # 본문 임베딩 캐시를 쓰면 임베딩 시간이 측정되지 않으므로 기본은 사용하지 않음
+    os.environ.setdefault("EMBEDDING_CACHE_PATH", "")
+
+
+class CallTimer:
+    """감싼 함수의 호출 횟수와 실행 시간 합계
+
+    단계 작업 시간(busy_seconds)에는 executor / 쓰기 쓰레드를 기다린 시간도 들어가므로,
+    임베딩 / 저장 비용은 실제 encode / collection.add 호출 시간으로 따로 잰다.
+    호출이 여러 쓰레드에서 겹치면 합계가 벽시계 시간보다 클 수 있다.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def _record(self, started: float):
+        with self._lock:
+            self.calls += 1
+            self.seconds += time.perf_counter() - started
+
+    def wrap(self, func):
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._record(started)
+        return timed
+
+    def wrap_async(self, func):
+        @functools.wraps(func)
+        async def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self._record(started)
+        return timed
+
+    def snapshot(self) -> dict:
+        return {"calls": self.calls, "seconds": round(self.seconds, 3)}
+
+
+async def run_collector(themes):
+    """수집 작업 1회 실행 후 (실행 기록, 파이프라인 요약, {"encode", "add"} 호출 시간) 반환"""
+    from chromadb.api.models.Collection import Collection
+
+    from app.common.crawlers.daily_news_collector import DailyNewsCollector
+    from app.common.rag import rag_service
+
+    collector = DailyNewsCollector()
+    # BACKFILL_EMBEDDING_WORKERS 가 설정되어 있으면 초기 수집과 같이 임베딩 프로세스 풀 사용
+    pool = rag_service.create_embedding_pool()
+    collector.rag_service.embedding_pool = pool
+
+    # 임베딩 모델 encode (프로세스 풀이면 encode_async) 와 모든 컬렉션의 add 호출 시간 측정
+    timers = {"encode": CallTimer(), "add": CallTimer()}
+    model = rag_service.embedding_model
+    model.encode = timers["encode"].wrap(model.encode)
+    if pool is not None:
+        pool.encode_async = timers["encode"].wrap_async(pool.encode_async)
+    collection_add = Collection.add
+    Collection.add = timers["add"].wrap(collection_add)
+    try:
+        run = await collector.run_ingestion_job(trigger="benchmark", themes=themes, days_back=DAYS_BACK)
+        return run, collector._last_summary or {}, {name: timer.snapshot() for name, timer in timers.items()}
+    finally:
+        Collection.add = collection_add
+        del model.encode
+        collector.rag_service.embedding_pool = None
+        if pool is not None:
+            pool.close()
+        await collector.aclose()
+
+
+def report(run: dict, summary: dict, timings: dict, stub_stats: dict) -> dict:
+    """처리량 / 임베딩·저장 호출 시간 계산 및 출력"""
+    elapsed = summary.get("elapsed_seconds") or 0.0
+    stages = summary.get("stages", {})
+    stored = summary.get("total_stored", 0)
+
+    # 파이프라인 벽시계 시간 대비 실제 encode / collection.add 호출 시간 비율
+    def share(name):
+        return round(timings[name]["seconds"] / elapsed, 3) if elapsed else 0.0
+
+    result = {
+        "articles_fetched": sum(summary.get("fetched", {}).values()),
+        "articles_stored": stored,
+        "errors": run["errors"],
+        "pipeline_seconds": elapsed,
+        "job_seconds": run["duration_seconds"],
+        "articles_per_sec": round(stored / elapsed, 1) if elapsed else 0.0,
+        "encode": timings["encode"],
+        "collection_add": timings["add"],
+        "embedding_share": share("encode"),
+        "chroma_write_share": share("add"),
+        "stages": stages,
+        "stub": stub_stats
+    }
+
+    print("\n=== 수집 처리량 ===")
+    print(f"- 수집 / 저장 기사     : {result['articles_fetched']} / {stored}개 (오류 {result['errors']}건)")
+    print(f"- 파이프라인 / 작업 전체 : {elapsed:.2f}초 / {run['duration_seconds']:.2f}초 (보관 기간 정리 포함)")
+    print(f"- 처리량               : {result['articles_per_sec']:.1f} 기사/초")
+    print(f"- 임베딩 (encode)      : {timings['encode']['seconds']:.3f}초, {timings['encode']['calls']}회 "
+          f"(파이프라인 시간의 {result['embedding_share'] * 100:.1f}%)")
+    print(f"- 저장 (collection.add): {timings['add']['seconds']:.3f}초, {timings['add']['calls']}회 "
+          f"(파이프라인 시간의 {result['chroma_write_share'] * 100:.1f}%)")
+    print("\n=== 단계별 작업 시간 (다른 단계 / 쓰레드 대기 포함) ===")
+    for name, stage in stages.items():
+        print(f"- {name:<8}: {stage['busy_seconds']:7.3f}초, {stage['items_out']}건, 활용률 {stage['utilization']:.3f}")
+    print(f"\n대체 서버: 요청 {stub_stats['requests']}회, 주입 오류 {stub_stats['errors_injected']}회, "
+          f"응답 기사 {stub_stats['articles_served']}개")
+    return result
+
+
+def main():
+    work_dir = tempfile.mkdtemp(prefix="ingestion-benchmark-")
+    stub = stub_from_env().start()
+    try:
+        configure_environment(work_dir, stub.url)
+        from app.common.crawlers.daily_news_collector import DailyNewsCollector
+
+        themes = DailyNewsCollector.DEFAULT_THEMES[:THEME_COUNT]
+        print(f"📘 뉴스 수집 벤치마크: 테마 {len(themes)}개, {DAYS_BACK}일치, 대체 서버 {stub.url}")
+        print(f"   (키워드당 기사 {stub.articles_per_keyword}개, 페이지 {stub.page_size}개, "
+              f"지연 {stub.latency * 1000:.0f}ms, 오류율 {stub.error_rate})")
+
+        run, summary, timings = asyncio.run(run_collector(themes))
+        result = report(run, summary, timings, stub.stats())
+
+        if OUTPUT_PATH:
+            with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+            print(f"\n결과 저장: {OUTPUT_PATH}")
+    finally:
+        stub.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
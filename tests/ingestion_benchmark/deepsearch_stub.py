@@ -0,0 +1,233 @@
+# tests/ingestion_benchmark/deepsearch_stub.py
+# 목표 : 실제 DeepSearch API / API 키 없이 뉴스 수집 성능을 측정하기 위한 로컬 global-articles 대체 서버
+# ✅ 합성 기사 또는 녹화한 기사를 페이지 단위로 응답 (지연 시간 / 페이지 크기 / 오류 주입 설정)
+#
+# 실행 예 : STUB_PORT=8765 STUB_LATENCY_MS=80 STUB_ERROR_RATE=0.05 python -m tests.ingestion_benchmark.deepsearch_stub
+#           DEEPSEARCH_BASE_URL=http://127.0.0.1:8765/v1/global-articles 로 서버 실행
+#
+# 녹화 : DEEPSEARCH_API_KEY=... python -m tests.ingestion_benchmark.deepsearch_stub record recorded.json 2025-05-01 2025-05-07
+#        (기본 테마 키워드를 실제 API 로 수집해 {키워드: [기사, ...]} 로 저장, STUB_REPLAY_PATH 로 재생)
+
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# 합성 본문에 사용할 단어 (테마 키워드와 섞어 문장 생성)
+VOCABULARY = (
+    "실적 전망 상향 하향 수출 수요 공급 투자 정부 정책 금리 환율 증시 코스피 외국인 기관 매수 매도 "
+    "분기 영업이익 매출 계약 수주 공장 증설 감산 가격 인상 인하 규제 완화 지원 발표 예정 확대 축소 "
+    "글로벌 국내 해외 시장 점유율 경쟁 기술 개발 협력 인수 합병 상장 배당 자금 조달 위험 회복 둔화"
+).split()
+
+
+class DeepSearchStub:
+    """DeepSearch global-articles 형식으로 응답하는 로컬 HTTP 서버 (ThreadingHTTPServer)
+
+    - 합성 모드: 키워드마다 articles_per_keyword 개 기사를 요청 기간 안의 날짜로 결정적으로 생성한다.
+      duplicate_rate 비율의 기사는 여러 키워드가 공유하는 같은 기사 (다른 테마에서 다시 수집되는 기사) 이다.
+    - 재생 모드: replay_path 의 {키워드: [기사, ...]} 를 그대로 페이지로 나눠 응답한다.
+    - page_size: 서버가 한 페이지에 담는 최대 기사 수 (요청한 page_size 보다 작으면 작은 값)
+    - latency_ms / jitter_ms: 요청마다 지연 시간
+    - error_rate / error_status: 요청의 error_rate 비율에 error_status 로 응답 (429 / 5xx 는 클라이언트가 재시도)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, articles_per_keyword: int = 300,
+                 page_size: int = 50, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 503, duplicate_rate: float = 0.1, replay_path: str = None, seed: int = 42):
+        self.articles_per_keyword = articles_per_keyword
+        self.page_size = page_size
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.duplicate_rate = duplicate_rate
+        self.seed = seed
+        self.recorded = None
+        if replay_path:
+            with open(replay_path, encoding="utf-8") as f:
+                self.recorded = json.load(f)
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._cache = {}  # (키워드, 기간) -> 합성 기사 목록 (요청마다 다시 만들지 않도록)
+        self.requests = 0
+        self.errors_injected = 0
+        self.articles_served = 0
+
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1/global-articles"
+
+    def start(self):
+        """백그라운드 쓰레드에서 서버 시작"""
+        self._thread = threading.Thread(target=self.server.serve_forever, name="deepsearch-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "errors_injected": self.errors_injected,
+                "articles_served": self.articles_served}
+
+    # 응답 생성
+    def articles(self, keyword: str, date_from: str, date_to: str) -> list:
+        """키워드의 전체 기사 목록 (최신순)"""
+        if self.recorded is not None:
+            return self.recorded.get(keyword, [])
+        key = (keyword, date_from, date_to)
+        if key not in self._cache:
+            self._cache[key] = self._synthetic_articles(keyword, date_from, date_to)
+        return self._cache[key]
+
+    def _synthetic_articles(self, keyword: str, date_from: str, date_to: str) -> list:
+        start = datetime.strptime(date_from, "%Y-%m-%d")
+        days = max((datetime.strptime(date_to, "%Y-%m-%d") - start).days, 0) + 1
+        articles = []
+        for i in range(self.articles_per_keyword):
+            rng = random.Random(f"{self.seed}:{keyword}:{i}")
+            if rng.random() < self.duplicate_rate:
+                # 여러 키워드에 같은 기사 - 키워드와 무관한 번호로 생성
+                articles.append(self._synthetic_article("공통", rng.randrange(self.articles_per_keyword), start, days))
+            else:
+                articles.append(self._synthetic_article(keyword, i, start, days))
+        articles.sort(key=lambda article: article["published_at"], reverse=True)
+        return articles
+
+    def _synthetic_article(self, keyword: str, number: int, start: datetime, days: int) -> dict:
+        rng = random.Random(f"{self.seed}:{keyword}:article:{number}")
+        published_at = start + timedelta(days=rng.randrange(days), seconds=rng.randrange(86400))
+        words = [rng.choice(VOCABULARY) for _ in range(40)]
+        article_id = hashlib.md5(f"{keyword}:{number}".encode("utf-8")).hexdigest()
+        return {
+            "id": article_id,
+            "title": f"{keyword} {' '.join(words[:6])} ({number})",
+            "summary": f"{keyword} 관련 {number}번 기사. " + " ".join(words),
+            "publisher": f"매체{rng.randrange(20)}",
+            "published_at": published_at.strftime("%Y-%m-%dT%H:%M:%S"),
+            "content_url": f"https://news.example.com/{article_id}"
+        }
+
+    def page(self, params: dict) -> dict:
+        keyword = params.get("keyword", "")
+        page = max(int(params.get("page", 1)), 1)
+        page_size = min(int(params.get("page_size", self.page_size)), self.page_size)
+        today = datetime.now().strftime("%Y-%m-%d")
+        articles = self.articles(keyword, params.get("date_from", today), params.get("date_to", today))
+
+        items = articles[(page - 1) * page_size:page * page_size]
+        return {
+            "total_items": len(articles),
+            "total_pages": math.ceil(len(articles) / page_size),
+            "page": page,
+            "page_size": page_size,
+            "data": items
+        }
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+                with stub._lock:
+                    stub.requests += 1
+                    delay = stub.latency + stub._random.uniform(0, stub.jitter)
+                    fail = stub._random.random() < stub.error_rate
+                    if fail:
+                        stub.errors_injected += 1
+                if delay:
+                    time.sleep(delay)
+
+                if fail:
+                    self._send(stub.error_status, {"error": "injected error"})
+                    return
+                body = stub.page(params)
+                with stub._lock:
+                    stub.articles_served += len(body["data"])
+                self._send(200, body)
+
+            def _send(self, status: int, body: dict):
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass  # 요청마다 로그를 남기지 않음
+
+        return Handler
+
+
+def stub_from_env(**overrides) -> DeepSearchStub:
+    """STUB_* 환경 변수로 설정한 대체 서버 생성"""
+    config = {
+        "port": int(os.getenv("STUB_PORT", "0")),
+        "articles_per_keyword": int(os.getenv("STUB_ARTICLES_PER_KEYWORD", "300")),
+        "page_size": int(os.getenv("STUB_PAGE_SIZE", "50")),
+        "latency_ms": float(os.getenv("STUB_LATENCY_MS", "0")),
+        "jitter_ms": float(os.getenv("STUB_JITTER_MS", "0")),
+        "error_rate": float(os.getenv("STUB_ERROR_RATE", "0")),
+        "error_status": int(os.getenv("STUB_ERROR_STATUS", "503")),
+        "duplicate_rate": float(os.getenv("STUB_DUPLICATE_RATE", "0.1")),
+        "replay_path": os.getenv("STUB_REPLAY_PATH") or None
+    }
+    config.update(overrides)
+    return DeepSearchStub(**config)
+
+
+def record(path: str, date_from: str, date_to: str, page_limit: int = 10):
+    """실제 DeepSearch API 로 기본 테마 키워드를 수집해 재생용 파일로 저장"""
+    # 수집기 모듈은 임베딩 모델 / 벡터 DB 를 불러오므로 테마 목록만 가벼운 모듈에서 가져옴
+    from app.common.crawlers.news_themes import DEFAULT_THEMES
+    from app.common.utils.deepsearch_client import DeepSearchClient
+
+    recorded = {
+        keyword: DeepSearchClient.fetch_articles(keyword, date_from, date_to, page_limit=page_limit)
+        for keyword in DEFAULT_THEMES
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(recorded, f, ensure_ascii=False)
+    print(f"✅ {sum(map(len, recorded.values()))}개 기사 저장: {path}")
+
+
+def main():
+    if len(sys.argv) >= 5 and sys.argv[1] == "record":
+        record(sys.argv[2], sys.argv[3], sys.argv[4])
+        return
+
+    stub = stub_from_env(port=int(os.getenv("STUB_PORT", "8765")))
+    print(f"🛰️ DeepSearch 대체 서버 실행 중: {stub.url}")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n종료 - {stub.stats()}")
+    finally:
+        stub.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
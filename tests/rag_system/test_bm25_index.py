@@ -0,0 +1,151 @@
+# tests/rag_system/test_bm25_index.py
+# 목표 : BM25 역색인의 토큰화 / 점수 순위 / 증분 갱신 / 컬렉션 버전 재생성 확인
+#        (모델이나 Chroma 없이 실행되는 단위 테스트)
+# 실행 예 : python -m pytest -q tests/rag_system/test_bm25_index.py
+
+from app.common.rag.bm25_index import BM25Index, tokenize
+
+
+class FakeCollection:
+    """collection.get(limit, offset, include) 만 흉내내는 컬렉션"""
+
+    def __init__(self, ids, documents, metadatas=None):
+        self.ids = list(ids)
+        self.documents = list(documents)
+        self.metadatas = list(metadatas or [{} for _ in ids])
+        self.get_calls = 0
+
+    def get(self, limit, offset, include):
+        self.get_calls += 1
+        return {
+            "ids": self.ids[offset:offset + limit],
+            "documents": self.documents[offset:offset + limit],
+            "metadatas": self.metadatas[offset:offset + limit],
+        }
+
+
+def build_index():
+    index = BM25Index()
+    index.add(
+        ["d1", "d2", "d3"],
+        ["삼성전자 반도체 실적 발표", "현대차 전기차 판매 증가", "반도체 수출 회복세"],
+        [{"theme": "반도체"}, {"theme": "자동차"}, {"theme": "반도체"}],
+    )
+    return index
+
+
+def test_tokenize_adds_korean_bigrams_and_lowercases_english():
+    tokens = tokenize("반도체의 AI 5G")
+
+    assert tokens[:4] == ["반도체의", "반도", "도체", "체의"]
+    assert "ai" in tokens and "5g" in tokens
+    # 두 글자 어절은 bigram 을 따로 만들지 않음
+    assert tokenize("주가") == ["주가"]
+
+
+def test_search_matches_inflected_korean_words():
+    index = build_index()
+
+    results = index.search("반도체의", n_results=10)
+
+    assert {doc_id for doc_id, *_ in results} == {"d1", "d3"}
+
+
+def test_search_returns_scored_documents_in_descending_order():
+    index = build_index()
+
+    results = index.search("반도체 실적", n_results=10)
+
+    assert results[0][0] == "d1"
+    assert [score for _, score, _, _ in results] == sorted((score for _, score, _, _ in results), reverse=True)
+    doc_id, score, document, metadata = results[0]
+    assert document == "삼성전자 반도체 실적 발표"
+    assert metadata == {"theme": "반도체"}
+    assert index.search("반도체", n_results=1)[0][0] in ("d1", "d3")
+    assert len(index.search("반도체", n_results=1)) == 1
+
+
+def test_search_applies_doc_filter():
+    index = build_index()
+
+    results = index.search("반도체 전기차", n_results=10, doc_filter=lambda meta: meta.get("theme") == "자동차")
+
+    assert [doc_id for doc_id, *_ in results] == ["d2"]
+
+
+def test_remove_and_replace_update_postings():
+    index = build_index()
+
+    index.remove(["d1"])
+    assert "d1" not in {doc_id for doc_id, *_ in index.search("반도체", n_results=10)}
+    assert index.get("d1") is None
+    assert len(index) == 2
+
+    # 같은 ID 로 다시 추가하면 이전 본문의 용어는 더 이상 검색되지 않음
+    index.add(["d3"], ["배터리 소재 투자"], [{"theme": "2차전지"}])
+    assert index.search("반도체", n_results=10) == []
+    assert index.search("배터리", n_results=10)[0][0] == "d3"
+
+    index.remove(["d2", "d3", "unknown"])
+    assert len(index) == 0
+    assert index.search("배터리", n_results=10) == []
+
+
+def test_update_metadata_keeps_index():
+    index = build_index()
+
+    index.update_metadata(["d1", "unknown"], [{"theme": "AI"}, {"theme": "무시"}])
+
+    assert index.get("d1") == ("삼성전자 반도체 실적 발표", {"theme": "AI"})
+    assert index.get("unknown") is None
+    assert index.search("실적", n_results=1)[0][3] == {"theme": "AI"}
+
+
+def test_ensure_loaded_pages_through_collections():
+    first = FakeCollection([f"a{i}" for i in range(5)], ["반도체 뉴스"] * 5)
+    second = FakeCollection(["b0"], ["자동차 뉴스"])
+    index = BM25Index()
+
+    index.ensure_loaded([first, second], page_size=2, version=1)
+
+    assert len(index) == 6
+    # 2개씩 3페이지 + 빈 페이지, 1페이지 + 빈 페이지
+    assert first.get_calls == 4 and second.get_calls == 2
+    assert index.loaded and index.version == 1
+
+
+def test_ensure_loaded_rebuilds_only_when_version_changes():
+    collection = FakeCollection(["d1"], ["반도체 뉴스"])
+    index = BM25Index()
+    index.ensure_loaded([collection], version=1)
+    calls = collection.get_calls
+
+    index.ensure_loaded([collection], version=1)
+    assert collection.get_calls == calls
+
+    # 다른 프로세스가 문서를 추가해 버전이 바뀌면 다시 생성
+    collection.ids.append("d2")
+    collection.documents.append("자동차 뉴스")
+    collection.metadatas.append({})
+    index.ensure_loaded([collection], version=2)
+    assert collection.get_calls > calls
+    assert len(index) == 2 and index.version == 2
+
+
+def test_advance_version_skips_rebuild_for_own_changes():
+    collection = FakeCollection(["d1"], ["반도체 뉴스"])
+    index = BM25Index()
+    index.ensure_loaded([collection], version=1)
+
+    # 이 프로세스가 직접 추가한 문서는 증분 갱신 후 버전만 올림
+    index.add(["d2"], ["자동차 뉴스"], [{}])
+    index.advance_version(1, 2)
+    calls = collection.get_calls
+    index.ensure_loaded([collection], version=2)
+
+    assert collection.get_calls == calls
+    assert index.version == 2 and len(index) == 2
+
+    # 이전 버전이 맞지 않으면 올리지 않음
+    index.advance_version(5, 6)
+    assert index.version == 2
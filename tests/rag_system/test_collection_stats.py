@@ -0,0 +1,130 @@
+# tests/rag_system/test_collection_stats.py
+# 목표 : 수집 현황 통계의 증분 갱신(apply) / 재계산(rebuild) / 초기화 1회 보장 / 컬렉션 버전 증가 확인
+# 실행 예 : python -m pytest -q tests/rag_system/test_collection_stats.py
+
+import threading
+
+import pytest
+
+from app.common.rag.collection_stats import CollectionStats
+
+
+class FakeCollection:
+    """get(limit, offset, include) 만 흉내내는 컬렉션"""
+
+    def __init__(self, metadatas):
+        self.metadatas = list(metadatas)
+
+    def get(self, limit, offset, include):
+        page = self.metadatas[offset:offset + limit]
+        return {"ids": [f"id{offset + i}" for i in range(len(page))], "metadatas": page}
+
+
+def article(theme, day, publisher="연합뉴스", **extra):
+    return {"theme": theme, "published_at": f"{day}T09:00:00", "publisher": publisher, **extra}
+
+
+@pytest.fixture
+def stats(tmp_path):
+    return CollectionStats(str(tmp_path / "stats" / "collection_stats.sqlite3"), version_check_seconds=0)
+
+
+def test_apply_counts_added_and_removed_documents(stats):
+    first = article("반도체", "2025-05-01")
+    second = article("반도체", "2025-05-02", publisher="매일경제")
+    third = article("자동차", "2025-05-02")
+
+    stats.apply(added=[first, second, third])
+    stats.apply(removed=[first])
+    snapshot = stats.snapshot()
+
+    assert snapshot["total"] == 2
+    assert snapshot["by_theme"] == {"반도체": 1, "자동차": 1}
+    assert snapshot["by_day"] == {"2025-05-02": 2}
+    assert snapshot["by_theme_day"] == {"반도체": {"2025-05-02": 1}, "자동차": {"2025-05-02": 1}}
+    assert snapshot["by_publisher"] == {"매일경제": 1, "연합뉴스": 1}
+
+
+def test_missing_fields_are_counted_as_unknown(stats):
+    stats.apply(added=[{}, None])
+
+    snapshot = stats.snapshot()
+    assert snapshot["total"] == 2
+    assert snapshot["by_theme"] == {"unknown": 2}
+    assert snapshot["by_publisher"] == {"unknown": 2}
+
+
+def test_multi_theme_documents_count_once_per_theme(tmp_path):
+    # 여러 테마를 쉼표로 이어 저장하는 메타데이터
+    stats = CollectionStats(str(tmp_path / "stats.sqlite3"), themes_of=lambda metadata: metadata["themes"].split(","))
+    before = article(None, "2025-05-01", themes="반도체")
+    after = article(None, "2025-05-01", themes="반도체,AI")
+
+    stats.apply(added=[before])
+    # 테마 추가 - 이전 메타데이터는 removed, 새 메타데이터는 added
+    stats.apply(added=[after], removed=[before])
+    snapshot = stats.snapshot()
+
+    assert snapshot["total"] == 1
+    assert snapshot["by_theme"] == {"반도체": 1, "AI": 1}
+    assert snapshot["by_publisher"] == {"연합뉴스": 1}
+
+
+def test_apply_and_bump_version_increment_version(stats):
+    assert stats.version() == 0
+
+    assert stats.apply(added=[article("반도체", "2025-05-01")]) == 1
+    assert stats.bump_version() == 2
+    assert stats.version() == 2
+
+    # 다른 프로세스가 올린 버전도 읽음
+    other = CollectionStats(stats.path, version_check_seconds=0)
+    assert other.apply(removed=[article("반도체", "2025-05-01")]) == 3
+    assert stats.version() == 3
+
+
+def test_rebuild_replaces_counts(stats):
+    stats.apply(added=[article("반도체", "2025-05-01")] * 5)
+    collection = FakeCollection([article("자동차", "2025-05-03")] * 3)
+
+    assert stats.rebuild([collection], page_size=2)
+    snapshot = stats.snapshot()
+
+    assert snapshot["total"] == 3
+    assert snapshot["by_theme"] == {"자동차": 3}
+    assert stats.is_initialized()
+    assert stats.version() == 2
+
+
+def test_rebuild_only_if_missing_runs_once(stats):
+    collection = FakeCollection([article("반도체", "2025-05-01")] * 10)
+
+    assert not stats.is_initialized()
+    assert stats.rebuild([collection], only_if_missing=True)
+    version = stats.version()
+
+    assert not stats.rebuild([collection], only_if_missing=True)
+    stats.ensure_initialized([collection])
+
+    assert stats.snapshot()["total"] == 10
+    assert stats.version() == version
+
+
+def test_concurrent_ensure_initialized_counts_once(stats):
+    collection = FakeCollection([article("반도체", "2025-05-01")] * 10)
+    # 워커마다 따로 연 통계 (여러 프로세스가 동시에 시작하는 경우)
+    workers = [CollectionStats(stats.path) for _ in range(4)]
+    barrier = threading.Barrier(len(workers))
+
+    def start(worker):
+        barrier.wait()
+        worker.ensure_initialized([collection])
+
+    threads = [threading.Thread(target=start, args=(worker,)) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert stats.snapshot()["total"] == 10
+    assert stats.version() == 1
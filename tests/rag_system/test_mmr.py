@@ -0,0 +1,45 @@
+# tests/rag_system/test_mmr.py
+# 목표 : MMR 선택이 관련성 1위를 먼저 고르고, 이후에는 중복 후보 대신 다른 후보를 고르는지 확인
+# 실행 예 : python -m pytest -q tests/rag_system/test_mmr.py
+
+import numpy as np
+
+from app.common.rag.mmr import mmr_select
+
+# 0, 1 은 거의 같은 기사, 2 는 다른 주제의 기사
+EMBEDDINGS = np.array([
+    [1.0, 0.0, 0.0],
+    [0.99, 0.01, 0.0],
+    [0.0, 1.0, 0.0],
+])
+RELEVANCE = np.array([0.9, 0.85, 0.6])
+
+
+def test_first_pick_is_most_relevant():
+    assert mmr_select(EMBEDDINGS, RELEVANCE, k=1) == [0]
+    assert mmr_select(EMBEDDINGS, [0.1, 0.2, 0.95], k=1) == [2]
+
+
+def test_diversity_skips_near_duplicate():
+    assert mmr_select(EMBEDDINGS, RELEVANCE, k=2, lambda_mult=0.5) == [0, 2]
+
+
+def test_lambda_one_keeps_relevance_order():
+    assert mmr_select(EMBEDDINGS, RELEVANCE, k=3, lambda_mult=1.0) == [0, 1, 2]
+
+
+def test_k_is_bounded_by_candidates():
+    selected = mmr_select(EMBEDDINGS, RELEVANCE, k=10)
+
+    assert sorted(selected) == [0, 1, 2]
+    assert mmr_select(EMBEDDINGS, RELEVANCE, k=0) == []
+    assert mmr_select(np.zeros((0, 3)), [], k=3) == []
+
+
+def test_equal_relevance_and_zero_vectors():
+    # 관련성이 모두 같고 영벡터가 섞여 있어도 중복 없이 k 개를 고름
+    embeddings = [[0.0, 0.0], [1.0, 0.0], [0.0, 1.0]]
+
+    selected = mmr_select(embeddings, [0.5, 0.5, 0.5], k=3)
+
+    assert len(selected) == len(set(selected)) == 3
@@ -0,0 +1,106 @@
+# tests/rag_system/test_near_duplicate.py
+# 목표 : 유사 중복 기사 색인의 MinHash 비교 / reserve·commit·release 수명 주기 / scope 분리 / 디스크 유지 확인
+# 실행 예 : python -m pytest -q tests/rag_system/test_near_duplicate.py
+
+from contextlib import closing
+
+import pytest
+
+from app.common.rag.near_duplicate import NearDuplicateIndex, shingles
+
+ARTICLE = ("삼성전자가 올해 2분기 반도체 부문에서 시장 예상을 웃도는 영업이익을 기록했다고 밝혔다. "
+           "고대역폭 메모리 판매가 늘면서 데이터센터용 제품 매출이 크게 증가했다.")
+# 같은 통신사 기사를 다른 매체가 띄어쓰기만 바꿔 전재
+REPRINT = ARTICLE.replace("반도체 부문에서", "반도체부문에서").replace("크게 증가했다", "크게  증가했다")
+OTHER = "현대차는 미국 전기차 공장 가동을 앞당기고 하이브리드 차량 생산을 늘리기로 했다고 발표했다."
+
+
+@pytest.fixture
+def index(tmp_path):
+    return NearDuplicateIndex(str(tmp_path))
+
+
+def test_shingles_ignore_whitespace_and_case():
+    assert shingles("AB CD e", size=3) == {"abc", "bcd", "cde"}
+    assert shingles("짧은글", size=5) == {"짧은글"}
+    assert shingles("  ", size=5) == set()
+
+
+def test_signature_is_deterministic_and_empty_text_has_none(tmp_path, index):
+    other = NearDuplicateIndex(str(tmp_path / "other"))
+
+    assert (index.signature(ARTICLE) == other.signature(ARTICLE)).all()
+    assert index.signature(ARTICLE).shape == (128,)
+    assert index.signature("") is None
+    assert index.find("news", None) is None
+
+
+def test_bands_must_divide_num_perm(tmp_path):
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(str(tmp_path), num_perm=100, bands=16)
+
+
+def test_add_finds_reprint_but_not_other_article(index):
+    index.add("news", "a1", index.signature(ARTICLE))
+
+    assert index.find("news", index.signature(REPRINT)) == "a1"
+    assert index.find("news", index.signature(OTHER)) is None
+
+
+def test_scopes_are_isolated(index):
+    index.add("반도체", "a1", index.signature(ARTICLE))
+
+    assert index.find("반도체", index.signature(REPRINT)) == "a1"
+    assert index.find("자동차", index.signature(REPRINT)) is None
+
+
+def test_reserve_is_visible_in_process_only_until_commit(tmp_path, index):
+    index.reserve("news", "a1", index.signature(ARTICLE))
+
+    assert index.find("news", index.signature(REPRINT)) == "a1"
+    # 다른 프로세스(같은 디렉터리의 새 색인)에는 아직 보이지 않음
+    assert NearDuplicateIndex(str(tmp_path)).find("news", index.signature(REPRINT)) is None
+
+    index.commit(["a1"])
+
+    assert index._pending == {} and index._pending_buckets == {}
+    assert NearDuplicateIndex(str(tmp_path)).find("news", index.signature(REPRINT)) == "a1"
+    assert index.find("news", index.signature(REPRINT)) == "a1"
+
+
+def test_release_drops_reserved_signature(tmp_path, index):
+    index.reserve("news", "a1", index.signature(ARTICLE))
+    index.reserve("news", "a1", index.signature(OTHER))  # 이미 예약된 ID 는 무시
+
+    index.release(["a1", "unknown"])
+
+    assert index.find("news", index.signature(REPRINT)) is None
+    assert index._pending == {} and index._pending_buckets == {}
+    # 해제한 뒤 commit 해도 디스크에 등록되지 않음
+    index.commit(["a1"])
+    assert NearDuplicateIndex(str(tmp_path)).find("news", index.signature(REPRINT)) is None
+
+
+def test_remove_deletes_from_disk(index):
+    signature = index.signature(ARTICLE)
+    index.add_many([("news", "a1", signature), ("news", "a2", index.signature(OTHER)), ("news", "a3", None)])
+
+    index.remove(["a1"])
+
+    assert index.find("news", index.signature(REPRINT)) is None
+    assert index.find("news", index.signature(OTHER)) == "a2"
+    with closing(index.connect()) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM bands WHERE doc_id = 'a1'").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0] == 1
+
+
+def test_find_reuses_given_connection(index):
+    index.add("news", "a1", index.signature(ARTICLE))
+    conn = index.connect()
+    try:
+        assert index.find("news", index.signature(REPRINT), conn=conn) == "a1"
+        assert index.find("news", index.signature(OTHER), conn=conn) is None
+        # 넘겨받은 연결은 닫지 않음
+        assert conn.execute("SELECT 1").fetchone() == (1,)
+    finally:
+        conn.close()
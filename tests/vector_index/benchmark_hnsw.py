@@ -0,0 +1,116 @@
+# tests/vector_index/benchmark_hnsw.py
+# 목표 : HNSW 인덱스 설정(M, construction_ef, search_ef)에 따른 검색 지연 시간과 recall 을 측정하여
+#        데이터 기반으로 인덱스 설정을 고르기 위한 오프라인 벤치마크
+# ✅ 저장된 컬렉션의 스냅샷을 설정별 임시 컬렉션에 복사하고, 전수 탐색(exact) top-k 와 비교
+#
+# 실행 예 : python -m tests.vector_index.benchmark_hnsw
+
+import os
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+from chromadb import EphemeralClient
+
+# 경로 설정 - 로컬 벡터 DB 스냅샷 사용
+project_root = Path(__file__).parent.parent.parent
+os.environ.setdefault("VECTOR_PERSIST_PATH", str(project_root / "chroma_storage"))
+
+from app.common.db.vector.vector_util import VectorUtil, hnsw_metadata
+from app.common.rag.embedding_backend import load_embedding_model
+
+TOP_K = 10
+REPEAT = 5                # 지연 시간 측정 반복 횟수
+SAMPLED_QUERIES = 200     # 테마 쿼리 외에 저장된 문서를 쿼리로 추가 사용할 개수
+SEED = 42
+
+# 비교할 설정 (M, construction_ef, search_ef) - None 은 ChromaDB 기본값
+parameter_sets = [
+    (None, None, None),
+    (16, 100, 10),
+    (16, 100, 50),
+    (16, 200, 100),
+    (32, 200, 50),
+    (32, 400, 200),
+]
+
+# 서비스와 동일한 형태의 테마 쿼리
+themes = ["에너지", "철강", "건설", "여행", "은행", "증권", "반도체", "AI", "5G", "부동산"]
+theme_queries = [f"{theme} 관련 산업 동향 및 뉴스 기사" for theme in themes]
+
+
+def load_snapshot():
+    """저장된 컬렉션(테마 분할 시 전체)의 ID / 임베딩 스냅샷"""
+    ids, embeddings = [], []
+    for collection in VectorUtil().get_all_collections():
+        results = collection.get(include=["embeddings"])
+        ids.extend(results["ids"])
+        embeddings.extend(results["embeddings"])
+    return ids, np.asarray(embeddings, dtype=np.float32)
+
+
+def exact_top_k(queries, embeddings, k):
+    """전수 탐색 top-k (ip 공간: 내적이 클수록 가까움)"""
+    return np.argsort(-(queries @ embeddings.T), axis=1)[:, :k]
+
+
+def build_collection(client, ids, embeddings, m, construction_ef, search_ef):
+    """설정별 임시 컬렉션 생성 및 스냅샷 적재"""
+    collection = client.create_collection(
+        name=f"bench-{uuid.uuid4().hex[:8]}",
+        # 환경 변수(VECTOR_HNSW_*)를 읽지 않아야 None 이 실제 ChromaDB 기본값이 됨
+        metadata=hnsw_metadata(space="ip", construction_ef=construction_ef, search_ef=search_ef, m=m, use_env=False)
+    )
+    batch_size = client.get_max_batch_size()
+    for start in range(0, len(ids), batch_size):
+        collection.add(ids=ids[start:start + batch_size], embeddings=embeddings[start:start + batch_size])
+    return collection
+
+
+def main():
+    print("📘 HNSW 설정별 recall / 지연 시간 벤치마크\n")
+
+    ids, embeddings = load_snapshot()
+    if not ids:
+        print("⚠️ 벡터 DB에 저장된 문서가 없습니다.")
+        return
+    id_to_index = {doc_id: i for i, doc_id in enumerate(ids)}
+
+    # ✅ 고정 쿼리 세트 (테마 쿼리 + 고정 시드로 뽑은 문서 임베딩)
+    model = load_embedding_model()
+    rng = np.random.default_rng(SEED)
+    sampled = rng.choice(len(ids), size=min(SAMPLED_QUERIES, len(ids)), replace=False)
+    queries = np.vstack([np.asarray(model.encode(theme_queries), dtype=np.float32), embeddings[sampled]])
+    k = min(TOP_K, len(ids))
+    truth = exact_top_k(queries, embeddings, k)
+
+    print(f"문서 수: {len(ids)}, 쿼리 수: {len(queries)} (테마 {len(theme_queries)}개), k={k}\n")
+    print(f"{'M':>5} {'c_ef':>6} {'s_ef':>6} | {'recall@k':>9} {'p50(ms)':>9} {'p99(ms)':>9} {'build(s)':>9}")
+    print("-" * 64)
+
+    client = EphemeralClient()
+    for m, construction_ef, search_ef in parameter_sets:
+        start = time.perf_counter()
+        collection = build_collection(client, ids, embeddings, m, construction_ef, search_ef)
+        build_time = time.perf_counter() - start
+
+        latencies = []
+        recalls = []
+        for _ in range(REPEAT):
+            for query, expected in zip(queries, truth):
+                start = time.perf_counter()
+                result = collection.query(query_embeddings=[query], n_results=k, include=[])
+                latencies.append(time.perf_counter() - start)
+                found = {id_to_index[doc_id] for doc_id in result["ids"][0]}
+                recalls.append(len(found & set(expected)) / k)
+
+        latencies_ms = np.array(latencies) * 1000
+        print(f"{m or '-':>5} {construction_ef or '-':>6} {search_ef or '-':>6} | "
+              f"{np.mean(recalls):>9.4f} {np.percentile(latencies_ms, 50):>9.3f} "
+              f"{np.percentile(latencies_ms, 99):>9.3f} {build_time:>9.2f}")
+        client.delete_collection(collection.name)
+
+
+if __name__ == "__main__":
+    main()
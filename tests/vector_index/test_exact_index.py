@@ -0,0 +1,195 @@
+# tests/vector_index/test_exact_index.py
+# 목표 : 메모리 전수 검색 인덱스의 검색 순위 / where·파티션 필터 / 파티션별 갱신 / 버전 재적재 확인
+#        (테마별 분할 시 같은 기사가 여러 파티션에 있어도 행을 잃지 않아야 함)
+# 실행 예 : python -m pytest -q tests/vector_index/test_exact_index.py
+
+import numpy as np
+
+from app.common.db.vector.exact_index import ExactSearchIndex
+
+
+class FakeCollection:
+    """name / count() / get(limit, offset, include) 만 흉내내는 컬렉션"""
+
+    def __init__(self, name, ids, embeddings, metadatas=None):
+        self.name = name
+        self.ids = list(ids)
+        self.embeddings = [list(map(float, row)) for row in embeddings]
+        self.documents = [f"{name}:{doc_id}" for doc_id in ids]
+        self.metadatas = list(metadatas or [{} for _ in ids])
+        self.count_calls = 0
+        self.get_calls = 0
+
+    def count(self):
+        self.count_calls += 1
+        return len(self.ids)
+
+    def get(self, limit, offset, include):
+        self.get_calls += 1
+        end = offset + limit
+        return {
+            "ids": self.ids[offset:end],
+            "embeddings": self.embeddings[offset:end],
+            "documents": self.documents[offset:end],
+            "metadatas": self.metadatas[offset:end],
+        }
+
+
+def loaded_index(**kwargs):
+    index = ExactSearchIndex(**kwargs)
+    index.ensure_loaded([])
+    return index
+
+
+def test_query_orders_by_inner_product_distance():
+    index = loaded_index()
+    index.add("news", ["a", "b", "c"], ["A", "B", "C"], [{}, {}, {}],
+              [[1.0, 0.0], [0.6, 0.8], [0.0, 1.0]])
+
+    result = index.query([[1.0, 0.0], [0.0, 1.0]], n_results=2, include=["documents", "distances"])
+
+    assert result["ids"] == [["a", "b"], ["c", "b"]]
+    assert result["documents"] == [["A", "B"], ["C", "B"]]
+    assert np.allclose(result["distances"][0], [0.0, 0.4], atol=1e-6)
+    assert "metadatas" not in result
+
+
+def test_cosine_and_l2_spaces():
+    cosine = loaded_index(space="cosine")
+    cosine.add("news", ["a", "b"], ["A", "B"], [{}, {}], [[10.0, 0.0], [1.0, 1.0]])
+    distances = cosine.query([[2.0, 0.0]], n_results=2, include=["distances"])["distances"][0]
+    assert np.allclose(distances, [0.0, 1 - np.sqrt(0.5)], atol=1e-6)
+
+    l2 = loaded_index(space="l2")
+    l2.add("news", ["a", "b"], ["A", "B"], [{}, {}], [[1.0, 0.0], [3.0, 0.0]])
+    result = l2.query([[0.0, 0.0]], n_results=2, include=["distances"])
+    assert result["ids"] == [["a", "b"]]
+    assert np.allclose(result["distances"][0], [1.0, 9.0], atol=1e-5)
+
+
+def test_where_filter_and_partitions():
+    index = loaded_index()
+    index.add("news_semiconductor", ["a", "b"], ["A", "B"],
+              [{"theme": "반도체", "published_ts": 10}, {"theme": "반도체", "published_ts": 20}],
+              [[1.0, 0.0], [0.9, 0.1]])
+    index.add("news_auto", ["c"], ["C"], [{"theme": "자동차", "published_ts": 30}], [[0.95, 0.05]])
+    query = [[1.0, 0.0]]
+
+    assert index.query(query, 5, where={"published_ts": {"$gte": 20}})["ids"] == [["c", "b"]]
+    assert index.query(query, 5, partitions=["news_auto"])["ids"] == [["c"]]
+    assert index.query(query, 5, where={"theme": "반도체"}, partitions=["news_auto"])["ids"] == [[]]
+    # 필터 결과보다 많이 요청해도 조건에 맞는 문서만 반환
+    assert index.query(query, 5, where={"theme": "반도체"})["ids"] == [["a", "b"]]
+
+
+def test_same_id_in_two_partitions_keeps_both_rows():
+    index = loaded_index()
+    index.add("news_semiconductor", ["x1"], ["반도체 기사"], [{"theme": "반도체"}], [[1.0, 0.0]])
+    index.add("news_ai", ["x1"], ["AI 기사"], [{"theme": "AI"}], [[0.8, 0.6]])
+
+    assert len(index) == 2
+    assert index.query([[1.0, 0.0]], 5, partitions=["news_ai"])["ids"] == [["x1"]]
+    assert index.query([[1.0, 0.0]], 5, partitions=["news_semiconductor"])["ids"] == [["x1"]]
+
+    # 전체 검색에서는 가장 가까운 파티션의 문서 하나만
+    result = index.query([[1.0, 0.0]], 5, include=["documents"])
+    assert result["ids"] == [["x1"]]
+    assert result["documents"] == [["반도체 기사"]]
+
+
+def test_duplicate_ids_do_not_crowd_out_other_documents():
+    index = loaded_index()
+    index.add("news_a", ["x1", "y"], ["", ""], [{}, {}], [[1.0, 0.0], [0.5, 0.5]])
+    index.add("news_b", ["x1"], [""], [{}], [[0.99, 0.01]])
+
+    assert index.query([[1.0, 0.0]], 2)["ids"] == [["x1", "y"]]
+
+
+def test_remove_and_update_metadata_by_partition():
+    index = loaded_index()
+    index.add("news_a", ["x1", "y"], ["", ""], [{"v": 1}, {"v": 1}], [[1.0, 0.0], [0.0, 1.0]])
+    index.add("news_b", ["x1"], [""], [{"v": 1}], [[1.0, 0.0]])
+
+    index.update_metadata("news_b", ["x1"], [{"v": 2}])
+    assert index.query([[1.0, 0.0]], 5, where={"v": 2})["ids"] == [["x1"]]
+    assert index.query([[1.0, 0.0]], 5, where={"v": 2}, partitions=["news_a"])["ids"] == [[]]
+
+    index.remove(["x1"], "news_a")
+    assert len(index) == 2
+    assert index.query([[1.0, 0.0]], 5, partitions=["news_b"])["ids"] == [["x1"]]
+    assert index.query([[1.0, 0.0]], 5, partitions=["news_a"])["ids"] == [["y"]]
+
+    # 파티션 없이 삭제하면 모든 파티션에서 삭제
+    index.add("news_a", ["x1"], [""], [{}], [[1.0, 0.0]])
+    index.remove(["x1"])
+    assert len(index) == 1
+    assert index.query([[1.0, 0.0]], 5)["ids"] == [["y"]]
+
+
+def test_add_replaces_same_id_within_partition():
+    index = loaded_index()
+    index.add("news", ["a"], ["old"], [{}], [[1.0, 0.0]])
+    index.add("news", ["a"], ["new"], [{}], [[0.0, 1.0]])
+
+    assert len(index) == 1
+    assert index.query([[0.0, 1.0]], 1, include=["documents"])["documents"] == [["new"]]
+
+
+def test_unloaded_index_ignores_changes():
+    index = ExactSearchIndex()
+    index.add("news", ["a"], [""], [{}], [[1.0, 0.0]])
+    index.remove(["a"])
+
+    assert len(index) == 0
+    assert index.query([[1.0, 0.0]], 3)["ids"] == [[]]
+
+
+def test_ensure_loaded_reads_collections_and_follows_version():
+    semiconductor = FakeCollection("news_semiconductor", ["a", "b", "c"], [[1, 0], [0, 1], [1, 1]])
+    ai = FakeCollection("news_ai", ["a"], [[1, 0]])
+    index = ExactSearchIndex()
+
+    assert index.ensure_loaded([semiconductor, ai], page_size=2, version=1)
+    assert len(index) == 4
+    assert index.query([[0.0, 1.0]], 1, partitions=["news_semiconductor"])["ids"] == [["b"]]
+
+    calls = semiconductor.get_calls
+    assert index.ensure_loaded([semiconductor, ai], version=1)
+    assert semiconductor.get_calls == calls
+
+    # 이 프로세스의 변경은 버전만 올리고, 다른 프로세스의 변경(모르는 버전)은 다시 적재
+    index.advance_version(1, 2)
+    assert index.ensure_loaded([semiconductor, ai], version=2)
+    assert semiconductor.get_calls == calls
+    semiconductor.ids.pop()
+    semiconductor.embeddings.pop()
+    assert index.ensure_loaded([semiconductor, ai], version=3)
+    assert semiconductor.get_calls > calls
+    assert len(index) == 3 and index.version == 3
+
+
+def test_oversized_collection_is_checked_once_per_version():
+    collection = FakeCollection("news", ["a", "b", "c"], [[1, 0], [0, 1], [1, 1]])
+    index = ExactSearchIndex(max_documents=2)
+
+    assert not index.ensure_loaded([collection], version=1)
+    assert not index.ensure_loaded([collection], version=1)
+    assert collection.count_calls == 1 and collection.get_calls == 0
+
+    # 버전이 바뀌면 다시 확인
+    collection.ids.pop()
+    collection.embeddings.pop()
+    assert index.ensure_loaded([collection], version=2)
+    assert collection.count_calls == 2 and len(index) == 2
+
+
+def test_add_over_limit_releases_memory_until_version_changes():
+    collection = FakeCollection("news", ["a"], [[1, 0]])
+    index = ExactSearchIndex(max_documents=2)
+    assert index.ensure_loaded([collection], version=1)
+
+    index.add("news", ["b", "c"], ["", ""], [{}, {}], [[0, 1], [1, 1]])
+
+    assert not index.loaded and len(index) == 0
+    assert not index.ensure_loaded([collection], version=1)
+    assert collection.count_calls == 1
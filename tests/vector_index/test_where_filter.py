@@ -0,0 +1,64 @@
+# tests/vector_index/test_where_filter.py
+# 목표 : match_where 가 ChromaDB where 문법(부분 집합)과 같은 결과를 내는지 확인
+# 실행 예 : python -m pytest -q tests/vector_index/test_where_filter.py
+
+import pytest
+
+from app.common.db.vector.where_filter import match_where
+
+META = {"theme": "반도체", "published_ts": 1700000000, "publisher": "연합뉴스"}
+
+
+def test_empty_where_matches_everything():
+    assert match_where(META, None)
+    assert match_where(META, {})
+    assert match_where({}, {})
+
+
+def test_plain_value_is_equality():
+    assert match_where(META, {"theme": "반도체"})
+    assert not match_where(META, {"theme": "자동차"})
+    assert not match_where({}, {"theme": "반도체"})
+
+
+@pytest.mark.parametrize("condition, expected", [
+    ({"$eq": 1700000000}, True),
+    ({"$ne": 1700000000}, False),
+    ({"$gt": 1699999999}, True),
+    ({"$gt": 1700000000}, False),
+    ({"$gte": 1700000000}, True),
+    ({"$lt": 1700000000}, False),
+    ({"$lte": 1700000000}, True),
+    ({"$gte": 1690000000, "$lt": 1710000000}, True),
+    ({"$in": [1, 1700000000]}, True),
+    ({"$nin": [1, 1700000000]}, False),
+])
+def test_comparison_operators(condition, expected):
+    assert match_where(META, {"published_ts": condition}) is expected
+
+
+def test_numeric_comparison_on_missing_or_string_value_is_false():
+    assert not match_where({}, {"published_ts": {"$gte": 0}})
+    assert not match_where({"published_ts": "2024-01-01"}, {"published_ts": {"$gte": 0}})
+    assert not match_where({"published_ts": None}, {"published_ts": {"$lt": 0}})
+    # $ne / $nin 은 값이 없어도 조건을 만족
+    assert match_where({}, {"theme": {"$ne": "반도체"}})
+    assert match_where({}, {"theme": {"$nin": ["반도체"]}})
+
+
+def test_and_or_combinations():
+    where = {"$and": [
+        {"published_ts": {"$gte": 1690000000}},
+        {"$or": [{"theme": "자동차"}, {"publisher": {"$in": ["연합뉴스", "매일경제"]}}]},
+    ]}
+
+    assert match_where(META, where)
+    assert not match_where({**META, "publisher": "한국경제"}, where)
+    assert not match_where({**META, "published_ts": 1}, where)
+    assert match_where(META, {"$or": [{"theme": "자동차"}, {"theme": "반도체"}]})
+    assert not match_where(META, {"$or": [{"theme": "자동차"}, {"theme": "2차전지"}]})
+
+
+def test_multiple_keys_must_all_match():
+    assert match_where(META, {"theme": "반도체", "publisher": "연합뉴스"})
+    assert not match_where(META, {"theme": "반도체", "publisher": "한국경제"})